@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Compare member cache memory and startup work in full and lean gateway modes
+
+Feeds a simulated large guild through discord.py's own Guild and Member
+parsing. Full mode caches every member, as chunking at startup does, one
+1000-member chunk at a time. Lean mode gets only the members in voice
+channels, which Discord includes in GUILD_CREATE, and caches just those.
+
+Usage: python benchmarks/gateway_benchmark.py [members] [members in voice]
+"""
+
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord
+from discord.member import Member
+from discord.state import ConnectionState
+
+CHUNK_SIZE = 1000  # Members per GUILD_MEMBERS_CHUNK event
+GUILD_ID = 1
+VOICE_CHANNEL_IDS = list(range(100, 120))
+
+
+def member_payload(user_id: int) -> dict:
+    return {
+        'user': {
+            'id': str(user_id),
+            'username': f"member{user_id}",
+            'global_name': f"Member {user_id}",
+            'discriminator': '0',
+            'avatar': 'a' * 32,
+        },
+        'nick': None,
+        'roles': [str(GUILD_ID), str(10_000 + user_id % 5)],
+        'joined_at': '2024-01-01T00:00:00+00:00',
+        'deaf': False,
+        'mute': False,
+        'flags': 0,
+    }
+
+
+def guild_payload(voice_ids) -> dict:
+    channels = [{'id': str(c), 'type': 2, 'name': f"Voice {c}", 'position': i, 'permission_overwrites': [],
+                 'bitrate': 64000, 'user_limit': 0}
+                for i, c in enumerate(VOICE_CHANNEL_IDS)]
+    voice_states = [{
+        'user_id': str(user_id),
+        'channel_id': str(VOICE_CHANNEL_IDS[i % len(VOICE_CHANNEL_IDS)]),
+        'session_id': 'x',
+        'deaf': False, 'mute': False, 'self_deaf': False, 'self_mute': False,
+        'self_video': False, 'suppress': False, 'request_to_speak_timestamp': None,
+    } for i, user_id in enumerate(voice_ids)]
+    return {
+        'id': str(GUILD_ID),
+        'name': 'Large Guild',
+        'owner_id': '2',
+        'roles': [{'id': str(GUILD_ID), 'name': '@everyone', 'permissions': '0', 'position': 0,
+                   'color': 0, 'hoist': False, 'managed': False, 'mentionable': False}],
+        'channels': channels,
+        'voice_states': voice_states,
+        'members': [member_payload(user_id) for user_id in voice_ids],
+        'member_count': 0,
+        'large': True,
+    }
+
+
+def make_state(lean: bool) -> ConnectionState:
+    if lean:
+        intents = discord.Intents.none()
+        intents.guilds = True
+        intents.voice_states = True
+        flags = discord.MemberCacheFlags.none()
+        flags.voice = True
+    else:
+        intents = discord.Intents.default()
+        intents.members = True
+        flags = discord.MemberCacheFlags.from_intents(intents)
+    state = ConnectionState(
+        dispatch=lambda *args, **kwargs: None, handlers={}, hooks={}, http=None,
+        intents=intents, member_cache_flags=flags, chunk_guilds_at_startup=not lean
+    )
+    return state
+
+
+def run(lean: bool, member_count: int, voice_count: int):
+    voice_ids = list(range(1_000_000, 1_000_000 + voice_count))
+    state = make_state(lean)
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    
+    guild = discord.Guild(data=guild_payload(voice_ids), state=state)
+    chunks = 0
+    if not lean:
+        # What chunking at startup adds: every member, a chunk at a time
+        for offset in range(0, member_count, CHUNK_SIZE):
+            payloads = [member_payload(1_000_000 + i) for i in range(offset, min(offset + CHUNK_SIZE, member_count))]
+            for data in payloads:
+                guild._add_member(Member(data=data, guild=guild, state=state))
+            chunks += 1
+    
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(guild.members), chunks, current, elapsed
+
+
+def main():
+    member_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    voice_count = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+    print(f"Simulated guild: {member_count:,} members, {voice_count} in voice")
+    for lean in (False, True):
+        cached, chunks, memory, elapsed = run(lean, member_count, voice_count)
+        print(
+            f"{'lean' if lean else 'full':>4}: {cached:>7,} members cached, {memory / 1024 / 1024:>7.1f} MiB, "
+            f"{chunks:>4} member chunks, {elapsed * 1000:>7.0f}ms parsing"
+        )
+
+
+if __name__ == "__main__":
+    main()
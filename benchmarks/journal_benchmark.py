@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Measure how long startup takes to rebuild fractal state from the journal
+
+Writes a journal for N active groups mid-session (votes, winners, member
+changes), with snapshots at the bot's default cadence, then times loading
+it back the way FractalCog does on startup.
+
+Usage: python benchmarks/journal_benchmark.py [groups]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cogs.fractal.journal import FractalJournal
+
+
+def write_session(journal: FractalJournal, groups: int):
+    """Journal events for `groups` six-person fractals, each a few rounds in"""
+    for index in range(groups):
+        thread_id = 1200000000000000000 + index
+        members = [1100000000000000000 + index * 10 + i for i in range(6)]
+        journal.append(thread_id, 'created', {
+            'guild_id': 1000000000000000000,
+            'facilitator': members[0],
+            'members': members,
+            'level': 6,
+            'voice_channel': None,
+            'speaking_time': 120
+        })
+        
+        candidates = list(members)
+        for level in range(6, 6 - random.randint(1, 4), -1):
+            journal.append(thread_id, 'round', {'level': level, 'message_id': thread_id + level})
+            for voter in members:
+                journal.append(thread_id, 'vote', {'voter': voter, 'candidate': random.choice(candidates)})
+            winner = random.choice(candidates)
+            candidates.remove(winner)
+            journal.append(thread_id, 'winner', {'user': winner, 'level': level})
+        
+        journal.append(thread_id, 'round', {'level': level - 1, 'message_id': thread_id})
+        for voter in members[:3]:
+            journal.append(thread_id, 'vote', {'voter': voter, 'candidate': random.choice(candidates)})
+
+
+def main():
+    groups = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'fractal_journal.jsonl')
+        snapshot_path = os.path.join(directory, 'fractal_snapshot.json')
+        
+        journal = FractalJournal(path, snapshot_path)
+        journal.open()
+        started = time.perf_counter()
+        write_session(journal, groups)
+        elapsed = time.perf_counter() - started
+        events = journal.seq
+        tail = journal.since_snapshot
+        journal.file.close()  # Simulate a crash: no final snapshot
+        
+        print(f"Journaled {events} events for {groups} groups in {elapsed:.3f}s ({elapsed / events * 1e6:.1f} us/event)")
+        print(f"Snapshot: {os.path.getsize(snapshot_path) / 1024:.0f} KiB, journal tail: {tail} events")
+        
+        started = time.perf_counter()
+        restored = FractalJournal(path, snapshot_path)
+        states = restored.open()
+        elapsed = time.perf_counter() - started
+        restored.close()
+        
+        assert states == journal.states, "Rebuilt state does not match the live state"
+        print(f"Rebuilt {len(states)} groups in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
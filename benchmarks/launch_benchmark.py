@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Measure the time from clicking "Start Fractal" to the first usable button
+
+Starts text fractals against fake Discord objects where every API call
+takes a fixed round trip, once with the old sequential start-up (create
+the thread, add each member in turn, then post the messages) and once
+with launch_fractal, and reports the stage timings of each. Then starts a
+batch of groups side by side, as /fractalbatch does.
+
+Usage: python benchmarks/launch_benchmark.py [round trip ms] [members] [batch groups]
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cogs.fractal.countdown import CountdownPacer
+from cogs.fractal.group import FractalGroup
+from cogs.fractal.group_registry import GroupRegistry
+from cogs.fractal.launch import SetupStats, launch_fractal, partition_members
+from cogs.fractal.voice_occupancy import VoiceOccupancy
+from utils.outbound import outbound
+from utils.timers import TimerService
+
+ids = itertools.count(1)
+ROUND_TRIP = 0.1
+
+
+class FakeGuild:
+    id = 1
+
+
+class FakeMember:
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.display_name = f"Member {user_id}"
+        self.mention = f"<@{user_id}>"
+        self.bot = False
+
+
+class FakeMessage:
+    def __init__(self, channel):
+        self.id = next(ids)
+        self.channel = channel
+
+
+class FakeThread:
+    def __init__(self, name: str):
+        self.id = next(ids)
+        self.name = name
+        self.guild = FakeGuild()
+        self.mention = f"<#{self.id}>"
+    
+    async def send(self, *args, **kwargs):
+        await asyncio.sleep(ROUND_TRIP)
+        return FakeMessage(self)
+    
+    async def add_user(self, member):
+        await asyncio.sleep(ROUND_TRIP)
+
+
+class FakeChannel:
+    async def create_thread(self, name, **kwargs):
+        await asyncio.sleep(ROUND_TRIP)
+        return FakeThread(name)
+
+
+class FakeResolver:
+    def get_fractal_channel(self, guild):
+        return FakeChannel()
+
+
+class FakeInteraction:
+    guild = FakeGuild()
+    channel = FakeChannel()
+    
+    async def edit_original_response(self, **kwargs):
+        await asyncio.sleep(ROUND_TRIP)
+
+
+class FakeCog:
+    def __init__(self):
+        self.active_groups = GroupRegistry()
+        self.timers = TimerService()
+        self.countdown = CountdownPacer()
+        self.voice_occupancy = VoiceOccupancy()
+        self.channel_resolver = FakeResolver()
+        self.setup_stats = SetupStats()
+    
+    def _get_next_group_name(self, guild_id: int) -> str:
+        return f"Fractal Group {next(ids)}"
+
+
+async def sequential_start(cog, interaction, members, facilitator):
+    """The start-up path before launch_fractal: every step waits for the one before"""
+    started = time.perf_counter()
+    thread = await FakeChannel().create_thread(cog._get_next_group_name(1))
+    thread_ready = time.perf_counter()
+    for member in members:
+        await outbound.add_user(thread, member)
+    members_done = time.perf_counter()
+    group = FractalGroup(thread=thread, members=members, facilitator=facilitator, cog=cog)
+    cog.active_groups[thread.id] = group
+    await interaction.edit_original_response(content="started", view=None)
+    await group.submit(group.start_fractal)
+    done = time.perf_counter()
+    return {
+        'thread': thread_ready - started,
+        'members': members_done - thread_ready,
+        'ready': done - started,
+        'total': done - started
+    }
+
+
+async def main():
+    global ROUND_TRIP
+    logging.getLogger('bot').setLevel(logging.WARNING)
+    ROUND_TRIP = (float(sys.argv[1]) if len(sys.argv) > 1 else 100) / 1000
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+    batch = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    
+    cog = FakeCog()
+    offset = 0
+    for name in ('sequential', 'pipelined'):
+        offset += 100
+        members = [FakeMember(offset + i) for i in range(size)]
+        if name == 'sequential':
+            timings = await sequential_start(cog, FakeInteraction(), members, members[0])
+        else:
+            await launch_fractal(cog, FakeInteraction(), members, members[0])
+            timings = cog.setup_stats.get_stats()['avg']
+        print(
+            f"{name:>10}: first button after {timings['ready']:.2f}s, all done after {timings['total']:.2f}s "
+            f"(thread {timings['thread']:.2f}s, members {timings['members']:.2f}s)"
+        )
+    
+    members = [FakeMember(10_000 + i) for i in range(batch * size)]
+    started = time.perf_counter()
+    groups = await asyncio.gather(*(
+        launch_fractal(cog, FakeInteraction(), group_members, members[0], announce=False)
+        for group_members in partition_members(members, 2, size)
+    ))
+    print(f"{'batch':>10}: {len(groups)} groups of {size} fully started after {time.perf_counter() - started:.2f}s")
+    
+    await cog.timers.close()
+    await outbound.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
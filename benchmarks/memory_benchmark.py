@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Measure the in-memory footprint of concurrent fractal groups
+
+Builds N groups mid-session (half voice fractals part-way through the
+speaking phase, half voting with winners and votes recorded) and reports
+the memory they hold, excluding the member and channel objects themselves
+since discord.py caches those regardless. The same groups are then built
+again from copies of the classes without __slots__, as a baseline that
+always has the same fields as the current code.
+
+Usage: python benchmarks/memory_benchmark.py [groups]
+"""
+
+import asyncio
+import gc
+import logging
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cogs.fractal.group as group_module
+from cogs.fractal.group import FractalGroup
+from cogs.fractal.countdown import CountdownPacer
+from cogs.fractal.voice_occupancy import VoiceOccupancy
+from utils.timers import TimerService
+
+
+class FakeMember:
+    """Stands in for discord.Member (cached by discord.py, not counted)"""
+    
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.display_name = f"Member {user_id}"
+        self.mention = f"<@{user_id}>"
+        self.bot = False
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int):
+        self.id = channel_id
+        self.name = f"Fractal Group {channel_id}"
+        self.mention = f"<#{channel_id}>"
+        self.members = []
+
+
+class FakeGuild:
+    def __init__(self, voice_channels):
+        self.voice_channels = voice_channels
+        self.stage_channels = []
+
+
+class FakeCog:
+    active_groups = {}
+    timers = TimerService()
+    countdown = CountdownPacer()
+    voice_occupancy = VoiceOccupancy()
+
+
+def unslotted(cls):
+    """Copy of a class with the same methods, but storing its fields in a per-instance __dict__"""
+    namespace = {
+        name: value for name, value in vars(cls).items()
+        if name not in cls.__slots__ and name not in ('__slots__', '__dict__', '__weakref__')
+    }
+    return type(cls.__name__, cls.__bases__, namespace)
+
+
+def build_groups(count: int, members_by_group, channels, group_class=FractalGroup):
+    """Create `count` groups in a realistic mid-session state"""
+    groups = []
+    cog = FakeCog()
+    for index in range(count):
+        members = members_by_group[index]
+        thread, voice_channel = channels[index]
+        voice = voice_channel is not None
+        group = group_class(thread, members, members[0], cog, voice_channel=voice_channel, speaking_time=120)
+        
+        if voice:
+            for _ in range(3):
+                group.speaking_queue.next_speaker()
+        else:
+            group.voice_phase_active = False
+            for level, winner in zip((6, 5), members[:2]):
+                group.registry.declare_winner(winner.id, level)
+                group.current_level = level - 1
+            for voter in members:
+                group.tally.cast(voter.id, members[2 + voter.id % 4].id)
+        groups.append(group)
+    return groups
+
+
+def measure(count: int, slots: bool = True) -> int:
+    members_by_group = [
+        [FakeMember(1100000000000000000 + index * 10 + i) for i in range(6)]
+        for index in range(count)
+    ]
+    channels = [
+        (FakeChannel(1200000000000000000 + index), FakeChannel(1300000000000000000 + index) if index % 2 == 0 else None)
+        for index in range(count)
+    ]
+    
+    # Everyone in a voice fractal is in its voice channel (indexed by the cog, not counted)
+    for members, (_, voice_channel) in zip(members_by_group, channels):
+        if voice_channel is not None:
+            voice_channel.members = members
+    FakeCog.voice_occupancy.seed_guild(FakeGuild([voice for _, voice in channels if voice is not None]))
+    
+    group_class = FractalGroup
+    slotted = {}
+    if not slots:
+        group_class = unslotted(FractalGroup)
+        for name in ('MemberRegistry', 'VoteTally', 'SpeakingQueue', 'VoiceTimer'):
+            slotted[name] = getattr(group_module, name)
+            setattr(group_module, name, unslotted(slotted[name]))
+    
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    try:
+        groups = build_groups(count, members_by_group, channels, group_class)
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+        for name, cls in slotted.items():
+            setattr(group_module, name, cls)
+    
+    assert len(groups) == count
+    return used
+
+
+async def main():
+    logging.getLogger('bot').setLevel(logging.WARNING)
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    for label, slots in (('__slots__', True), ('no __slots__', False)):
+        used = measure(count, slots)
+        print(f"{label:>12}: {count} groups, {used / 1024:.0f} KiB total, {used / count:.0f} bytes per group")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
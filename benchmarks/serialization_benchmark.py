@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Compare payload size and encode time of the webhook serializers
+
+Usage: python benchmarks/serialization_benchmark.py [iterations]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.serialization import available_serializers, encode_body
+
+MEMBER_IDS = [str(1100000000000000000 + i) for i in range(6)]
+THREAD_ID = '1200000000000000000'
+
+
+def build_payloads():
+    """Webhook payloads shaped like the ones WebIntegration sends for a 6-person fractal"""
+    events = {
+        'fractal_started': {
+            'threadId': THREAD_ID,
+            'name': 'Fractal Group 1 - Dec 01, 2025',
+            'guildId': '1000000000000000000',
+            'facilitatorDiscordId': MEMBER_IDS[0],
+            'participantDiscordIds': MEMBER_IDS,
+            'currentLevel': 6
+        },
+        'vote_cast': {
+            'voterId': MEMBER_IDS[1],
+            'candidateId': MEMBER_IDS[2],
+            'level': 6,
+            'totalVotes': 3
+        },
+        'round_complete': {
+            'level': 6,
+            'winnerId': MEMBER_IDS[2],
+            'totalVotes': 6,
+            'voteDistribution': {MEMBER_IDS[2]: 4, MEMBER_IDS[3]: 1, MEMBER_IDS[4]: 1}
+        },
+        'fractal_complete': {
+            'results': [
+                {'discordId': member_id, 'rank': rank, 'level': 7 - rank}
+                for rank, member_id in enumerate(MEMBER_IDS, 1)
+            ],
+            'totalRounds': 6
+        }
+    }
+    return {
+        event_type: {'fractalId': THREAD_ID, 'event': event_type, 'data': data, 'eventId': 'a' * 32}
+        for event_type, data in events.items()
+    }
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    payloads = build_payloads()
+    serializers = available_serializers()
+    
+    print(f"{'event':<18}{'serializer':<12}{'gzip':<6}{'bytes':>8}{'us/encode':>12}")
+    print("-" * 56)
+    for event_type, payload in payloads.items():
+        for name, serializer in serializers.items():
+            for compress in (False, True):
+                body, _ = encode_body(payload, serializer, compress=compress, min_compress_size=0)
+                
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    encode_body(payload, serializer, compress=compress, min_compress_size=0)
+                elapsed = time.perf_counter() - started
+                
+                print(f"{event_type:<18}{name:<12}{'yes' if compress else 'no':<6}{len(body):>8}{elapsed / iterations * 1e6:>12.2f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
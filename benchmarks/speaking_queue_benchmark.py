@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Measure SpeakingQueue transitions and queue display renders per second
+
+Runs full speaking phases (advance, skip, move) over queues of several
+sizes, then times format_queue_display both when the queue is unchanged
+(served from the render cache) and when every call follows a change.
+
+Usage: python benchmarks/speaking_queue_benchmark.py [seconds per case]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cogs.fractal.speaking_queue import SpeakingQueue
+
+
+class FakeMember:
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.display_name = f"Member {user_id}"
+
+
+def run_phase(queue: SpeakingQueue) -> int:
+    """One speaking phase with a skip and a move every few turns; returns transitions made"""
+    transitions = 0
+    turn = 0
+    while queue.next_speaker():
+        transitions += 1
+        turn += 1
+        if turn % 4 == 0:
+            queue.skip_current()
+            transitions += 1
+        if turn % 5 == 0 and queue.active_queue:
+            queue.move_speaker(next(reversed(queue.active_queue)))
+            transitions += 1
+    return transitions
+
+
+def time_transitions(size: int, budget: float) -> float:
+    members = [FakeMember(i) for i in range(1, size + 1)]
+    by_id = {m.id: m for m in members}
+    transitions = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < budget:
+        transitions += run_phase(SpeakingQueue(members, by_id.get))
+    return transitions / (time.perf_counter() - started)
+
+
+def time_renders(size: int, budget: float, mutate: bool) -> float:
+    members = [FakeMember(i) for i in range(1, size + 1)]
+    by_id = {m.id: m for m in members}
+    queue = SpeakingQueue(members, by_id.get)
+    queue.next_speaker()
+    queue.next_speaker()
+    queue.skip_current()
+    queue.next_speaker()
+    
+    renders = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < budget:
+        for _ in range(1000):
+            if mutate:
+                queue.version += 1  # What any queue change does
+            queue.format_queue_display()
+        renders += 1000
+    return renders / (time.perf_counter() - started)
+
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else 0.5
+    for size in (6, 50, 500, 5000):
+        transitions = time_transitions(size, budget)
+        cached = time_renders(size, budget, mutate=False)
+        uncached = time_renders(size, budget, mutate=True)
+        print(
+            f"{size:>4} speakers: {transitions:>12,.0f} transitions/s, "
+            f"{cached:>12,.0f} cached renders/s, {uncached:>10,.0f} renders/s after a change"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Measure how accurately one TimerService fires thousands of speaking timers
+
+Schedules N short timers with a warning point each, extends, pauses and
+cancels a share of them the way facilitators would, and reports how late
+callbacks fired and how many asyncio tasks were alive while waiting.
+
+Usage: python benchmarks/timer_benchmark.py [timers]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.timers import TimerService
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    service = TimerService()
+    loop = asyncio.get_running_loop()
+    lateness = []
+    expected = {}
+    
+    def make_callback(index):
+        async def on_complete():
+            lateness.append(loop.time() - expected[index])
+        return on_complete
+    
+    async def on_warning(seconds_left):
+        pass
+    
+    started = time.perf_counter()
+    timers = []
+    for index in range(count):
+        duration = random.uniform(1.0, 2.0)
+        timers.append(service.schedule(duration, make_callback(index), (0.5,), on_warning))
+        expected[index] = loop.time() + duration
+    scheduled = time.perf_counter() - started
+    
+    tasks_while_waiting = len(asyncio.all_tasks())
+    
+    # A tenth each are extended, paused then resumed, and cancelled
+    paused = []
+    for index, timer in enumerate(timers):
+        if index % 10 == 1:
+            service.extend(timer, 0.5)
+            expected[index] += 0.5
+        elif index % 10 == 2:
+            service.pause(timer)
+            paused.append(index)
+        elif index % 10 == 3:
+            service.cancel(timer)
+    
+    await asyncio.sleep(0.25)
+    for index in paused:
+        service.resume(timers[index])
+        expected[index] = loop.time() + service.remaining(timers[index])
+    
+    while service.timers or service.callbacks:
+        await asyncio.sleep(0.05)
+    await service.close()
+    
+    lateness.sort()
+    stats = service.get_stats()
+    print(f"Scheduled {count} timers in {scheduled * 1000:.1f} ms; {tasks_while_waiting} asyncio tasks while waiting")
+    print(f"Completed {stats['completed']}, cancelled {stats['cancelled']}, warnings {stats['warnings']}")
+    print(
+        f"Lateness: median {lateness[len(lateness) // 2] * 1000:.1f} ms, "
+        f"p99 {lateness[int(len(lateness) * 0.99)] * 1000:.1f} ms, max {lateness[-1] * 1000:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
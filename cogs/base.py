@@ -8,6 +8,10 @@ class BaseCog(commands.Cog):
         self.bot = bot
         self.logger = logging.getLogger('bot')
 
+    def voice_members(self, channel):
+        """Non-bot members in a voice channel"""
+        return [m for m in channel.members if not m.bot]
+
     async def check_voice_state(self, user):
         """Check if user is in a voice channel and return eligible members"""
         # Validate user is in voice channel
@@ -20,7 +24,7 @@ class BaseCog(commands.Cog):
             }
         
         # Get non-bot members
-        members = [m for m in user.voice.channel.members if not m.bot]
+        members = self.voice_members(user.voice.channel)
         
         # Validate member count (2-6 members)
         if len(members) < 2:
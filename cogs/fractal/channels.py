@@ -0,0 +1,85 @@
+import discord
+import logging
+from typing import Dict, Optional
+
+RESULTS_CHANNEL_NAMES = ['chat', 'lobby']  # Exact names; 'general' and 'main' match anywhere in the name
+FRACTAL_CHANNEL_NAME = "fractal-bot"
+
+
+class GuildChannels:
+    """Resolved channel IDs for one guild"""
+    
+    def __init__(self, results_id: Optional[int], fractal_id: Optional[int]):
+        self.results_id = results_id  # Where final results are posted
+        self.fractal_id = fractal_id  # fractal-bot channel, only if we can create threads in it
+
+
+class ChannelResolver:
+    """Per-guild cache of the results channel and the fractal thread parent
+    
+    Resolving means scanning every channel in the guild and checking the
+    bot's permissions, so it is done once per guild and only repeated after
+    a channel, role or bot-member change invalidates it. Per-guild overrides
+    from config skip the scan entirely.
+    """
+    
+    def __init__(self, overrides: Optional[Dict[int, Dict[str, int]]] = None):
+        self.overrides = overrides or {}
+        self.cache: Dict[int, GuildChannels] = {}
+        self.logger = logging.getLogger('bot')
+    
+    def invalidate(self, guild_id: int):
+        """Forget a guild's resolved channels so the next lookup rescans"""
+        self.cache.pop(guild_id, None)
+    
+    def get_results_channel(self, guild: discord.Guild) -> Optional[discord.TextChannel]:
+        """Channel for the short results summary posted when a fractal completes"""
+        return self._get_channel(guild, self._resolve(guild).results_id)
+    
+    def get_fractal_channel(self, guild: discord.Guild) -> Optional[discord.TextChannel]:
+        """fractal-bot channel to create fractal threads in, if present and usable"""
+        return self._get_channel(guild, self._resolve(guild).fractal_id)
+    
+    def _get_channel(self, guild: discord.Guild, channel_id: Optional[int]) -> Optional[discord.TextChannel]:
+        if channel_id is None:
+            return None
+        channel = guild.get_channel(channel_id)
+        if channel is None:
+            self.invalidate(guild.id)  # Missed a delete event; rescan next time
+        return channel
+    
+    def _resolve(self, guild: discord.Guild) -> GuildChannels:
+        """Cached channels for a guild, scanning the guild on a miss"""
+        resolved = self.cache.get(guild.id)
+        if resolved is None:
+            overrides = self.overrides.get(guild.id, {})
+            results_id = overrides.get('results') or self._find_results_channel(guild)
+            fractal_id = overrides.get('threads') or self._find_fractal_channel(guild)
+            resolved = self.cache[guild.id] = GuildChannels(results_id, fractal_id)
+            self.logger.info(f"Resolved channels for guild {guild.id}: results={results_id}, threads={fractal_id}")
+        return resolved
+    
+    def _find_results_channel(self, guild: discord.Guild) -> Optional[int]:
+        """First general-style text channel we can post in, else any we can post in"""
+        fallback = None
+        for channel in guild.text_channels:
+            if not channel.permissions_for(guild.me).send_messages:
+                continue
+            
+            name = channel.name.lower()
+            if 'general' in name or 'main' in name or name in RESULTS_CHANNEL_NAMES:
+                return channel.id
+            if fallback is None:
+                fallback = channel.id
+        return fallback
+    
+    def _find_fractal_channel(self, guild: discord.Guild) -> Optional[int]:
+        """fractal-bot channel, if the bot can create public threads there"""
+        channel = discord.utils.get(guild.text_channels, name=FRACTAL_CHANNEL_NAME)
+        if not channel:
+            return None
+        
+        if not channel.permissions_for(guild.me).create_public_threads:
+            self.logger.warning("No thread creation permissions in fractal-bot channel, using fallback")
+            return None
+        return channel.id
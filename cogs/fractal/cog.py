@@ -1,12 +1,30 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
+import asyncio
+import itertools
 import logging
+import os
 import random
-from datetime import datetime
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from config.config import GUILD_CHANNEL_OVERRIDES, MAX_GROUP_MEMBERS, MIN_GROUP_MEMBERS
 from ..base import BaseCog
-from .views import MemberConfirmationView, VoiceMemberConfirmationView
+from .channels import ChannelResolver
+from .countdown import CountdownPacer
+from .export import write_export
+from .group_registry import GroupRegistry
+from .history import FractalHistory
+from .journal import FractalJournal
+from .launch import SetupStats, launch_fractal, partition_members
+from .voice_occupancy import VoiceOccupancy
+from .views import MemberConfirmationView, VoiceMemberConfirmationView, VoteButton
 from .group import FractalGroup
+from utils.member_resolver import MemberResolver
+from utils.outbound import outbound
+from utils.timers import TimerService
+from utils.web_integration import web_integration
 
 class FractalCog(BaseCog):
     """Cog for handling ZAO Fractal voting commands and logic"""
@@ -15,12 +33,179 @@ class FractalCog(BaseCog):
         super().__init__(bot)
         self.bot = bot
         self.logger = logging.getLogger('bot')
-        self.active_groups = {}  # Dict mapping thread_id to FractalGroup
+        self.active_groups = GroupRegistry()  # thread_id -> FractalGroup, indexed by guild, facilitator and member
         self.daily_counters = {}  # Dict mapping guild_id -> {date: counter}
+        self.channel_resolver = ChannelResolver(GUILD_CHANNEL_OVERRIDES)  # Results and thread parent channels per guild
+        self.journal = FractalJournal(
+            os.getenv('FRACTAL_JOURNAL_PATH', 'data/fractal_journal.jsonl'),
+            os.getenv('FRACTAL_SNAPSHOT_PATH', 'data/fractal_snapshot.json'),
+            snapshot_every=int(os.getenv('FRACTAL_SNAPSHOT_EVERY', '500'))
+        )
+        self.history = FractalHistory(os.getenv('FRACTAL_HISTORY_PATH', 'data/fractal_history.jsonl'))
+        self.export_part_bytes = int(os.getenv('EXPORT_PART_BYTES', str(8 * 1024 * 1024)))  # Under Discord's attachment limit
+        self.restored = False
+        self.timers = TimerService()  # Speaking deadlines for every group
+        self.countdown = CountdownPacer()  # Live countdown cadence across groups
+        self.member_resolver = MemberResolver()  # Members outside discord.py's cache, fetched on demand
+        self.voice_occupancy = VoiceOccupancy()  # Voice channel <-> member index, fed by voice state events
+        self.setup_stats = SetupStats()  # Stage timings of fractal start-ups
         
         # Create admin command group
         self.admin_group = app_commands.Group(name="admin", description="Admin commands for fractal management")
     
+    async def cog_load(self):
+        """Load fractal state saved before the last shutdown or crash and route vote buttons"""
+        self.journal.open()
+        self.bot.add_dynamic_items(VoteButton)
+    
+    async def cog_unload(self):
+        """Snapshot fractal state so a restart resumes where we left off"""
+        self.bot.remove_dynamic_items(VoteButton)
+        await self.timers.close()
+        self.journal.close()
+    
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # Voice states may have changed while disconnected, so re-index on every ready
+        for guild in self.bot.guilds:
+            self.voice_occupancy.seed_guild(guild)
+        
+        # on_ready fires again after reconnects; groups only need restoring once
+        if not self.restored:
+            self.restored = True
+            await self.restore_groups()
+    
+    async def restore_groups(self):
+        """Rebuild journaled fractal groups and re-attach them to their threads"""
+        states = list(self.journal.states.items())
+        if not states:
+            return
+        
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(self._restore_group(thread_id, state) for thread_id, state in states),
+            return_exceptions=True
+        )
+        
+        restored = 0
+        for (thread_id, _), result in zip(states, results):
+            if result is True:
+                restored += 1
+                continue
+            if isinstance(result, Exception):
+                self.logger.error(f"Failed to restore fractal group {thread_id}: {result}")
+            self.journal.append(thread_id, 'ended')  # Thread or members are gone; stop tracking it
+        
+        self.logger.info(f"Restored {restored}/{len(states)} fractal groups in {time.perf_counter() - started:.2f}s")
+    
+    async def _restore_group(self, thread_id: int, state: dict) -> bool:
+        """Rebuild one group from its journaled state; False if it can no longer run"""
+        guild = self.bot.get_guild(state['guild_id'])
+        if guild is None:
+            return False
+        
+        thread = guild.get_thread(thread_id)
+        if thread is None:
+            try:
+                thread = await guild.fetch_channel(thread_id)
+            except discord.HTTPException:
+                return False
+        if not isinstance(thread, discord.Thread) or thread.archived:
+            return False
+        
+        members = [member for member in [await self._resolve_member(guild, user_id) for user_id in state['members']] if member]
+        facilitator = await self._resolve_member(guild, state['facilitator'])
+        if not members or facilitator is None:
+            return False
+        
+        voice_channel = guild.get_channel(state['voice_channel']) if state['voice_channel'] else None
+        group = FractalGroup(
+            thread=thread,
+            members=members,
+            facilitator=facilitator,
+            cog=self,
+            voice_channel=voice_channel,
+            speaking_time=state['speaking_time'] or 120
+        )
+        group.restore_state(state)
+        self.active_groups[thread_id] = group
+        await group.submit(group.resume, state['voting_message'])
+        return True
+    
+    async def _resolve_member(self, guild: discord.Guild, user_id: int):
+        """Member from an active fractal or the cache, falling back to the API"""
+        group = self.active_groups.group_for_member(user_id)
+        if group is not None and group.thread.guild.id == guild.id:
+            return group.registry.by_id[user_id]
+        return await self.member_resolver.resolve(guild, user_id)
+    
+    def voice_members(self, channel):
+        """Non-bot members in a voice channel, from the occupancy index"""
+        return self.voice_occupancy.members_in(channel.id)
+    
+    @commands.Cog.listener()
+    async def on_voice_state_update(self, member, before, after):
+        left, joined = self.voice_occupancy.update(member, before, after)
+        if left is None and joined is None:
+            return
+        
+        # Let the member's fractal know if they left or came back to its voice channel
+        group = self.active_groups.group_for_member(member.id)
+        if group is None or group.voice_channel is None:
+            return
+        if left == group.voice_channel.id:
+            group.post(group.member_left_voice, member)
+        elif joined == group.voice_channel.id:
+            group.post(group.member_joined_voice, member)
+    
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        self.voice_occupancy.seed_guild(guild)
+    
+    # Channel cache invalidation: any change that could alter which channel we
+    # pick or what the bot may do there forces a rescan for that guild
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        self.channel_resolver.invalidate(channel.guild.id)
+    
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        self.channel_resolver.invalidate(channel.guild.id)
+    
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        self.channel_resolver.invalidate(after.guild.id)
+    
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role):
+        self.channel_resolver.invalidate(role.guild.id)
+    
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        self.channel_resolver.invalidate(role.guild.id)
+    
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before, after):
+        self.channel_resolver.invalidate(after.guild.id)
+    
+    @commands.Cog.listener()
+    async def on_member_update(self, before, after):
+        if after.id == self.bot.user.id and before.roles != after.roles:
+            self.channel_resolver.invalidate(after.guild.id)
+    
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.channel_resolver.invalidate(guild.id)
+        self.voice_occupancy.drop_guild(guild)
+    
+    def busy_members_message(self, busy) -> str:
+        """Explain which members are already taking part in another fractal"""
+        lines = []
+        for member in busy:
+            group = self.active_groups.group_for_member(member.id)
+            lines.append(f"• {member.display_name} ({group.thread.mention if group else 'starting now'})")
+        return "❌ These members are already in an active fractal:\n" + "\n".join(lines)
+    
     def _get_next_group_name(self, guild_id: int) -> str:
         """Generate auto-incremented group name for the day"""
         today = datetime.now().strftime("%b %d, %Y")
@@ -79,6 +264,11 @@ class FractalCog(BaseCog):
         members = voice_check['members']
         voice_channel = interaction.user.voice.channel
         
+        busy = self.active_groups.busy_members(members)
+        if busy:
+            await interaction.followup.send(self.busy_members_message(busy), ephemeral=True)
+            return
+        
         # Create voice-enabled confirmation view
         view = VoiceMemberConfirmationView(
             cog=self, 
@@ -111,6 +301,62 @@ class FractalCog(BaseCog):
                 view=view
             )
     
+    @app_commands.command(
+        name="fractalbatch",
+        description="Split everyone in your voice or stage channel into fractal groups and start them all"
+    )
+    @app_commands.describe(
+        shuffle="Randomly mix members between groups (default: true)"
+    )
+    async def fractalbatch(self, interaction: discord.Interaction, shuffle: bool = True):
+        """Break a large voice room out into balanced voting groups at once"""
+        await interaction.response.defer(ephemeral=True)
+        
+        voice = interaction.user.voice
+        if not voice or not voice.channel:
+            await interaction.followup.send("❌ You must be in a voice or stage channel to split it into fractal groups.", ephemeral=True)
+            return
+        
+        # Members already in a running fractal stay where they are
+        available = self.voice_members(voice.channel)
+        busy = self.active_groups.busy_members(available)
+        busy_ids = {member.id for member in busy}
+        members = [member for member in available if member.id not in busy_ids]
+        if shuffle:
+            random.shuffle(members)
+        
+        try:
+            partitions = partition_members(members, MIN_GROUP_MEMBERS, MAX_GROUP_MEMBERS)
+        except ValueError as e:
+            await interaction.followup.send(f"❌ {e}", ephemeral=True)
+            return
+        # Nothing has been awaited since the busy check, so these are all free; each launch releases its own
+        self.active_groups.reserve(members)
+        
+        # Every group's thread, members and first messages are set up side by side
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(launch_fractal(self, interaction, group_members, interaction.user, announce=False) for group_members in partitions),
+            return_exceptions=True
+        )
+        elapsed = time.perf_counter() - started
+        
+        groups = [result for result in results if isinstance(result, FractalGroup)]
+        failures = [result for result in results if isinstance(result, Exception)]
+        self.logger.info(
+            f"Batch from {voice.channel.name}: {len(groups)}/{len(partitions)} groups for {len(members)} members in {elapsed:.2f}s"
+        )
+        for error in failures:
+            self.logger.error(f"Batch fractal failed to start: {error}", exc_info=error)
+        
+        summary = f"✅ **Started {len(groups)} fractal groups** from {voice.channel.mention} in {elapsed:.1f}s\n"
+        summary += "\n".join(f"• {group.thread.mention} ({len(group.members)} members)" for group in groups)
+        if busy:
+            summary += f"\n\n⏭️ Already in a fractal, not included: {', '.join(member.display_name for member in busy)}"
+        if failures:
+            summary += f"\n\n❌ {len(failures)} groups failed to start: {failures[0]}"
+        await interaction.followup.send(summary, ephemeral=True)
+    
     @app_commands.command(
         name="endgroup",
         description="End an active fractal group (facilitator only)"
@@ -135,9 +381,9 @@ class FractalCog(BaseCog):
             await interaction.followup.send("❌ Only the group facilitator can end the fractal group.", ephemeral=True)
             return
         
-        # End the fractal group
-        await group.end_fractal()
-        del self.active_groups[interaction.channel.id]
+        # End the fractal group (end_fractal also drops it from active_groups)
+        await group.submit(group.end_fractal)
+        self.active_groups.pop(interaction.channel.id, None)
         
         await interaction.followup.send("✅ Fractal group ended successfully.", ephemeral=True)
     
@@ -204,7 +450,7 @@ class FractalCog(BaseCog):
                 thread_id_int = int(thread_id)
                 if thread_id_int in self.active_groups:
                     group = self.active_groups[thread_id_int]
-                    await group.end_fractal()
+                    await group.submit(group.end_fractal)
                     await interaction.followup.send(f"✅ Ended fractal in {group.thread.mention}", ephemeral=True)
                 else:
                     await interaction.followup.send("❌ No active fractal found with that thread ID.", ephemeral=True)
@@ -235,12 +481,13 @@ class FractalCog(BaseCog):
             await interaction.followup.send("❌ You need administrator permissions to use this command.", ephemeral=True)
             return
         
-        if not self.active_groups:
+        server_fractals = self.active_groups.in_guild(interaction.guild.id)
+        if not server_fractals:
             await interaction.followup.send("✅ No active fractal groups.", ephemeral=True)
             return
         
-        status = f"**Active Fractal Groups ({len(self.active_groups)}):**\n\n"
-        for thread_id, group in self.active_groups.items():
+        status = f"**Active Fractal Groups ({len(server_fractals)}):**\n\n"
+        for group in server_fractals:
             status += f"**{group.thread.name}**\n"
             status += f"• Thread: {group.thread.mention}\n"
             status += f"• Facilitator: {group.facilitator.mention}\n"
@@ -280,6 +527,7 @@ class FractalCog(BaseCog):
         # Remove invalid groups
         for thread_id in to_remove:
             del self.active_groups[thread_id]
+            self.journal.append(thread_id, 'ended')
         
         await interaction.followup.send(
             f"✅ Cleanup complete. Removed {cleaned_count} inactive fractal groups.",
@@ -308,22 +556,11 @@ class FractalCog(BaseCog):
             
             group = self.active_groups[thread_id_int]
             
-            # Find candidate with most votes or pick randomly if tie
-            vote_counts = {}
-            for candidate_id in group.votes.values():
-                vote_counts[candidate_id] = vote_counts.get(candidate_id, 0) + 1
-            
-            if vote_counts:
-                max_votes = max(vote_counts.values())
-                winners = [cid for cid, count in vote_counts.items() if count == max_votes]
-                winner_id = winners[0] if len(winners) == 1 else random.choice(winners)
-                winner = discord.utils.get(group.active_candidates, id=winner_id)
-            else:
-                # No votes cast, pick random candidate
-                winner = random.choice(group.active_candidates)
-            
-            await group.thread.send(f"⚡ **ADMIN OVERRIDE:** Forcing round completion. Winner: {winner.mention}")
-            await group.start_new_round(winner)
+            # Leader (or random candidate if no votes) wins, decided inside the group's mailbox
+            winner = await group.submit(group.force_round)
+            if winner is None:
+                await interaction.followup.send("❌ That fractal has already ended.", ephemeral=True)
+                return
             
             await interaction.followup.send(f"✅ Forced round completion in {group.thread.mention}. Winner: {winner.mention}", ephemeral=True)
             
@@ -352,10 +589,10 @@ class FractalCog(BaseCog):
                 return
             
             group = self.active_groups[thread_id_int]
-            old_vote_count = len(group.votes)
-            group.votes = {}
-            
-            await group.thread.send(f"⚡ **ADMIN RESET:** All votes cleared. Voting restarted for Level {group.current_level}.")
+            old_vote_count = await group.submit(group.reset_votes)
+            if old_vote_count is None:
+                await interaction.followup.send("❌ That fractal has already ended.", ephemeral=True)
+                return
             
             await interaction.followup.send(f"✅ Reset {old_vote_count} votes in {group.thread.mention}", ephemeral=True)
             
@@ -385,13 +622,14 @@ class FractalCog(BaseCog):
             
             group = self.active_groups[thread_id_int]
             
-            if user not in group.active_candidates:
+            declared = await group.submit(group.declare_round_winner, user)
+            if declared is None:
+                await interaction.followup.send("❌ That fractal has already ended.", ephemeral=True)
+                return
+            if not declared:
                 await interaction.followup.send(f"❌ {user.mention} is not an active candidate in this fractal.", ephemeral=True)
                 return
             
-            await group.thread.send(f"⚡ **ADMIN DECLARATION:** {user.mention} declared winner of Level {group.current_level}!")
-            await group.start_new_round(user)
-            
             await interaction.followup.send(f"✅ Declared {user.mention} as winner in {group.thread.mention}", ephemeral=True)
             
         except ValueError:
@@ -421,21 +659,21 @@ class FractalCog(BaseCog):
             
             group = self.active_groups[thread_id_int]
             
-            if user in group.members:
-                await interaction.followup.send(f"❌ {user.mention} is already in this fractal.", ephemeral=True)
+            other = self.active_groups.group_for_member(user.id)
+            if other is not None and other is not group:
+                await interaction.followup.send(f"❌ {user.mention} is already in {other.thread.mention}.", ephemeral=True)
                 return
             
-            # Add to members and active candidates
-            group.members.append(user)
-            group.active_candidates.append(user)
-            
-            # Add to thread
-            try:
-                await group.thread.add_user(user)
-            except discord.HTTPException:
-                pass
+            # Add to members, active candidates and the thread
+            added = await group.submit(group.add_member, user)
+            if added is None:
+                await interaction.followup.send("❌ That fractal has already ended.", ephemeral=True)
+                return
+            if not added:
+                await interaction.followup.send(f"❌ {user.mention} is already in this fractal.", ephemeral=True)
+                return
             
-            await group.thread.send(f"⚡ **ADMIN ADD:** {user.mention} has been added to the fractal!")
+            await outbound.send(group.thread, f"⚡ **ADMIN ADD:** {user.mention} has been added to the fractal!")
             
             await interaction.followup.send(f"✅ Added {user.mention} to {group.thread.mention}", ephemeral=True)
             
@@ -465,21 +703,16 @@ class FractalCog(BaseCog):
             
             group = self.active_groups[thread_id_int]
             
-            if user not in group.members:
+            # Remove from members and active candidates, along with their vote
+            removed = await group.submit(group.remove_member, user)
+            if removed is None:
+                await interaction.followup.send("❌ That fractal has already ended.", ephemeral=True)
+                return
+            if not removed:
                 await interaction.followup.send(f"❌ {user.mention} is not in this fractal.", ephemeral=True)
                 return
             
-            # Remove from members and active candidates
-            if user in group.members:
-                group.members.remove(user)
-            if user in group.active_candidates:
-                group.active_candidates.remove(user)
-            
-            # Remove their vote if they had one
-            if user.id in group.votes:
-                del group.votes[user.id]
-            
-            await group.thread.send(f"⚡ **ADMIN REMOVE:** {user.mention} has been removed from the fractal.")
+            await outbound.send(group.thread, f"⚡ **ADMIN REMOVE:** {user.mention} has been removed from the fractal.")
             
             await interaction.followup.send(f"✅ Removed {user.mention} from {group.thread.mention}", ephemeral=True)
             
@@ -510,14 +743,14 @@ class FractalCog(BaseCog):
             group = self.active_groups[thread_id_int]
             old_facilitator = group.facilitator
             
-            if user not in group.members:
+            changed = await group.submit(group.change_facilitator, user)
+            if changed is None:
+                await interaction.followup.send("❌ That fractal has already ended.", ephemeral=True)
+                return
+            if not changed:
                 await interaction.followup.send(f"❌ {user.mention} must be a member of the fractal to become facilitator.", ephemeral=True)
                 return
             
-            group.facilitator = user
-            
-            await group.thread.send(f"⚡ **FACILITATOR CHANGE:** {old_facilitator.mention} → {user.mention}")
-            
             await interaction.followup.send(f"✅ Changed facilitator from {old_facilitator.mention} to {user.mention} in {group.thread.mention}", ephemeral=True)
             
         except ValueError:
@@ -547,18 +780,14 @@ class FractalCog(BaseCog):
             
             group = self.active_groups[thread_id_int]
             
-            # Add paused flag to group
-            if not hasattr(group, 'paused'):
-                group.paused = False
-            
-            if group.paused:
+            paused = await group.submit(group.pause)
+            if paused is None:
+                await interaction.followup.send("❌ That fractal has already ended.", ephemeral=True)
+                return
+            if not paused:
                 await interaction.followup.send("❌ Fractal is already paused.", ephemeral=True)
                 return
             
-            group.paused = True
-            
-            await group.thread.send("⏸️ **FRACTAL PAUSED** by admin. Voting is temporarily suspended.")
-            
             await interaction.followup.send(f"✅ Paused fractal in {group.thread.mention}", ephemeral=True)
             
         except ValueError:
@@ -587,14 +816,14 @@ class FractalCog(BaseCog):
             
             group = self.active_groups[thread_id_int]
             
-            if not hasattr(group, 'paused') or not group.paused:
+            resumed = await group.submit(group.unpause)
+            if resumed is None:
+                await interaction.followup.send("❌ That fractal has already ended.", ephemeral=True)
+                return
+            if not resumed:
                 await interaction.followup.send("❌ Fractal is not paused.", ephemeral=True)
                 return
             
-            group.paused = False
-            
-            await group.thread.send("▶️ **FRACTAL RESUMED** by admin. Voting continues!")
-            
             await interaction.followup.send(f"✅ Resumed fractal in {group.thread.mention}", ephemeral=True)
             
         except ValueError:
@@ -623,18 +852,11 @@ class FractalCog(BaseCog):
             
             group = self.active_groups[thread_id_int]
             
-            # Reset fractal state
-            group.current_level = 6
-            group.votes = {}
-            group.winners = {}
-            group.active_candidates = group.members.copy()
-            if hasattr(group, 'paused'):
-                group.paused = False
-            
-            await group.thread.send("🔄 **FRACTAL RESTARTED** by admin. Starting fresh from Level 6!")
-            
-            # Start new round
-            await group.start_new_round()
+            # Reset fractal state and start a new round
+            restarted = await group.submit(group.restart)
+            if restarted is None:
+                await interaction.followup.send("❌ That fractal has already ended.", ephemeral=True)
+                return
             
             await interaction.followup.send(f"✅ Restarted fractal in {group.thread.mention}", ephemeral=True)
             
@@ -672,23 +894,31 @@ class FractalCog(BaseCog):
             vote_percentage = (votes_cast / total_members * 100) if total_members > 0 else 0
             
             # Vote distribution
-            vote_counts = {}
-            for candidate_id in group.votes.values():
-                candidate = discord.utils.get(group.active_candidates, id=candidate_id)
-                if candidate:
-                    vote_counts[candidate.display_name] = vote_counts.get(candidate.display_name, 0) + 1
+            vote_counts = {
+                group.registry.get(candidate_id).display_name: count
+                for candidate_id, count in group.tally.distribution().items()
+                if group.registry.is_candidate(candidate_id)
+            }
             
             stats = f"# 📊 **Detailed Fractal Stats**\n\n"
             stats += f"**Thread:** {group.thread.mention}\n"
             stats += f"**Facilitator:** {group.facilitator.mention}\n"
             stats += f"**Current Level:** {group.current_level}\n"
-            stats += f"**Status:** {'⏸️ Paused' if hasattr(group, 'paused') and group.paused else '▶️ Active'}\n\n"
+            stats += f"**Status:** {'⏸️ Paused' if group.paused else '▶️ Active'}\n\n"
             
             stats += f"**Members:** {total_members}\n"
             stats += f"**Active Candidates:** {active_candidates}\n"
             stats += f"**Votes Cast:** {votes_cast}/{total_members} ({vote_percentage:.1f}%)\n"
             stats += f"**Votes Needed to Win:** {group.get_vote_threshold()}\n\n"
             
+            if group.tally_board:
+                round_saved = group.board_votes - group.board_edits
+                stats += f"**Tally Board:** {group.api_calls_saved} API calls saved in finished rounds, {round_saved} this round\n\n"
+            
+            if group.countdown_started is not None:
+                stats += f"**Live Countdown:** {group.countdown_edits} edits ({group.countdown_edits_per_minute():.1f}/min), "
+                stats += f"{group.countdown_skipped} unchanged refreshes skipped\n\n"
+            
             if vote_counts:
                 stats += "**Current Vote Distribution:**\n"
                 for candidate, count in sorted(vote_counts.items(), key=lambda x: x[1], reverse=True):
@@ -724,7 +954,7 @@ class FractalCog(BaseCog):
             guild_id = interaction.guild.id
             
             # Count active fractals for this server
-            server_fractals = [group for group in self.active_groups.values() if group.thread.guild.id == guild_id]
+            server_fractals = self.active_groups.in_guild(guild_id)
             
             total_active = len(server_fractals)
             total_participants = sum(len(group.members) for group in server_fractals)
@@ -746,23 +976,53 @@ class FractalCog(BaseCog):
             if server_fractals:
                 stats += "**Active Groups:**\n"
                 for group in server_fractals:
-                    status = "⏸️ Paused" if hasattr(group, 'paused') and group.paused else "▶️ Active"
+                    status = "⏸️ Paused" if group.paused else "▶️ Active"
                     stats += f"• {group.thread.name} - Level {group.current_level} ({status})\n"
             else:
                 stats += "No active fractals currently running.\n"
             
+            # Shared timer service and outbound queue (all servers)
+            timer_stats = self.timers.get_stats()
+            speaking = timer_stats['kinds'].get('speaking', {'active': 0, 'paused': 0, 'completed': 0})
+            stats += f"\n**Speaking Timers:** {speaking['active']} running, {speaking['paused']} paused, {speaking['completed']} completed\n"
+            stats += f"**Timer Service:** {timer_stats['active'] + timer_stats['paused']} timers live "
+            stats += f"(including countdown refreshes), max lateness {timer_stats['max_lateness'] * 1000:.0f}ms\n"
+            
+            if self.countdown.enabled:
+                countdown_stats = self.countdown.get_stats()
+                stats += f"**Live Countdowns:** {countdown_stats['active']} active, {countdown_stats['edits_last_minute']} edits in the last minute "
+                stats += f"(budget {self.countdown.budget:.0f}/min), backoff x{countdown_stats['backoff']:.1f}, "
+                stats += f"{countdown_stats['skipped']} unchanged refreshes skipped\n"
+            
+            setup_stats = self.setup_stats.get_stats()
+            if setup_stats['count']:
+                avg = setup_stats['avg']
+                stats += f"**Fractal Start-up:** first button after {avg['ready']:.2f}s on average (max {setup_stats['max']['ready']:.2f}s) "
+                stats += f"over {setup_stats['count']} starts; thread {avg['thread']:.2f}s, messages {avg['start']:.2f}s, "
+                stats += f"members {avg['members']:.2f}s in parallel\n"
+            
+            member_stats = self.member_resolver.get_stats()
+            stats += f"**Member Lookups:** {len(interaction.guild.members)} cached in this server, {member_stats['cached']} fetched on demand "
+            stats += f"({member_stats['hits']} hits, {member_stats['misses']} API fetches)\n"
+            
+            outbound_stats = outbound.get_stats()
+            stats += f"\n**Outbound Messages:** {outbound_stats['sent']} sent, {outbound_stats['depth']} queued, "
+            stats += f"{outbound_stats['coalesced']} edits merged, {outbound_stats['rate_limited']} rate limited\n"
+            for priority, waits in outbound_stats['waits'].items():
+                if waits['count']:
+                    stats += f"• {priority.title()}: avg wait {waits['avg_wait']:.2f}s, max {waits['max_wait']:.2f}s\n"
+            
             await interaction.followup.send(stats, ephemeral=True)
             
         except Exception as e:
             await interaction.followup.send(f"❌ Error getting server stats: {str(e)}", ephemeral=True)
     
     @app_commands.command(
-        name="admin_export_data",
-        description="[ADMIN] Export fractal data for analysis"
+        name="admin_web_status",
+        description="[ADMIN] Web dashboard delivery health"
     )
-    @app_commands.describe(thread_id="ID of the fractal thread (optional - exports all if not specified)")
-    async def admin_export_data(self, interaction: discord.Interaction, thread_id: str = None):
-        """Admin command to export fractal data"""
+    async def admin_web_status(self, interaction: discord.Interaction):
+        """Admin command to show webhook circuit breaker and queue state"""
         await interaction.response.defer(ephemeral=True)
         
         if not interaction.user.guild_permissions.administrator:
@@ -770,60 +1030,102 @@ class FractalCog(BaseCog):
             return
         
         try:
-            import json
-            from datetime import datetime
-            
-            export_data = {
-                "export_timestamp": datetime.now().isoformat(),
-                "server_id": interaction.guild.id,
-                "server_name": interaction.guild.name,
-                "fractals": []
-            }
+            web_status = web_integration.get_status()
+            circuit = web_status['circuit']
+            dispatcher = web_status['dispatcher']
+            
+            state_labels = {'closed': '🟢 Closed', 'half_open': '🟡 Half-open', 'open': '🔴 Open'}
+            p95 = f"{circuit['p95_latency'] * 1000:.0f}ms" if circuit['p95_latency'] is not None else "n/a"
+            
+            stats = "# 🌐 **Web Integration Status**\n\n"
+            stats += f"**Circuit:** {state_labels.get(circuit['state'], circuit['state'])}\n"
+            stats += f"**Failure Rate:** {circuit['failure_rate'] * 100:.0f}%\n"
+            stats += f"**p95 Latency:** {p95}\n"
+            stats += f"**Request Timeout:** {circuit['timeout']:.1f}s\n"
+            stats += f"**Rejected While Open:** {circuit['rejected']} (opened {circuit['times_opened']} times)\n\n"
+            
+            stats += f"**Queued:** {dispatcher['depth']} ({dispatcher['in_flight']} in flight)\n"
+            stats += f"**Held For Retry Or Recovery:** {web_status['held']} ({web_status['blocked_fractals']} fractals held back)\n"
+            stats += f"**Dead-Lettered:** {web_status['dead_lettered']}\n"
+            stats += f"**Delivered / Failed:** {dispatcher['delivered']} / {dispatcher['failed']}\n"
+            stats += f"**Requests Sent:** {dispatcher['requests']} ({dispatcher['coalesced']} events coalesced, {dispatcher['dropped']} dropped)\n"
+            stats += f"**Max Queue Lag:** {dispatcher['max_lag']:.2f}s\n"
             
-            if thread_id:
-                # Export specific fractal
-                thread_id_int = int(thread_id)
-                if thread_id_int not in self.active_groups:
-                    await interaction.followup.send("❌ No active fractal found with that thread ID.", ephemeral=True)
-                    return
-                groups_to_export = [self.active_groups[thread_id_int]]
+            await interaction.followup.send(stats, ephemeral=True)
+            
+        except Exception as e:
+            await interaction.followup.send(f"❌ Error getting web status: {str(e)}", ephemeral=True)
+    
+    @app_commands.command(
+        name="admin_export_data",
+        description="[ADMIN] Export active and completed fractal data for analysis"
+    )
+    @app_commands.describe(
+        thread_id="ID of the fractal thread (optional - exports all if not specified)",
+        format="File format (default: NDJSON)",
+        since="Only fractals started/completed on or after this date (YYYY-MM-DD)",
+        until="Only fractals started/completed on or before this date (YYYY-MM-DD)",
+        include_history="Include completed fractals (default: yes)"
+    )
+    @app_commands.choices(format=[
+        app_commands.Choice(name="NDJSON", value="ndjson"),
+        app_commands.Choice(name="CSV", value="csv")
+    ])
+    async def admin_export_data(
+        self,
+        interaction: discord.Interaction,
+        thread_id: str = None,
+        format: str = "ndjson",
+        since: str = None,
+        until: str = None,
+        include_history: bool = True
+    ):
+        """Admin command to export fractal data as gzipped, size-capped parts"""
+        await interaction.response.defer(ephemeral=True)
+        
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.followup.send("❌ You need administrator permissions to use this command.", ephemeral=True)
+            return
+        
+        try:
+            guild_id = interaction.guild.id
+            thread_id_int = int(thread_id) if thread_id else None
+            since_key = date.fromisoformat(since).isoformat() if since else None
+            until_key = (date.fromisoformat(until) + timedelta(days=1)).isoformat() if until else None  # Inclusive end date
+            
+            # Active groups are snapshotted here; history is streamed from disk while writing
+            if thread_id_int is not None:
+                group = self.active_groups.get(thread_id_int)
+                active = [group] if group and group.thread.guild.id == guild_id else []
             else:
-                # Export all fractals for this server
-                groups_to_export = [group for group in self.active_groups.values() if group.thread.guild.id == interaction.guild.id]
-            
-            for group in groups_to_export:
-                fractal_data = {
-                    "thread_id": group.thread.id,
-                    "thread_name": group.thread.name,
-                    "facilitator": {
-                        "id": group.facilitator.id,
-                        "name": group.facilitator.display_name
-                    },
-                    "current_level": group.current_level,
-                    "paused": hasattr(group, 'paused') and group.paused,
-                    "members": [{"id": m.id, "name": m.display_name} for m in group.members],
-                    "active_candidates": [{"id": m.id, "name": m.display_name} for m in group.active_candidates],
-                    "votes": {str(voter_id): candidate_id for voter_id, candidate_id in group.votes.items()},
-                    "winners": {str(level): {"id": winner.id, "name": winner.display_name} for level, winner in group.winners.items()}
-                }
-                export_data["fractals"].append(fractal_data)
-            
-            # Create JSON file content
-            json_content = json.dumps(export_data, indent=2)
-            
-            # Create file and send
-            import io
-            file_buffer = io.StringIO(json_content)
-            file = discord.File(file_buffer, filename=f"fractal_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+                active = self.active_groups.in_guild(guild_id)
+            records = [
+                group.export_record() for group in active
+                if (since_key is None or (group.started_at or '') >= since_key)
+                and (until_key is None or (group.started_at or '') < until_key)
+            ]
+            if include_history:
+                records = itertools.chain(records, self.history.iter_records(guild_id, thread_id_int, since_key, until_key))
+            
+            basename = f"fractal_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            with tempfile.TemporaryDirectory() as directory:
+                paths, count = await asyncio.to_thread(
+                    write_export, records, format, directory, basename, self.export_part_bytes
+                )
+                
+                if count == 0:
+                    await interaction.followup.send("❌ No fractal data matched the export filters.", ephemeral=True)
+                    return
             
-            await interaction.followup.send(
-                f"📁 **Data Export Complete**\n"
-                f"Exported {len(export_data['fractals'])} fractal(s) from {interaction.guild.name}",
-                file=file,
-                ephemeral=True
-            )
+                await interaction.followup.send(
+                    f"📁 **Data Export Complete**\n"
+                    f"Exported {count} fractal(s) from {interaction.guild.name} in {len(paths)} file(s)",
+                    ephemeral=True
+                )
+                for path in paths:
+                    await interaction.followup.send(file=discord.File(path, filename=os.path.basename(path)), ephemeral=True)
             
         except ValueError:
-            await interaction.followup.send("❌ Invalid thread ID format.", ephemeral=True)
+            await interaction.followup.send("❌ Invalid thread ID or date format (use YYYY-MM-DD).", ephemeral=True)
         except Exception as e:
             await interaction.followup.send(f"❌ Error exporting data: {str(e)}", ephemeral=True)
@@ -0,0 +1,71 @@
+import os
+import time
+from collections import deque
+from typing import Any, Dict
+
+
+class CountdownPacer:
+    """Shared cadence for live speaking countdowns on voice control panels
+    
+    Each group in its speaking phase edits its control message every
+    `interval` seconds, and every `final_interval` seconds in the speaker's
+    last minute. When enough groups are counting down at once that their
+    combined edits would exceed `budget` edits per minute, every group's
+    cadence is stretched by the same factor.
+    """
+    
+    def __init__(self):
+        self.enabled = os.getenv('VOICE_COUNTDOWN_MODE', 'FALSE').upper() == 'TRUE'
+        self.interval = float(os.getenv('VOICE_COUNTDOWN_INTERVAL', '30'))
+        self.final_interval = float(os.getenv('VOICE_COUNTDOWN_FINAL_INTERVAL', '10'))
+        self.budget = float(os.getenv('VOICE_COUNTDOWN_BUDGET', '300'))  # Edits per minute, all groups
+        self.active = set()  # Thread IDs with a live countdown
+        self.recent_edits = deque()  # Monotonic times of edits in the last minute
+        self.edits = 0
+        self.skipped = 0
+        self.max_backoff = 1.0
+    
+    def start(self, thread_id: int):
+        self.active.add(thread_id)
+    
+    def stop(self, thread_id: int):
+        self.active.discard(thread_id)
+    
+    def backoff(self) -> float:
+        """Factor every countdown interval is stretched by to stay within the budget"""
+        worst_case = len(self.active) * 60 / self.final_interval
+        return max(1.0, worst_case / self.budget)
+    
+    def next_interval(self, remaining: float) -> float:
+        """Seconds until a countdown with `remaining` seconds left should next refresh"""
+        backoff = self.backoff()
+        self.max_backoff = max(self.max_backoff, backoff)
+        if remaining > 60:
+            # Refresh on entering the last minute so the faster cadence starts on time
+            return min(self.interval, max(remaining - 60, 1.0)) * backoff
+        return self.final_interval * backoff
+    
+    def record_edit(self):
+        now = time.monotonic()
+        self.edits += 1
+        self.recent_edits.append(now)
+        self._prune(now)
+    
+    def record_skip(self):
+        self.skipped += 1
+    
+    def _prune(self, now: float):
+        while self.recent_edits and now - self.recent_edits[0] > 60:
+            self.recent_edits.popleft()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Aggregate edit rate and current backoff"""
+        self._prune(time.monotonic())
+        return {
+            'active': len(self.active),
+            'edits': self.edits,
+            'skipped': self.skipped,
+            'edits_last_minute': len(self.recent_edits),
+            'backoff': self.backoff(),
+            'max_backoff': self.max_backoff
+        }
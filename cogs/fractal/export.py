@@ -0,0 +1,120 @@
+import csv
+import gzip
+import io
+import os
+from typing import Any, Dict, Iterable, List, Tuple
+from utils.serialization import get_serializer
+
+CSV_COLUMNS = [
+    'thread_id', 'thread_name', 'guild_id', 'status', 'started_at', 'ended_at',
+    'facilitator_id', 'facilitator_name', 'current_level', 'paused',
+    'member_ids', 'member_names', 'ranking_ids', 'ranking_names', 'votes_cast'
+]
+
+FLUSH_BYTES = 256 * 1024  # Uncompressed bytes between gzip sync flushes
+
+
+def csv_row(record: Dict[str, Any]) -> List[Any]:
+    """Flatten one export record into CSV_COLUMNS; lists are joined with ';'"""
+    ranking = [record['winners'][level] for level in sorted(record['winners'], key=int, reverse=True)]
+    return [
+        record['thread_id'],
+        record['thread_name'],
+        record['guild_id'],
+        record['status'],
+        record['started_at'] or '',
+        record['ended_at'] or '',
+        record['facilitator']['id'],
+        record['facilitator']['name'],
+        record['current_level'],
+        record['paused'],
+        ';'.join(str(m['id']) for m in record['members']),
+        ';'.join(m['name'] for m in record['members']),
+        ';'.join(str(w['id']) for w in ranking),
+        ';'.join(w['name'] for w in ranking),
+        len(record['votes'])
+    ]
+
+
+class PartWriter:
+    """Gzip output split into numbered files of at most `max_bytes` each
+    
+    Rows are compressed as they are written. The gzip stream is sync-flushed
+    every FLUSH_BYTES of input, so the file size on disk is never more than
+    that far behind, and a new part is started before a row could push the
+    current one over the cap.
+    """
+    
+    def __init__(self, directory: str, basename: str, extension: str, max_bytes: int, header: bytes = b''):
+        self.directory = directory
+        self.basename = basename
+        self.extension = extension
+        self.max_bytes = max_bytes
+        self.header = header
+        self.paths: List[str] = []
+        self.raw = None
+        self.file = None
+        self.pending = 0  # Bytes written since the last flush
+        self.rows_in_part = 0
+    
+    def write(self, row: bytes):
+        if self.file is None or (self.rows_in_part and self.raw.tell() + self.pending + len(row) > self.max_bytes):
+            self._next_part()
+        self.file.write(row)
+        self.pending += len(row)
+        self.rows_in_part += 1
+        if self.pending >= FLUSH_BYTES:
+            self.file.flush()
+            self.pending = 0
+    
+    def _next_part(self):
+        self._close_part()
+        path = os.path.join(self.directory, f"{self.basename}_{len(self.paths) + 1}.{self.extension}.gz")
+        self.paths.append(path)
+        self.raw = open(path, 'wb')
+        self.file = gzip.GzipFile(filename=os.path.basename(path)[:-3], mode='wb', fileobj=self.raw)
+        self.pending = 0
+        self.rows_in_part = 0
+        if self.header:
+            self.write(self.header)
+            self.rows_in_part = 0
+    
+    def _close_part(self):
+        if self.file is not None:
+            self.file.close()
+            self.raw.close()
+            self.file = None
+    
+    def close(self) -> List[str]:
+        """Finish the last part and return every part's path"""
+        self._close_part()
+        return self.paths
+
+
+def write_export(records: Iterable[Dict[str, Any]], format: str, directory: str, basename: str, max_bytes: int) -> Tuple[List[str], int]:
+    """Stream records into gzipped NDJSON or CSV parts; returns the part paths and record count"""
+    if format == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        
+        def encode(row):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerow(row)
+            return buffer.getvalue().encode('utf-8')
+        
+        parts = PartWriter(directory, basename, 'csv', max_bytes, header=encode(CSV_COLUMNS))
+        rows = (encode(csv_row(record)) for record in records)
+    else:
+        serializer = get_serializer('json')
+        parts = PartWriter(directory, basename, 'ndjson', max_bytes)
+        rows = (serializer.dumps(record) + b'\n' for record in records)
+    
+    count = 0
+    try:
+        for row in rows:
+            parts.write(row)
+            count += 1
+    finally:
+        paths = parts.close()
+    return paths, count
@@ -1,40 +1,212 @@
 import discord
 import logging
 import asyncio
+import os
 import random
-from typing import Optional, List, Dict
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Optional, List, Dict
+from utils.outbound import outbound, CRITICAL, LOW
 from utils.web_integration import web_integration
-from .speaking_queue import SpeakingQueue, VoiceTimer
+from .speaking_queue import SpeakerState, SpeakingQueue, VoiceTimer
+from .tally import VoteTally
+from .members import MemberRegistry
 
 class FractalGroup:
     """Core class for managing a fractal voting group"""
     
+    # Every field a group holds; members are stored once in the registry and
+    # everything else refers to them by user ID
+    __slots__ = (
+        'thread', 'facilitator', 'registry', 'tally', 'current_level', 'current_voting_message', 'paused', 'ended', 'started_at',
+        'voice_channel', 'speaking_time', 'voice_phase_active', 'speaking_queue', 'voice_timer', 'voice_control_message',
+        'cog', 'logger', 'mailbox', 'mailbox_task',
+        'tally_board', 'tally_board_interval', 'board_task', 'board_dirty', 'board_last_edit',
+        'board_votes', 'board_edits', 'api_calls_saved',
+        'countdown_timer', 'countdown_text', 'countdown_started', 'countdown_edits', 'countdown_skipped'
+    )
+    
     def __init__(self, thread: discord.Thread, members: List[discord.Member], facilitator: discord.Member, cog, voice_channel=None, speaking_time=120):
         """Initialize a new fractal group"""
         self.thread = thread
         self.facilitator = facilitator
-        self.members = members
-        self.active_candidates = members.copy()  # Members currently in voting pool
-        self.votes = {}  # Dict mapping voter_id to candidate_id
-        self.winners = {}  # Dict mapping level to winner
+        self.registry = MemberRegistry(members)  # Members, candidates and winners keyed by user ID
+        self.tally = VoteTally()  # Current round's votes, counted incrementally
         self.current_level = 6  # Start at level 6
         self.current_voting_message = None
+        self.paused = False
+        self.ended = False  # Set by end_fractal; later commands are skipped
+        self.started_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
         
         # Voice phase attributes
         self.voice_channel = voice_channel
         self.speaking_time = speaking_time
         self.voice_phase_active = voice_channel is not None
-        self.speaking_queue = SpeakingQueue(members) if voice_channel else None
-        self.voice_timer = VoiceTimer(speaking_time) if voice_channel else None
+        self.speaking_queue = SpeakingQueue(members, self.registry.get, self.in_voice) if voice_channel else None
+        self.voice_timer = VoiceTimer(speaking_time, cog.timers) if voice_channel else None
         self.voice_control_message = None
         self.cog = cog
         self.logger = logging.getLogger('bot')
         
+        # Command mailbox: state-changing commands run one at a time, in arrival order.
+        # Only allocated while commands are pending; most groups are idle most of the time.
+        self.mailbox = None
+        self.mailbox_task = None
+        
+        # Tally board: edit the voting message in place instead of posting each vote
+        self.tally_board = os.getenv('TALLY_BOARD_MODE', 'FALSE').upper() == 'TRUE'
+        self.tally_board_interval = float(os.getenv('TALLY_BOARD_INTERVAL', '2'))
+        self.board_task = None  # Pending debounced edit
+        self.board_dirty = False
+        self.board_last_edit = 0.0
+        self.board_votes = 0  # Votes this round, each of which would have been a message
+        self.board_edits = 0  # Edits actually made this round
+        self.api_calls_saved = 0
+        
+        # Live countdown: refresh the voice control panel as the speaker's time runs down
+        self.countdown_timer = None  # Next scheduled refresh
+        self.countdown_text = None  # Panel content as last sent
+        self.countdown_started = None
+        self.countdown_edits = 0
+        self.countdown_skipped = 0  # Refreshes dropped because nothing visible changed
+        
         self.logger.info(f"Created fractal group '{thread.name}' with facilitator {facilitator.display_name} and {len(members)} members")
     
+    @property
+    def votes(self):
+        """Dict mapping voter_id to candidate_id for the current round (read-only)"""
+        return self.tally.votes
+    
+    @property
+    def members(self) -> List[discord.Member]:
+        """All group members in join order"""
+        return self.registry.members
+    
+    @property
+    def active_candidates(self) -> List[discord.Member]:
+        """Members currently in the voting pool, in join order"""
+        return self.registry.candidates
+    
+    @property
+    def winners(self) -> Dict[int, discord.Member]:
+        """Dict mapping level to winner"""
+        return self.registry.winners
+    
+    def submit(self, handler: Callable[..., Awaitable[Any]], *args) -> asyncio.Future:
+        """Queue a command for this group; the returned future resolves with its result
+        
+        Votes, speaker controls and admin actions all go through here so a
+        command's checks and state changes can never interleave with another
+        command's at an await. Once the fractal has ended, queued commands
+        are skipped and resolve to None. Handlers run inside the mailbox and must not
+        await submit() themselves. Each group has its own mailbox, so
+        separate fractals still run concurrently.
+        """
+        future = asyncio.get_running_loop().create_future()
+        if self.mailbox is None:
+            self.mailbox = deque()
+        self.mailbox.append((handler, args, future))
+        if self.mailbox_task is None or self.mailbox_task.done():
+            self.mailbox_task = asyncio.create_task(self._drain_mailbox())
+        return future
+    
+    def post(self, handler: Callable[..., Awaitable[Any]], *args):
+        """Queue a command nobody waits on; if it fails, the failure is logged here"""
+        self.submit(handler, *args).add_done_callback(lambda future: self._log_failure(future, handler))
+    
+    def _log_failure(self, future: asyncio.Future, handler: Callable[..., Awaitable[Any]]):
+        if future.cancelled() or future.exception() is None:
+            return
+        error = future.exception()
+        self.logger.error(f"{handler.__name__} failed in fractal '{self.thread.name}': {error}", exc_info=error)
+    
+    async def _drain_mailbox(self):
+        """Run queued commands in order until the mailbox is empty"""
+        while self.mailbox:
+            handler, args, future = self.mailbox.popleft()
+            if future.cancelled():
+                continue  # Caller gave up (e.g. a cancelled speaker timer)
+            if self.ended:
+                # Commands queued behind the end (a late vote, a second end) resolve to None
+                future.set_result(None)
+                continue
+            
+            try:
+                result = await handler(*args)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+        self.mailbox = None
+    
+    def record(self, event_type: str, **data):
+        """Append a state change to the cog's journal so it survives a restart"""
+        journal = getattr(self.cog, 'journal', None)
+        if journal:
+            journal.append(self.thread.id, event_type, data)
+    
+    def restore_state(self, state: Dict[str, Any]):
+        """Re-apply journaled round state to a group rebuilt with its members"""
+        self.current_level = state['level']
+        self.started_at = state.get('started_at') or self.started_at
+        for level, user_id in state['winners'].items():
+            if user_id in self.registry:
+                self.registry.declare_winner(user_id, int(level))
+        for voter_id, candidate_id in state['votes'].items():
+            if self.registry.is_candidate(candidate_id):
+                self.tally.cast(int(voter_id), candidate_id)
+        self.paused = state['paused']
+        
+        self.voice_phase_active = state['voice_phase'] and self.speaking_queue is not None
+        if self.voice_phase_active and state['speaking']:
+            self.speaking_queue.restore_state(state['speaking'])
+    
+    async def resume(self, message_id: Optional[int] = None):
+        """Re-attach a restored group to its thread: voting buttons, or the speaking phase"""
+        from .views import VoiceFractalControlView
+        
+        if self.voice_phase_active:
+            # Timers don't survive a restart, so the current speaker starts a fresh turn
+            self.voice_control_message = await outbound.send(
+                self.thread,
+                self.format_voice_status(),
+                view=VoiceFractalControlView(self)
+            )
+            current = self.speaking_queue.current_speaker
+            if current:
+                await self.voice_timer.start_timer(
+                    current,
+                    self.thread,
+                    warning_callback=self.speaker_warning,
+                    complete_callback=self.speaker_time_up
+                )
+                if self.paused:
+                    self.voice_timer.pause()
+                self.schedule_countdown()
+            else:
+                await self.start_next_speaker()
+        elif message_id:
+            # VoteButton routes clicks by custom ID, so the existing voting message keeps working
+            self.current_voting_message = self.thread.get_partial_message(message_id)
+        else:
+            await self.start_new_round()
+    
     async def start_fractal(self):
         """Start the fractal voting process (with optional voice phase)"""
         self.logger.info(f"Starting fractal process for '{self.thread.name}' with {len(self.members)} members")
+        self.record(
+            'created',
+            guild_id=self.thread.guild.id,
+            facilitator=self.facilitator.id,
+            members=[m.id for m in self.members],
+            level=self.current_level,
+            voice_channel=self.voice_channel.id if self.voice_channel else None,
+            speaking_time=self.speaking_time,
+            started_at=self.started_at
+        )
         
         if self.voice_phase_active:
             await self.start_voice_phase()
@@ -47,13 +219,13 @@ class FractalGroup:
                 f"🗳️ **Starting fractal voting process...**\n"
                 f"We'll vote through levels 6→1 until we have a winner!\n\n"
             )
-            await self.thread.send(welcome_msg)
+            await outbound.send(self.thread, welcome_msg)
             
             # Start voting immediately for text-only fractals
             await self.start_new_round()
         
         # Notify web app that fractal started
-        await web_integration.notify_fractal_started(self)
+        web_integration.notify_fractal_started(self)
     
     async def start_voice_phase(self):
         """Start the voice speaking phase"""
@@ -65,13 +237,14 @@ class FractalGroup:
             f"⏱️ Each person gets {self.speaking_time//60} minutes to speak\n"
             f"🎯 After everyone speaks, we'll vote here in this thread!\n\n"
         )
-        await self.thread.send(welcome_msg)
+        await outbound.send(self.thread, welcome_msg)
         
         # Create voice control panel
         from .views import VoiceFractalControlView
         control_view = VoiceFractalControlView(self)
         
-        self.voice_control_message = await self.thread.send(
+        self.voice_control_message = await outbound.send(
+            self.thread,
             self.format_voice_status(), 
             view=control_view
         )
@@ -85,14 +258,12 @@ class FractalGroup:
             return
         
         next_speaker = self.speaking_queue.next_speaker()
+        self.record('speaking', **self.speaking_queue.to_state())
         if not next_speaker:
             # All speakers done, transition to voting
             await self.transition_to_voting()
             return
         
-        # Update control panel
-        await self.update_voice_control_display()
-        
         # Start timer for this speaker
         await self.voice_timer.start_timer(
             next_speaker,
@@ -100,14 +271,24 @@ class FractalGroup:
             warning_callback=self.speaker_warning,
             complete_callback=self.speaker_time_up
         )
+        
+        # Update control panel
+        await self.update_voice_control_display()
     
     async def speaker_warning(self, speaker: discord.Member, seconds_remaining: int):
         """Called when speaker has limited time remaining"""
-        await self.thread.send(f"⏰ {speaker.mention} - {seconds_remaining} seconds remaining!")
+        await outbound.send(self.thread, f"⏰ {speaker.mention} - {seconds_remaining} seconds remaining!", priority=LOW)
     
     async def speaker_time_up(self, speaker: discord.Member):
         """Called when speaker's time is up"""
-        await self.thread.send(f"⏱️ Time's up {speaker.mention}!")
+        self.post(self.finish_speaker, speaker)
+    
+    async def finish_speaker(self, speaker: discord.Member):
+        """Announce time up and move on, unless the speaker was already advanced past"""
+        if not self.voice_phase_active or self.speaking_queue.current_id != speaker.id:
+            return
+        
+        await outbound.send(self.thread, f"⏱️ Time's up {speaker.mention}!")
         # Auto-advance to next speaker
         await self.start_next_speaker()
     
@@ -119,14 +300,12 @@ class FractalGroup:
         current = self.speaking_queue.current_speaker
         if current:
             self.voice_timer.stop_timer()
-            next_speaker = self.speaking_queue.skip_and_return()
+            self.speaking_queue.skip_current()
             
-            await self.thread.send(f"⏸️ {current.display_name} skipped - will return later")
+            await outbound.send(self.thread, f"⏸️ {current.display_name} skipped - will return later")
             
-            if next_speaker:
-                await self.start_next_speaker()
-            else:
-                await self.transition_to_voting()
+            # Advances to the next speaker, or to voting once nobody is left
+            await self.start_next_speaker()
     
     async def advance_speaker(self):
         """Manually advance to next speaker"""
@@ -134,6 +313,27 @@ class FractalGroup:
             self.voice_timer.stop_timer()
         await self.start_next_speaker()
     
+    def in_voice(self, user_id: int) -> bool:
+        """Whether a member is in this fractal's voice channel"""
+        return self.cog.voice_occupancy.channel_of(user_id) == self.voice_channel.id
+    
+    async def member_left_voice(self, member: discord.Member):
+        """A member left the voice channel: skip their turn if speaking, and re-check the vote threshold"""
+        if self.voice_phase_active:
+            if self.speaking_queue.current_id == member.id:
+                self.voice_timer.stop_timer()
+                self.speaking_queue.skip_current()
+                await outbound.send(self.thread, f"🔇 {member.display_name} left the voice channel - they'll speak after the queue if they return")
+                await self.start_next_speaker()
+        elif self.current_voting_message and not self.paused:
+            await self.check_for_winner()  # Fewer members present can mean a lower threshold
+    
+    async def member_joined_voice(self, member: discord.Member):
+        """A member came back to the voice channel: put a skipped speaker back in the queue"""
+        if self.voice_phase_active and self.speaking_queue.states.get(member.id) is SpeakerState.SKIPPED:
+            self.speaking_queue.move_speaker(member.id, to_front=False)
+            await self.update_voice_control_display()
+    
     async def extend_speaking_time(self, seconds: int):
         """Add time to current speaker"""
         if self.voice_timer:
@@ -142,7 +342,17 @@ class FractalGroup:
     
     async def transition_to_voting(self):
         """Transition from voice phase to voting phase"""
-        await self.thread.send(
+        if not self.voice_phase_active:
+            return  # Already voting (e.g. skip pressed as the last speaker finished)
+        
+        # Switch to voting mode
+        self.voice_phase_active = False
+        if self.voice_timer:
+            self.voice_timer.stop_timer()
+        self.stop_countdown()
+        
+        await outbound.send(
+            self.thread,
             f"🗣️ **Speaking phase complete!**\n"
             f"🗳️ **Now starting silent voting phase...**\n"
             f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
@@ -150,10 +360,8 @@ class FractalGroup:
         
         # Disable voice controls
         if self.voice_control_message:
-            await self.voice_control_message.edit(view=None)
+            await outbound.edit(self.voice_control_message, view=None)
         
-        # Switch to voting mode
-        self.voice_phase_active = False
         await self.start_new_round()
     
     def format_voice_status(self) -> str:
@@ -166,7 +374,8 @@ class FractalGroup:
         current = self.speaking_queue.current_speaker
         if current:
             time_remaining = self.voice_timer.get_time_remaining_formatted() if self.voice_timer else "Unknown"
-            status_lines.append(f"**Current Speaker:** {current.mention} ({time_remaining} remaining)")
+            paused = " ⏸️ paused" if self.voice_timer and self.voice_timer.is_paused else ""
+            status_lines.append(f"**Current Speaker:** {current.mention} ({time_remaining} remaining){paused}")
         
         queue_display = self.speaking_queue.format_queue_display()
         if queue_display != "No speakers in queue":
@@ -177,40 +386,197 @@ class FractalGroup:
     async def update_voice_control_display(self):
         """Update the voice control panel display"""
         if self.voice_control_message:
+            self.countdown_text = self.format_voice_status()
             try:
-                await self.voice_control_message.edit(content=self.format_voice_status())
+                await outbound.edit(self.voice_control_message, content=self.countdown_text, priority=LOW)
             except discord.NotFound:
                 pass  # Message was deleted
+        self.schedule_countdown()
+    
+    def schedule_countdown(self):
+        """Queue the next live countdown refresh, replacing any already queued"""
+        self.stop_countdown()
+        pacer = self.cog.countdown
+        if not pacer.enabled or not self.voice_phase_active or not self.voice_timer.is_running:
+            return
+        
+        if self.countdown_started is None:
+            self.countdown_started = time.monotonic()
+        pacer.start(self.thread.id)
+        self.countdown_timer = self.cog.timers.schedule(
+            pacer.next_interval(self.voice_timer.time_remaining),
+            self._refresh_countdown,
+            kind='countdown'
+        )
+    
+    async def _refresh_countdown(self):
+        """Edit the control panel with the current time left, unless nothing visible changed"""
+        if not self.voice_phase_active or not self.voice_control_message:
+            self.stop_countdown()
+            return
         
-    async def add_member(self, member: discord.Member):
-        """Add a member to the fractal group"""
-        if member not in self.members:
-            self.members.append(member)
-            self.active_candidates.append(member)
-            await self.thread.add_user(member)
-            self.logger.info(f"Added {member.display_name} to fractal group '{self.thread.name}'")
+        content = self.format_voice_status()
+        if content == self.countdown_text:
+            self.countdown_skipped += 1  # e.g. timer paused
+            self.cog.countdown.record_skip()
+        else:
+            self.countdown_text = content
+            self.countdown_edits += 1
+            self.cog.countdown.record_edit()
+            try:
+                await outbound.edit(self.voice_control_message, content=content, priority=LOW)
+            except discord.HTTPException:
+                pass  # Next refresh tries again; a deleted panel stops with the voice phase
+        self.schedule_countdown()
+    
+    def stop_countdown(self):
+        """Cancel any queued countdown refresh"""
+        if self.countdown_timer:
+            self.cog.timers.cancel(self.countdown_timer)
+            self.countdown_timer = None
+        self.cog.countdown.stop(self.thread.id)
+    
+    def countdown_edits_per_minute(self) -> float:
+        """Average live countdown edits per minute since this group's countdown started"""
+        if self.countdown_started is None:
+            return 0.0
+        return self.countdown_edits * 60 / max(time.monotonic() - self.countdown_started, 60)
+        
+    async def add_member(self, member: discord.Member) -> bool:
+        """Add a member to the fractal group; returns False if already present"""
+        if not self.registry.add(member):
+            return False
+        self.cog.active_groups.member_added(self, member.id)
+        self.record('member_added', user=member.id)
+        
+        try:
+            await outbound.add_user(self.thread, member)
+        except discord.HTTPException:
+            pass
+        self.logger.info(f"Added {member.display_name} to fractal group '{self.thread.name}'")
+        return True
+    
+    async def remove_member(self, member: discord.Member) -> bool:
+        """Remove a member and withdraw their vote; returns False if not present"""
+        if not self.registry.remove(member.id):
+            return False
+        self.cog.active_groups.member_removed(self, member.id)
+        self.record('member_removed', user=member.id)
+        if self.speaking_queue:
+            self.speaking_queue.discard(member.id)
+        
+        if self.tally.remove_voter(member.id) is not None and self.tally_board:
+            self.schedule_tally_board()
+        self.logger.info(f"Removed {member.display_name} from fractal group '{self.thread.name}'")
+        return True
+    
+    async def reset_votes(self) -> int:
+        """Clear the current round's votes; returns how many were cleared"""
+        vote_count = len(self.tally)
+        self.tally.reset()
+        self.record('votes_reset')
+        if self.tally_board:
+            self.schedule_tally_board()
+        await outbound.send(self.thread, f"⚡ **ADMIN RESET:** All votes cleared. Voting restarted for Level {self.current_level}.")
+        return vote_count
+    
+    async def force_round(self) -> discord.Member:
+        """End the round now with the current leader (or a random candidate) as winner"""
+        leaders = self.tally.leaders()
+        if leaders:
+            winner = self.registry.get_candidate(random.choice(leaders))
+        else:
+            # No votes cast, pick random candidate
+            winner = random.choice(self.active_candidates)
+        
+        await outbound.send(self.thread, f"⚡ **ADMIN OVERRIDE:** Forcing round completion. Winner: {winner.mention}")
+        await self.start_new_round(winner)
+        return winner
+    
+    async def declare_round_winner(self, member: discord.Member) -> bool:
+        """Declare a candidate the current level's winner; returns False if not a candidate"""
+        if not self.registry.is_candidate(member.id):
+            return False
+        
+        await outbound.send(self.thread, f"⚡ **ADMIN DECLARATION:** {member.mention} declared winner of Level {self.current_level}!")
+        await self.start_new_round(member)
+        return True
+    
+    async def pause(self) -> bool:
+        """Suspend voting and the speaker's timer; returns False if already paused"""
+        if self.paused:
+            return False
+        self.paused = True
+        self.record('paused', paused=True)
+        if self.voice_timer:
+            self.voice_timer.pause()
+        
+        await outbound.send(self.thread, "⏸️ **FRACTAL PAUSED** by admin. Voting is temporarily suspended.")
+        return True
+    
+    async def unpause(self) -> bool:
+        """Let voting and the speaker's timer continue; returns False if not paused"""
+        if not self.paused:
+            return False
+        self.paused = False
+        self.record('paused', paused=False)
+        if self.voice_timer:
+            self.voice_timer.resume()
+        
+        await outbound.send(self.thread, "▶️ **FRACTAL RESUMED** by admin. Voting continues!")
+        return True
+    
+    async def change_facilitator(self, member: discord.Member) -> bool:
+        """Hand the facilitator role to another member; returns False if they aren't in the group"""
+        if member.id not in self.registry:
+            return False
+        old_facilitator = self.facilitator
+        self.facilitator = member
+        self.cog.active_groups.facilitator_changed(self, old_facilitator.id)
+        self.record('facilitator', user=member.id)
+        
+        await outbound.send(self.thread, f"⚡ **FACILITATOR CHANGE:** {old_facilitator.mention} → {member.mention}")
+        return True
+    
+    async def restart(self):
+        """Start over from level 6 with every member back in the candidate pool; True once done"""
+        await self.close_tally_board()
+        self.current_level = 6
+        self.tally.reset()
+        self.registry.reset_candidates()
+        self.paused = False
+        self.record('restarted', level=self.current_level)
+        
+        await outbound.send(self.thread, "🔄 **FRACTAL RESTARTED** by admin. Starting fresh from Level 6!")
+        await self.start_new_round()
+        return True
 
     async def start_new_round(self, winner: Optional[discord.Member] = None):
         """Start a new voting round, optionally recording a previous winner"""
+        # Show the closing round's final votes before its state is reset
+        await self.close_tally_board()
+        
         # Process previous winner if exists
         if winner:
-            self.winners[self.current_level] = winner
-            self.active_candidates.remove(winner)  # Remove from active candidates
+            self.registry.declare_winner(winner.id, self.current_level)  # Also removes from active candidates
+            self.record('winner', user=winner.id, level=self.current_level)
             self.current_level -= 1  # Move to next level
             
             # Send prominent winner announcement like the second image
-            await self.thread.send(
+            await outbound.send(
+                self.thread,
                 f"🎊 **LEVEL {self.current_level + 1} WINNER: {winner.mention}!** 🎊\n\n"
-                f"Moving to Level {self.current_level}..."
+                f"Moving to Level {self.current_level}...",
+                priority=CRITICAL
             )
         
         # Check if we've reached the end
-        if self.current_level < 1 or len(self.active_candidates) <= 1:
+        if self.current_level < 1 or self.registry.candidate_count <= 1:
             await self.end_fractal()
             return
             
         # Reset votes for new round
-        self.votes = {}
+        self.tally.reset()
         
         # Log active candidates
         candidate_names = ", ".join([c.display_name for c in self.active_candidates])
@@ -223,101 +589,211 @@ class FractalGroup:
             # Create voting view with buttons
             view = ZAOFractalVotingView(self)
             
-            # Create beautiful voting message like the second image
-            votes_needed = self.get_vote_threshold()
-            candidates_list = ", ".join([c.mention for c in self.active_candidates])
-            
-            voting_message = (
-                f"🗳️ **Voting for Level {self.current_level}**\n\n"
-                f"**Candidates:** {candidates_list}\n"
-                f"**Votes Needed to Win:** {votes_needed} ({votes_needed}/{len(self.members)} members)\n\n"
-                f"Click a button below to vote. Your vote will be announced publicly.\n"
-                f"You can change your vote at any time by clicking a different button."
-            )
-            
-            message = await self.thread.send(voting_message, view=view)
+            message = await outbound.send(self.thread, self.format_voting_message(), view=view, priority=CRITICAL)
             self.current_voting_message = message
+            self.record('round', level=self.current_level, message_id=message.id)
             
         except Exception as e:
             self.logger.error(f"Error creating voting UI: {e}", exc_info=True)
-            await self.thread.send("❌ Error setting up voting buttons. Please try again.")
+            await outbound.send(self.thread, "❌ Error setting up voting buttons. Please try again.")
+
+    def format_voting_message(self) -> str:
+        """Voting message for the current round, with the live tally in tally board mode"""
+        # Create beautiful voting message like the second image
+        votes_needed = self.get_vote_threshold()
+        candidates_list = ", ".join([c.mention for c in self.active_candidates])
+        
+        voting_message = (
+            f"🗳️ **Voting for Level {self.current_level}**\n\n"
+            f"**Candidates:** {candidates_list}\n"
+            f"**Votes Needed to Win:** {votes_needed} ({votes_needed}/{len(self.members)} members)\n\n"
+        )
+        
+        if not self.tally_board:
+            return voting_message + (
+                f"Click a button below to vote. Your vote will be announced publicly.\n"
+                f"You can change your vote at any time by clicking a different button."
+            )
+        
+        voting_message += (
+            f"Click a button below to vote. Votes are shown publicly on this message.\n"
+            f"You can change your vote at any time by clicking a different button.\n\n"
+            f"**Votes ({len(self.tally)}/{len(self.members)}):**\n"
+        )
+        if self.tally.votes:
+            voting_message += "\n".join(f"✅ <@{voter_id}> → <@{candidate_id}>" for voter_id, candidate_id in self.tally.votes.items())
+        else:
+            voting_message += "No votes yet"
+        return voting_message
+    
+    def schedule_tally_board(self):
+        """Mark the board changed and edit it at most once per interval"""
+        self.board_dirty = True
+        if self.board_task and not self.board_task.done():
+            return  # The pending edit will include this change
+        
+        delay = max(0.0, self.board_last_edit + self.tally_board_interval - time.monotonic())
+        self.board_task = asyncio.create_task(self._update_tally_board(delay))
+    
+    async def _update_tally_board(self, delay: float):
+        """Wait out the debounce interval, then apply the latest tally"""
+        await asyncio.sleep(delay)
+        self.board_task = None  # From here on, new votes schedule a fresh edit
+        await self._edit_tally_board()
+    
+    async def _edit_tally_board(self):
+        """Edit the voting message to show the current votes, if they changed"""
+        if not self.board_dirty or not self.current_voting_message:
+            return
+        
+        self.board_dirty = False
+        self.board_last_edit = time.monotonic()
+        self.board_edits += 1
+        try:
+            await outbound.edit(self.current_voting_message, content=self.format_voting_message(), priority=LOW)
+        except discord.HTTPException as e:
+            self.logger.warning(f"Failed to update tally board in '{self.thread.name}': {e}")
+    
+    async def close_tally_board(self):
+        """Flush any pending edit for the closing round and record the calls saved"""
+        if not self.tally_board:
+            return
+        
+        if self.board_task and not self.board_task.done():
+            self.board_task.cancel()  # Still waiting out the interval, so nothing sent yet
+        self.board_task = None
+        await self._edit_tally_board()
+        
+        if self.board_votes:
+            saved = self.board_votes - self.board_edits
+            self.api_calls_saved += saved
+            self.logger.info(
+                f"Tally board for '{self.thread.name}' level {self.current_level}: "
+                f"{self.board_votes} votes, {self.board_edits} edits, {saved} API calls saved"
+            )
+        self.board_votes = 0
+        self.board_edits = 0
 
     def get_vote_threshold(self):
-        """Calculate votes needed to win (50% or more)"""
-        return max(1, len(self.members) // 2 + len(self.members) % 2)  # Ceiling division
+        """Calculate votes needed to win (50% or more of the members taking part)"""
+        member_count = self.participant_count()
+        return max(1, member_count // 2 + member_count % 2)  # Ceiling division
+    
+    def participant_count(self) -> int:
+        """Members counted towards the threshold
+        
+        In voice fractals, members who have left the voice channel without
+        voting this round don't count, unless nobody is left in the channel
+        (the call is over and voting carries on in the thread).
+        """
+        if self.voice_channel is None:
+            return len(self.registry)
+        present = sum(1 for user_id in self.registry.by_id if self.in_voice(user_id))
+        if not present:
+            return len(self.registry)
+        return present + sum(1 for user_id in self.tally.votes if not self.in_voice(user_id))
 
-    async def process_vote(self, voter: discord.Member, candidate: discord.Member):
-        """Process a vote and announce it publicly"""
-        previous_vote = self.votes.get(voter.id)
+    async def process_vote(self, voter: discord.Member, candidate: discord.Member, level: Optional[int] = None) -> bool:
+        """Process a vote and announce it publicly; returns False if the vote is stale"""
+        # Buttons from a finished round, or for someone who has already won, no longer count
+        if (level is not None and level != self.current_level) or not self.registry.is_candidate(candidate.id):
+            return False
+        
+        # Update vote
+        previous_vote = self.tally.cast(voter.id, candidate.id)
+        self.record('vote', voter=voter.id, candidate=candidate.id)
         previous_candidate = None
         
         if previous_vote:
-            previous_candidate = discord.utils.get(self.active_candidates + [m for m in self.members if m.id in [w.id for w in self.winners.values()]], id=previous_vote)
-        
-        # Update vote
-        self.votes[voter.id] = candidate.id
+            previous_candidate = self.registry.get(previous_vote)
         
         # Notify web app of vote
-        await web_integration.notify_vote_cast(self, voter, candidate)
-        
-        # Announce vote publicly with green checkmarks like the second image
-        if previous_candidate:
-            await self.thread.send(
-                f"🔄 **Vote Changed:** {voter.mention} changed vote from {previous_candidate.mention} to {candidate.mention}"
+        web_integration.notify_vote_cast(self, voter, candidate)
+        
+        # Show the vote publicly, either on the tally board or as its own message
+        if self.tally_board:
+            self.board_votes += 1
+            self.schedule_tally_board()
+        elif previous_candidate:
+            await outbound.send(
+                self.thread,
+                f"🔄 **Vote Changed:** {voter.mention} changed vote from {previous_candidate.mention} to {candidate.mention}",
+                priority=LOW
             )
         else:
-            await self.thread.send(
-                f"✅ **New Vote:** {voter.mention} voted for {candidate.mention}"
+            await outbound.send(
+                self.thread,
+                f"✅ **New Vote:** {voter.mention} voted for {candidate.mention}",
+                priority=LOW
             )
         
         # Check if this vote caused a winner
         await self.check_for_winner()
+        return True
 
     async def check_for_winner(self):
         """Check if any candidate has reached the vote threshold"""
-        vote_counts = {}
-        
-        # Count votes for each candidate
-        for candidate_id in self.votes.values():
-            vote_counts[candidate_id] = vote_counts.get(candidate_id, 0) + 1
-        
         threshold = self.get_vote_threshold()
         
         # Check for a winner
-        max_votes = max(vote_counts.values()) if vote_counts else 0
+        max_votes = self.tally.max_count
         
         if max_votes >= threshold:
             # Find all candidates with max votes (for tie-breaking)
-            winners_with_max_votes = [
-                candidate_id for candidate_id, count in vote_counts.items() 
-                if count == max_votes
-            ]
+            winners_with_max_votes = self.tally.leaders()
             
             # Handle ties with random selection
             if len(winners_with_max_votes) > 1:
-                await self.thread.send(
-                    f"🎲 **Tie detected!** {len(winners_with_max_votes)} candidates tied with {max_votes} votes. Selecting randomly..."
+                await outbound.send(
+                    self.thread,
+                    f"🎲 **Tie detected!** {len(winners_with_max_votes)} candidates tied with {max_votes} votes. Selecting randomly...",
+                    priority=CRITICAL
                 )
                 winner_id = random.choice(winners_with_max_votes)
             else:
                 winner_id = winners_with_max_votes[0]
             
-            winner = discord.utils.get(self.active_candidates, id=winner_id)
+            winner = self.registry.get_candidate(winner_id)
             if winner:
                 # Log winner info
                 self.logger.info(f"Winner for level {self.current_level}: {winner.display_name} with {max_votes}/{len(self.members)} votes")
                 
                 # Notify web app of round completion
-                await web_integration.notify_round_complete(self, winner)
+                web_integration.notify_round_complete(self, winner)
                 
                 await self.start_new_round(winner)
                 return
 
+    def export_record(self, ended: bool = False) -> Dict[str, Any]:
+        """Plain-data snapshot of the group for exports and the completed-fractal history"""
+        return {
+            "thread_id": self.thread.id,
+            "thread_name": self.thread.name,
+            "guild_id": self.thread.guild.id,
+            "status": "completed" if ended else "active",
+            "started_at": self.started_at,
+            "ended_at": datetime.now(timezone.utc).isoformat(timespec='seconds') if ended else None,
+            "facilitator": {"id": self.facilitator.id, "name": self.facilitator.display_name},
+            "current_level": self.current_level,
+            "paused": self.paused,
+            "members": [{"id": m.id, "name": m.display_name} for m in self.members],
+            "active_candidates": [{"id": m.id, "name": m.display_name} for m in self.active_candidates],
+            "votes": {str(voter_id): candidate_id for voter_id, candidate_id in self.votes.items()},
+            "winners": {str(level): {"id": winner.id, "name": winner.display_name} for level, winner in self.winners.items()}
+        }
+    
     async def end_fractal(self):
         """End the fractal process and show final results"""
+        if self.ended:
+            return
+        self.ended = True
+        if self.voice_timer:
+            self.voice_timer.stop_timer()  # Ended by an admin mid speaking phase
+        self.stop_countdown()
+        
         # Add final remaining candidate as last place
-        if len(self.active_candidates) == 1:
-            self.winners[self.current_level] = self.active_candidates[0]
+        if self.registry.candidate_count == 1:
+            self.registry.declare_winner(next(iter(self.registry.candidate_ids)), self.current_level)
         
         # Create final ranking
         final_ranking = []
@@ -330,40 +806,29 @@ class FractalGroup:
             medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
             results_text += f"{medal} {winner.mention}\n"
         
-        await self.thread.send(results_text)
+        await outbound.send(self.thread, results_text, priority=CRITICAL)
         
         # Notify web app that fractal is complete
-        await web_integration.notify_fractal_complete(self)
+        web_integration.notify_fractal_complete(self)
         
         # Post simple results to general channel
         try:
-            # Find a general channel to post results
-            general_channel = None
-            for channel in self.thread.guild.channels:
-                if isinstance(channel, discord.TextChannel) and (
-                    'general' in channel.name.lower() or 
-                    'main' in channel.name.lower() or
-                    channel.name.lower() in ['chat', 'lobby']
-                ):
-                    general_channel = channel
-                    break
-            
-            if not general_channel:
-                # Fallback to first available text channel
-                general_channel = next(
-                    (ch for ch in self.thread.guild.channels if isinstance(ch, discord.TextChannel)),
-                    None
-                )
+            # General channel (or first usable text channel), cached per guild
+            general_channel = self.cog.channel_resolver.get_results_channel(self.thread.guild)
             
             if general_channel:
                 simple_results = f"🏆 **{self.thread.name} Results:** "
                 simple_results += ", ".join([f"{i+1}. {winner.display_name}" for i, winner in enumerate(final_ranking)])
-                await general_channel.send(simple_results)
+                await outbound.send(general_channel, simple_results)
         
         except Exception as e:
             self.logger.error(f"Failed to post results to general channel: {e}")
         
-        # Remove from active groups
+        # Keep a permanent record for exports, then remove from active groups
+        history = getattr(self.cog, 'history', None)
+        if history:
+            history.append(self.export_record(ended=True))
+        self.record('ended')
         if hasattr(self.cog, 'active_groups') and self.thread.id in self.cog.active_groups:
             del self.cog.active_groups[self.thread.id]
         
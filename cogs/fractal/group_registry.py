@@ -0,0 +1,111 @@
+from collections.abc import MutableMapping
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Set
+
+if TYPE_CHECKING:
+    from .group import FractalGroup
+
+
+class GroupRegistry(MutableMapping):
+    """Active fractal groups by thread ID, indexed by guild, facilitator and member
+    
+    Behaves like the plain thread_id -> FractalGroup dict it replaces, but
+    keeps secondary indexes up to date as groups start and end and as
+    members or facilitators change, so per-guild listings and "which
+    fractal is this member in" are answered without scanning every group.
+    A member belongs to at most one active fractal at a time; members of a
+    fractal that is still being launched are reserved until it registers.
+    """
+    
+    def __init__(self):
+        self.groups: Dict[int, 'FractalGroup'] = {}
+        self.guild_index: Dict[int, Dict[int, None]] = {}  # guild_id -> ordered set of thread_ids
+        self.facilitator_index: Dict[int, Set[int]] = {}  # user_id -> thread_ids they facilitate
+        self.member_index: Dict[int, int] = {}  # user_id -> thread_id of their fractal
+        self.reserved: Set[int] = set()  # user_ids of fractals whose thread is still being created
+    
+    def __getitem__(self, thread_id: int):
+        return self.groups[thread_id]
+    
+    def __setitem__(self, thread_id: int, group):
+        if thread_id in self.groups:
+            del self[thread_id]
+        self.groups[thread_id] = group
+        self.guild_index.setdefault(group.thread.guild.id, {})[thread_id] = None
+        self.facilitator_index.setdefault(group.facilitator.id, set()).add(thread_id)
+        for user_id in group.registry.by_id:
+            self.member_index.setdefault(user_id, thread_id)  # Restored overlaps keep their first fractal
+    
+    def __delitem__(self, thread_id: int):
+        group = self.groups.pop(thread_id)
+        guild_id = group.thread.guild.id
+        threads = self.guild_index.get(guild_id, {})
+        threads.pop(thread_id, None)
+        if not threads:
+            self.guild_index.pop(guild_id, None)
+        self._discard_facilitator(group.facilitator.id, thread_id)
+        for user_id in group.registry.by_id:
+            self._discard_member(user_id, thread_id)
+    
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.groups)
+    
+    def __len__(self) -> int:
+        return len(self.groups)
+    
+    def in_guild(self, guild_id: int) -> List['FractalGroup']:
+        """Active groups in one guild, oldest first"""
+        return [self.groups[thread_id] for thread_id in self.guild_index.get(guild_id, ())]
+    
+    def facilitated_by(self, user_id: int) -> List['FractalGroup']:
+        """Active groups a user facilitates"""
+        return [self.groups[thread_id] for thread_id in self.facilitator_index.get(user_id, ())]
+    
+    def group_for_member(self, user_id: int) -> Optional['FractalGroup']:
+        """The active fractal a user is taking part in, if any"""
+        thread_id = self.member_index.get(user_id)
+        return self.groups.get(thread_id) if thread_id is not None else None
+    
+    def busy_members(self, members) -> list:
+        """Those of `members` already taking part in an active fractal"""
+        return [member for member in members if member.id in self.member_index or member.id in self.reserved]
+    
+    def reserve(self, members) -> list:
+        """Hold members for a fractal about to launch; returns the busy ones instead if any are taken
+        
+        Runs without awaiting, so checking and claiming can't be split by
+        another launch the way busy_members() then create_thread() could.
+        """
+        busy = self.busy_members(members)
+        if not busy:
+            self.reserved.update(member.id for member in members)
+        return busy
+    
+    def release(self, members):
+        """Drop a reservation once the group is registered or its launch failed"""
+        self.reserved.difference_update(member.id for member in members)
+    
+    def member_added(self, group, user_id: int) -> bool:
+        """Index a member who joined a registered group; False if they are in another fractal"""
+        if group.thread.id not in self.groups:
+            return True
+        return self.member_index.setdefault(user_id, group.thread.id) == group.thread.id
+    
+    def member_removed(self, group, user_id: int):
+        self._discard_member(user_id, group.thread.id)
+    
+    def facilitator_changed(self, group, old_id: int):
+        if group.thread.id not in self.groups:
+            return
+        self._discard_facilitator(old_id, group.thread.id)
+        self.facilitator_index.setdefault(group.facilitator.id, set()).add(group.thread.id)
+    
+    def _discard_member(self, user_id: int, thread_id: int):
+        if self.member_index.get(user_id) == thread_id:
+            del self.member_index[user_id]
+    
+    def _discard_facilitator(self, user_id: int, thread_id: int):
+        threads = self.facilitator_index.get(user_id)
+        if threads is not None:
+            threads.discard(thread_id)
+            if not threads:
+                del self.facilitator_index[user_id]
@@ -0,0 +1,59 @@
+import logging
+import os
+from typing import Any, Dict, Iterator, Optional
+from utils.serialization import get_serializer
+
+
+class FractalHistory:
+    """Append-only NDJSON log of completed fractals
+    
+    One line per fractal, written when it ends. Reads stream the file a
+    line at a time, so exports never hold the whole history in memory.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.serializer = get_serializer('json')
+        self.logger = logging.getLogger('bot')
+    
+    def append(self, record: Dict[str, Any]):
+        """Record a completed fractal"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        try:
+            with open(self.path, 'ab') as f:
+                f.write(self.serializer.dumps(record) + b'\n')
+        except OSError as e:
+            self.logger.error(f"Failed to write fractal history: {e}")
+    
+    def iter_records(
+        self,
+        guild_id: Optional[int] = None,
+        thread_id: Optional[int] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Completed fractals matching the filters, oldest first
+        
+        `since` and `until` are ISO dates or timestamps compared against
+        when each fractal ended; `until` is exclusive.
+        """
+        if not os.path.exists(self.path):
+            return
+        
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    record = self.serializer.loads(line)
+                except ValueError:
+                    continue  # Torn write from a crash
+                if guild_id is not None and record['guild_id'] != guild_id:
+                    continue
+                if thread_id is not None and record['thread_id'] != thread_id:
+                    continue
+                if since is not None and record['ended_at'] < since:
+                    continue
+                if until is not None and record['ended_at'] >= until:
+                    continue
+                yield record
@@ -0,0 +1,164 @@
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+from utils.serialization import get_serializer
+
+
+def apply_event(states: Dict[int, Dict[str, Any]], thread_id: int, event_type: str, data: Dict[str, Any]):
+    """Apply one journal event to the plain-data state of every active group
+    
+    Used both when recording live events and when replaying the journal on
+    startup, so a rebuilt group always matches the one that was running.
+    User IDs are ints; dict keys are strings so states round-trip through JSON.
+    """
+    if event_type == 'created':
+        states[thread_id] = {
+            'guild_id': data['guild_id'],
+            'facilitator': data['facilitator'],
+            'members': list(data['members']),
+            'winners': {},  # str(level) -> user_id
+            'level': data['level'],
+            'votes': {},  # str(voter_id) -> candidate_id
+            'paused': False,
+            'voice_channel': data.get('voice_channel'),
+            'speaking_time': data.get('speaking_time'),
+            'started_at': data.get('started_at'),
+            'voice_phase': data.get('voice_channel') is not None,
+            'speaking': None,  # SpeakingQueue.to_state()
+            'voting_message': None
+        }
+        return
+    
+    state = states.get(thread_id)
+    if state is None:
+        return  # Group ended before a compaction dropped its earlier events
+    
+    if event_type == 'vote':
+        state['votes'][str(data['voter'])] = data['candidate']
+    elif event_type == 'votes_reset':
+        state['votes'] = {}
+    elif event_type == 'winner':
+        state['winners'][str(data['level'])] = data['user']
+        state['level'] = data['level'] - 1
+        state['votes'] = {}
+    elif event_type == 'round':
+        state['level'] = data['level']
+        state['votes'] = {}
+        state['voice_phase'] = False
+        state['voting_message'] = data['message_id']
+    elif event_type == 'member_added':
+        if data['user'] not in state['members']:
+            state['members'].append(data['user'])
+    elif event_type == 'member_removed':
+        if data['user'] in state['members']:
+            state['members'].remove(data['user'])
+        state['votes'].pop(str(data['user']), None)
+    elif event_type == 'facilitator':
+        state['facilitator'] = data['user']
+    elif event_type == 'paused':
+        state['paused'] = data['paused']
+    elif event_type == 'restarted':
+        state['level'] = data['level']
+        state['winners'] = {}
+        state['votes'] = {}
+        state['paused'] = False
+    elif event_type == 'speaking':
+        state['speaking'] = data
+    elif event_type == 'ended':
+        del states[thread_id]
+
+
+class FractalJournal:
+    """Append-only log of fractal state changes with periodic snapshots
+    
+    Every transition is appended as one line to the journal and applied to
+    an in-memory copy of each group's state. Every `snapshot_every` events
+    that state is written out as a snapshot and the journal is truncated,
+    so startup only has to load one snapshot and replay a short tail.
+    """
+    
+    def __init__(self, path: str, snapshot_path: str, snapshot_every: int = 500):
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.snapshot_every = snapshot_every
+        self.serializer = get_serializer('json')
+        self.states: Dict[int, Dict[str, Any]] = {}
+        self.seq = 0
+        self.since_snapshot = 0
+        self.file = None
+        self.logger = logging.getLogger('bot')
+    
+    def open(self) -> Dict[int, Dict[str, Any]]:
+        """Rebuild state from snapshot plus journal tail, compact, and start appending"""
+        started = time.perf_counter()
+        for directory in {os.path.dirname(self.path), os.path.dirname(self.snapshot_path)}:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        
+        snapshot_seq = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'rb') as f:
+                snapshot = self.serializer.loads(f.read())
+            snapshot_seq = snapshot['seq']
+            self.states = {int(thread_id): state for thread_id, state in snapshot['groups'].items()}
+        self.seq = snapshot_seq
+        
+        replayed = 0
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as f:
+                for line in f:
+                    try:
+                        event = self.serializer.loads(line)
+                    except ValueError:
+                        self.logger.warning("Skipping torn line at end of fractal journal")
+                        break
+                    if event['seq'] <= snapshot_seq:
+                        continue  # Already in the snapshot (crash between snapshot and truncate)
+                    apply_event(self.states, event['thread'], event['type'], event['data'])
+                    self.seq = event['seq']
+                    replayed += 1
+        
+        self.snapshot()
+        self.logger.info(
+            f"Loaded {len(self.states)} fractal groups from journal "
+            f"({replayed} events replayed) in {time.perf_counter() - started:.3f}s"
+        )
+        return self.states
+    
+    def append(self, thread_id: int, event_type: str, data: Optional[Dict[str, Any]] = None):
+        """Record one state change"""
+        data = data or {}
+        apply_event(self.states, thread_id, event_type, data)
+        if self.file is None:
+            return
+        
+        self.seq += 1
+        self.file.write(self.serializer.dumps({'seq': self.seq, 'thread': thread_id, 'type': event_type, 'data': data}) + b'\n')
+        self.file.flush()
+        
+        self.since_snapshot += 1
+        if self.since_snapshot >= self.snapshot_every:
+            self.snapshot()
+    
+    def snapshot(self):
+        """Write all group states atomically, then truncate the journal"""
+        temp_path = f"{self.snapshot_path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(self.serializer.dumps({'seq': self.seq, 'groups': {str(k): v for k, v in self.states.items()}}))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.snapshot_path)
+        
+        if self.file is not None:
+            self.file.close()
+        self.file = open(self.path, 'wb')
+        self.since_snapshot = 0
+    
+    def close(self):
+        """Snapshot and stop appending"""
+        if self.file is None:
+            return
+        self.snapshot()
+        self.file.close()
+        self.file = None
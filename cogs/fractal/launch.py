@@ -0,0 +1,172 @@
+import asyncio
+import discord
+import logging
+import time
+from typing import Any, Dict, List, Optional
+from utils.outbound import outbound
+from .group import FractalGroup
+
+STAGES = ('thread', 'start', 'members', 'ready', 'total')
+
+
+class SetupStats:
+    """Per-stage timings of fractal start-ups, for /admin_server_stats
+    
+    `thread` is creating the thread, `start` is from then until the first
+    usable button (voting buttons, or the voice control panel) is posted,
+    `members` is adding everyone to the thread, which overlaps `start`,
+    `ready` is from the click to the first usable button and `total` is
+    from the click until everything is done.
+    """
+    
+    def __init__(self):
+        self.count = 0
+        self.totals = dict.fromkeys(STAGES, 0.0)
+        self.max = dict.fromkeys(STAGES, 0.0)
+    
+    def record(self, timings: Dict[str, float]):
+        self.count += 1
+        for stage, seconds in timings.items():
+            self.totals[stage] += seconds
+            self.max[stage] = max(self.max[stage], seconds)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        count = max(self.count, 1)
+        return {
+            'count': self.count,
+            'avg': {stage: total / count for stage, total in self.totals.items()},
+            'max': dict(self.max)
+        }
+
+
+def pick_parent_channel(cog, interaction: discord.Interaction):
+    """Text channel the fractal's thread is created in"""
+    # Use the fractal-bot channel if it exists and allows threads (cached per guild), else the current channel
+    channel = cog.channel_resolver.get_fractal_channel(interaction.guild) or interaction.channel
+    if isinstance(channel, discord.Thread):
+        channel = channel.parent
+    if isinstance(channel, (discord.VoiceChannel, discord.StageChannel)):
+        # Voice and stage chats can't hold threads, so find a text channel that can
+        guild = interaction.guild
+        candidates = [guild.system_channel] + guild.text_channels
+        channel = next(
+            (candidate for candidate in candidates if candidate and candidate.permissions_for(guild.me).create_public_threads),
+            None
+        )
+        if channel is None:
+            raise ValueError("No text channel here lets the bot create threads")
+    return channel
+
+
+def partition_members(members: List[discord.Member], min_size: int, max_size: int) -> List[List[discord.Member]]:
+    """Split members into the fewest groups of at most `max_size`, as evenly as possible"""
+    if len(members) < min_size:
+        raise ValueError(f"At least {min_size} members are needed, found {len(members)}")
+    count = -(-len(members) // max_size)  # Ceiling division
+    size, extra = divmod(len(members), count)
+    if size < min_size:
+        raise ValueError(f"{len(members)} members can't be split into groups of {min_size}-{max_size}")
+    
+    groups = []
+    start = 0
+    for index in range(count):
+        end = start + size + (1 if index < extra else 0)
+        groups.append(members[start:end])
+        start = end
+    return groups
+
+
+async def add_members(thread: discord.Thread, members: List[discord.Member]):
+    """Add everyone to the thread at once; the outbound queue paces the requests"""
+    results = await asyncio.gather(*(outbound.add_user(thread, member) for member in members), return_exceptions=True)
+    for result in results:
+        # HTTP errors just mean a member was already in the thread or can't see it
+        if isinstance(result, Exception) and not isinstance(result, discord.HTTPException):
+            raise result
+
+
+async def launch_fractal(
+    cog,
+    interaction: discord.Interaction,
+    members: List[discord.Member],
+    facilitator: discord.Member,
+    voice_channel: Optional[discord.VoiceChannel] = None,
+    speaking_time: int = 120,
+    announce: bool = True
+) -> FractalGroup:
+    """Create the thread and start a fractal in it
+    
+    Once the thread exists, adding members, confirming to the facilitator
+    and posting the welcome and first voting (or voice control) messages
+    all run side by side. Members are added on their own outbound lane,
+    so they never hold up the thread's messages; mentioning members in the
+    welcome message also adds them to the thread. With `announce` off the
+    facilitator's original response is left for the caller to update.
+    
+    The caller reserves `members` in cog.active_groups beforehand; the
+    reservation is released once the group is registered, or if the
+    thread can't be created.
+    """
+    logger = logging.getLogger('bot')
+    clicked = time.perf_counter()
+    timings = {}
+    
+    try:
+        group_name = cog._get_next_group_name(interaction.guild.id)
+        channel = pick_parent_channel(cog, interaction)
+        thread = await channel.create_thread(
+            name=group_name,
+            type=discord.ChannelType.public_thread,
+            reason="ZAO Fractal Group"
+        )
+        thread_ready = time.perf_counter()
+        timings['thread'] = thread_ready - clicked
+        
+        fractal_group = FractalGroup(
+            thread=thread,
+            members=members,
+            facilitator=facilitator,
+            cog=cog,
+            voice_channel=voice_channel,
+            speaking_time=speaking_time
+        )
+        cog.active_groups[thread.id] = fractal_group
+    finally:
+        # Registered members are now held by the member index instead
+        cog.active_groups.release(members)
+    
+    async def membership():
+        await add_members(thread, members)
+        timings['members'] = time.perf_counter() - thread_ready
+    
+    async def confirm():
+        if not announce:
+            return
+        label = "Voice Fractal" if voice_channel else "Fractal"
+        try:
+            await interaction.edit_original_response(content=f"✅ **{label} started!** Check {thread.mention}", view=None)
+        except discord.HTTPException:
+            pass  # Interaction might have timed out, but continue anyway
+    
+    async def start():
+        try:
+            await fractal_group.submit(fractal_group.start_fractal)
+        except Exception as e:
+            # If fractal start fails, send error to thread
+            await outbound.send(thread, f"❌ Error starting fractal: {str(e)}")
+            raise
+        timings['start'] = time.perf_counter() - thread_ready
+    
+    results = await asyncio.gather(membership(), confirm(), start(), return_exceptions=True)
+    timings['total'] = time.perf_counter() - clicked
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+    
+    timings['ready'] = timings['thread'] + timings['start']
+    cog.setup_stats.record(timings)
+    logger.info(
+        f"Started '{thread.name}' in {timings['total']:.2f}s: first button after {timings['ready']:.2f}s "
+        f"(thread {timings['thread']:.2f}s, start {timings['start']:.2f}s, members {timings['members']:.2f}s in parallel)"
+    )
+    return fractal_group
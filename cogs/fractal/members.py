@@ -0,0 +1,88 @@
+import discord
+from typing import Dict, Iterable, List, Optional
+
+
+class MemberRegistry:
+    """Fractal group members keyed by user ID
+    
+    Membership, candidate and winner checks are dictionary lookups, while
+    members and candidates still iterate in the order they joined so
+    messages and buttons render the same way every time. `by_id` is the
+    only place Member objects are held; everything else stores user IDs.
+    """
+    
+    __slots__ = ('by_id', 'candidate_ids', 'winner_ids', 'winner_levels')
+    
+    def __init__(self, members: Iterable[discord.Member] = ()):
+        self.by_id: Dict[int, discord.Member] = {}
+        self.candidate_ids: Dict[int, None] = {}  # Ordered set of active candidates
+        self.winner_ids: Dict[int, int] = {}  # level -> user_id
+        self.winner_levels: Dict[int, int] = {}  # user_id -> level won
+        for member in members:
+            self.add(member)
+    
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self.by_id
+    
+    def __len__(self) -> int:
+        return len(self.by_id)
+    
+    def get(self, user_id: int) -> Optional[discord.Member]:
+        """Member with this ID, if they belong to the group"""
+        return self.by_id.get(user_id)
+    
+    def add(self, member: discord.Member) -> bool:
+        """Add a member as an active candidate; returns False if already present"""
+        if member.id in self.by_id:
+            return False
+        self.by_id[member.id] = member
+        self.candidate_ids[member.id] = None
+        return True
+    
+    def remove(self, user_id: int) -> Optional[discord.Member]:
+        """Remove a member from the group and the candidate pool"""
+        self.candidate_ids.pop(user_id, None)
+        return self.by_id.pop(user_id, None)
+    
+    def get_candidate(self, user_id: int) -> Optional[discord.Member]:
+        """Member with this ID, if they are still an active candidate"""
+        return self.by_id.get(user_id) if user_id in self.candidate_ids else None
+    
+    def is_candidate(self, user_id: int) -> bool:
+        return user_id in self.candidate_ids
+    
+    def is_winner(self, user_id: int) -> bool:
+        return user_id in self.winner_levels
+    
+    def declare_winner(self, user_id: int, level: int):
+        """Record a level winner and take them out of the candidate pool"""
+        if user_id not in self.by_id:
+            raise KeyError(user_id)
+        self.winner_ids[level] = user_id
+        self.winner_levels[user_id] = level
+        self.candidate_ids.pop(user_id, None)
+    
+    def reset_candidates(self):
+        """Clear winners and make every member a candidate again"""
+        self.winner_ids.clear()
+        self.winner_levels.clear()
+        self.candidate_ids = dict.fromkeys(self.by_id)
+    
+    @property
+    def members(self) -> List[discord.Member]:
+        """All members in join order"""
+        return list(self.by_id.values())
+    
+    @property
+    def candidates(self) -> List[discord.Member]:
+        """Active candidates in join order"""
+        return [self.by_id[user_id] for user_id in self.candidate_ids]
+    
+    @property
+    def winners(self) -> Dict[int, discord.Member]:
+        """Level -> winner, for winners still in the group"""
+        return {level: self.by_id[user_id] for level, user_id in self.winner_ids.items() if user_id in self.by_id}
+    
+    @property
+    def candidate_count(self) -> int:
+        return len(self.candidate_ids)
@@ -1,165 +1,273 @@
 import discord
-import asyncio
 import logging
-from typing import List, Optional
+import math
+import os
+from collections import OrderedDict
+from enum import Enum
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, Optional
+from utils.outbound import outbound, LOW
+from utils.timers import TimerService, Timer, DONE, PAUSED
+
+class SpeakerState(Enum):
+    """Where a participant is in the speaking order"""
+    QUEUED = 'queued'
+    SPEAKING = 'speaking'
+    SKIPPED = 'skipped'
+    DONE = 'done'
+
 
 class SpeakingQueue:
-    """Manages the speaking order and queue for voice fractals"""
+    """Manages the speaking order and queue for voice fractals
     
-    def __init__(self, participants: List[discord.Member]):
-        self.active_queue = participants.copy()
-        self.completed_speakers = []
-        self.skipped_speakers = []
-        self.current_speaker = None
-        self.logger = logging.getLogger('bot')
+    Queue positions are stored as user IDs; Member objects are looked up
+    through `get_member` only when a speaker is returned or displayed.
+    The queued and skipped speakers are insertion-ordered sets, so
+    advancing, skipping and moving a speaker are all O(1), and `states`
+    says where each participant is. Every change bumps `version`, and the queue
+    display is only re-rendered when the version has moved on. Speakers
+    `is_present` reports as out of the voice channel are skipped when their
+    turn comes and speak after the queue if they are back by then.
+    """
+    
+    __slots__ = (
+        'get_member', 'is_present', 'states', 'active_queue', 'skipped_speakers', 'completed_speakers', 'current_id',
+        'version', 'rendered', 'rendered_version'
+    )
+    
+    def __init__(self, participants: List[discord.Member], get_member: Callable[[int], Optional[discord.Member]],
+                 is_present: Optional[Callable[[int], bool]] = None):
+        self.get_member = get_member
+        self.is_present = is_present or (lambda user_id: True)
+        self.states: Dict[int, SpeakerState] = {m.id: SpeakerState.QUEUED for m in participants}
+        self.active_queue: OrderedDict = OrderedDict.fromkeys(self.states)  # Ordered set of user IDs
+        self.skipped_speakers: Dict[int, None] = {}  # Ordered set; only ever appended to and cleared
+        self.completed_speakers: List[int] = []
+        self.current_id: Optional[int] = None
+        self.version = 0
+        self.rendered: Optional[str] = None
+        self.rendered_version = -1
+    
+    @property
+    def current_speaker(self) -> Optional[discord.Member]:
+        return self.get_member(self.current_id) if self.current_id else None
+    
+    def _resolve(self, user_ids: Iterable[int]) -> List[discord.Member]:
+        return [m for m in map(self.get_member, user_ids) if m]
     
     def next_speaker(self) -> Optional[discord.Member]:
         """Move to next person, current speaker goes to completed"""
-        if self.current_speaker:
-            self.completed_speakers.append(self.current_speaker)
-            self.logger.info(f"Moved {self.current_speaker.display_name} to completed speakers")
-        
-        if self.active_queue:
-            self.current_speaker = self.active_queue.pop(0)
-            self.logger.info(f"Next speaker: {self.current_speaker.display_name}")
-            return self.current_speaker
-        elif self.skipped_speakers:
-            # Cycle skipped speakers back to active queue
-            self.cycle_skipped_speakers()
-            return self.next_speaker()
-        else:
-            self.current_speaker = None
-            return None
-    
-    def skip_and_return(self) -> Optional[discord.Member]:
-        """Skip current speaker, add to end of queue"""
-        if self.current_speaker:
-            self.skipped_speakers.append(self.current_speaker)
-            self.logger.info(f"Skipped {self.current_speaker.display_name} - will return later")
-            self.current_speaker = None
+        self.version += 1
+        if self.current_id:
+            self.completed_speakers.append(self.current_id)
+            self.states[self.current_id] = SpeakerState.DONE
+            self.current_id = None
         
-        return self.next_speaker()
+        while self.active_queue or self.skipped_speakers:
+            if not self.active_queue:
+                if not any(map(self.is_present, self.skipped_speakers)):
+                    break  # Everyone still to speak is out of the voice channel
+                self.cycle_skipped_speakers()
+            
+            user_id, _ = self.active_queue.popitem(last=False)
+            speaker = self.get_member(user_id)
+            if not speaker:  # Members removed from the group since queuing are dropped
+                del self.states[user_id]
+            elif not self.is_present(user_id):
+                self.skipped_speakers[user_id] = None
+                self.states[user_id] = SpeakerState.SKIPPED
+            else:
+                self.current_id = user_id
+                self.states[user_id] = SpeakerState.SPEAKING
+                return speaker
+        return None
+    
+    def skip_current(self):
+        """Send the current speaker to the back of the order; they speak again after the queue"""
+        if self.current_id:
+            self.version += 1
+            self.skipped_speakers[self.current_id] = None
+            self.states[self.current_id] = SpeakerState.SKIPPED
+            self.current_id = None
     
     def cycle_skipped_speakers(self):
         """Move skipped speakers back to active queue"""
         if self.skipped_speakers:
-            self.active_queue.extend(self.skipped_speakers)
+            self.version += 1
+            for user_id in self.skipped_speakers:
+                self.active_queue[user_id] = None
+                self.states[user_id] = SpeakerState.QUEUED
             self.skipped_speakers.clear()
-            self.logger.info("Cycled skipped speakers back to active queue")
+    
+    def move_speaker(self, user_id: int, to_front: bool = True) -> bool:
+        """Move a queued or skipped speaker to the front or back of the queue"""
+        state = self.states.get(user_id)
+        if state is SpeakerState.SKIPPED:
+            del self.skipped_speakers[user_id]
+            self.active_queue[user_id] = None
+            self.states[user_id] = SpeakerState.QUEUED
+        elif state is not SpeakerState.QUEUED:
+            return False
+        
+        self.active_queue.move_to_end(user_id, last=not to_front)
+        self.version += 1
+        return True
+    
+    def discard(self, user_id: int):
+        """Drop a member who left the group from the queued and skipped speakers"""
+        state = self.states.get(user_id)
+        if state is SpeakerState.QUEUED:
+            del self.active_queue[user_id]
+        elif state is SpeakerState.SKIPPED:
+            del self.skipped_speakers[user_id]
+        else:
+            return  # Speaking (their turn runs out as normal) or already done
+        del self.states[user_id]
+        self.version += 1
     
     def get_remaining_speakers(self) -> List[discord.Member]:
         """Get all speakers who haven't completed speaking"""
-        remaining = []
-        if self.current_speaker:
-            remaining.append(self.current_speaker)
+        remaining = [self.current_id] if self.current_id else []
         remaining.extend(self.active_queue)
         remaining.extend(self.skipped_speakers)
-        return remaining
+        return self._resolve(remaining)
     
     def is_complete(self) -> bool:
         """Check if all speakers have completed"""
-        return (not self.current_speaker and 
+        return (not self.current_id and 
                 not self.active_queue and 
                 not self.skipped_speakers)
     
+    def to_state(self) -> dict:
+        """Queue positions as user IDs, for the fractal journal"""
+        return {
+            'current': self.current_id,
+            'queue': list(self.active_queue),
+            'skipped': list(self.skipped_speakers),
+            'completed': list(self.completed_speakers)
+        }
+    
+    def restore_state(self, state: dict):
+        """Restore queue positions saved by to_state(), dropping members no longer found"""
+        def known(user_ids):
+            return [user_id for user_id in user_ids if self.get_member(user_id)]
+        
+        self.current_id = state['current'] if state['current'] and self.get_member(state['current']) else None
+        self.active_queue = OrderedDict.fromkeys(known(state['queue']))
+        self.skipped_speakers = dict.fromkeys(known(state['skipped']))
+        self.completed_speakers = known(state['completed'])
+    
+        self.states = {user_id: SpeakerState.DONE for user_id in self.completed_speakers}
+        self.states.update(dict.fromkeys(self.active_queue, SpeakerState.QUEUED))
+        self.states.update(dict.fromkeys(self.skipped_speakers, SpeakerState.SKIPPED))
+        if self.current_id:
+            self.states[self.current_id] = SpeakerState.SPEAKING
+        self.version += 1
+    
     def format_queue_display(self) -> str:
-        """Generate formatted display of current queue status"""
+        """Formatted queue status, re-rendered only after the queue changes"""
+        if self.rendered_version != self.version:
+            self.rendered = self._render_queue_display()
+            self.rendered_version = self.version
+        return self.rendered
+    
+    def _render_queue_display(self) -> str:
         lines = []
         
-        if self.current_speaker:
-            lines.append(f"**Current:** {self.current_speaker.display_name}")
+        current = self.current_speaker
+        if current:
+            lines.append(f"**Current:** {current.display_name}")
         
         if self.active_queue:
-            queue_names = " → ".join([user.display_name for user in self.active_queue[:3]])
+            queue_names = " → ".join([user.display_name for user in self._resolve(islice(self.active_queue, 3))])
             if len(self.active_queue) > 3:
                 queue_names += f" → +{len(self.active_queue) - 3} more"
             lines.append(f"**Queue:** {queue_names}")
         
         if self.skipped_speakers:
-            skipped_names = ", ".join([user.display_name for user in self.skipped_speakers])
+            skipped_names = ", ".join([user.display_name for user in self._resolve(self.skipped_speakers)])
             lines.append(f"**Skipped (will return):** {skipped_names}")
         
         if self.completed_speakers:
-            completed_names = ", ".join([user.display_name for user in self.completed_speakers])
+            completed_names = ", ".join([user.display_name for user in self._resolve(self.completed_speakers)])
             lines.append(f"**Completed:** {completed_names}")
         
         return "\n".join(lines) if lines else "No speakers in queue"
 
 
 class VoiceTimer:
-    """Manages speaking timers with warnings and notifications"""
+    """One group's speaking timer, a handle on the cog's shared TimerService"""
     
-    def __init__(self, speaking_time: int = 120):
+    __slots__ = ('speaking_time', 'service', 'timer', 'warnings', 'logger')
+    
+    def __init__(self, speaking_time: int, service: TimerService):
         self.speaking_time = speaking_time  # seconds
-        self.current_task = None
-        self.time_remaining = 0
-        self.is_running = False
+        self.service = service
+        self.timer: Optional[Timer] = None
+        # Seconds-remaining points at which the speaker is warned
+        self.warnings = tuple(int(w) for w in os.getenv('SPEAKING_WARNINGS', '60').split(',') if w.strip())
         self.logger = logging.getLogger('bot')
     
+    @property
+    def is_running(self) -> bool:
+        return self.timer is not None and self.timer.state != DONE
+    
+    @property
+    def is_paused(self) -> bool:
+        return self.timer is not None and self.timer.state == PAUSED
+    
+    @property
+    def time_remaining(self) -> int:
+        """Whole seconds left for the current speaker"""
+        return math.ceil(self.service.remaining(self.timer)) if self.timer else 0
+    
     async def start_timer(self, speaker: discord.Member, callback_channel, warning_callback=None, complete_callback=None):
         """Start timer for a speaker with optional callbacks"""
-        if self.current_task:
-            self.current_task.cancel()
+        self.stop_timer()
         
-        self.is_running = True
-        self.time_remaining = self.speaking_time
-        
-        # Start the timer task but don't await it (non-blocking)
-        self.current_task = asyncio.create_task(
-            self._run_timer(speaker, callback_channel, warning_callback, complete_callback)
-        )
+        async def on_warning(seconds_left):
+            if warning_callback:
+                await warning_callback(speaker, int(seconds_left))
+            else:
+                await outbound.send(callback_channel, f"⏰ {speaker.mention} - {int(seconds_left)} seconds remaining!", priority=LOW)
         
-        self.logger.info(f"Started timer for {speaker.display_name} ({self.speaking_time} seconds)")
-    
-    async def _run_timer(self, speaker, callback_channel, warning_callback, complete_callback):
-        """Internal timer logic"""
-        try:
-            # Wait until 1 minute remaining
-            if self.speaking_time > 60:
-                await asyncio.sleep(self.speaking_time - 60)
-                self.time_remaining = 60
-                
-                # Send 1-minute warning
-                if warning_callback:
-                    await warning_callback(speaker, 60)
-                else:
-                    await callback_channel.send(f"⏰ {speaker.mention} - 1 minute remaining!")
-            
-            # Wait for final minute
-            await asyncio.sleep(min(60, self.speaking_time))
-            self.time_remaining = 0
-            
-            # Time's up notification
+        async def on_complete():
             if complete_callback:
                 await complete_callback(speaker)
             else:
-                await callback_channel.send(f"⏱️ Time's up {speaker.mention}!")
+                await outbound.send(callback_channel, f"⏱️ Time's up {speaker.mention}!", priority=LOW)
                 
-        except asyncio.CancelledError:
-            self.logger.info(f"Timer cancelled for {speaker.display_name}")
-            raise
-        finally:
-            self.is_running = False
+        self.timer = self.service.schedule(self.speaking_time, on_complete, self.warnings, on_warning, kind='speaking')
+        self.logger.info(f"Started timer for {speaker.display_name} ({self.speaking_time} seconds)")
     
     def extend_time(self, seconds: int):
-        """Add time to current timer"""
+        """Add time to the current speaker's turn"""
         if self.is_running:
-            self.time_remaining += seconds
-            self.speaking_time += seconds
+            self.service.extend(self.timer, seconds)
             self.logger.info(f"Extended timer by {seconds} seconds")
     
+    def pause(self):
+        """Freeze the current speaker's remaining time"""
+        if self.is_running:
+            self.service.pause(self.timer)
+    
+    def resume(self):
+        """Continue a paused turn"""
+        if self.is_paused:
+            self.service.resume(self.timer)
+    
     def stop_timer(self):
         """Stop the current timer"""
-        if self.current_task:
-            self.current_task.cancel()
-            self.current_task = None
-        self.is_running = False
+        if self.timer:
+            self.service.cancel(self.timer)
+            self.timer = None
     
     def get_time_remaining_formatted(self) -> str:
         """Get formatted time remaining"""
         if not self.is_running:
             return "Not running"
         
-        minutes = self.time_remaining // 60
-        seconds = self.time_remaining % 60
+        remaining = self.time_remaining
+        minutes = remaining // 60
+        seconds = remaining % 60
         return f"{minutes}:{seconds:02d}"
@@ -0,0 +1,93 @@
+from typing import Dict, List, Optional, Set
+
+
+class VoteTally:
+    """Incrementally maintained vote counts for one voting round
+    
+    Casting or changing a vote is O(1): counts are kept per candidate and
+    candidates are grouped into buckets by count, so the current leaders
+    and the max count never need a recount.
+    """
+    
+    __slots__ = ('votes', 'counts', 'buckets', 'max_count')
+    
+    def __init__(self):
+        self.votes: Dict[int, int] = {}  # voter_id -> candidate_id
+        self.counts: Dict[int, int] = {}  # candidate_id -> votes received
+        self.buckets: Dict[int, Set[int]] = {}  # vote count -> candidate_ids with that count
+        self.max_count = 0
+    
+    def __len__(self) -> int:
+        return len(self.votes)
+    
+    def __contains__(self, voter_id: int) -> bool:
+        return voter_id in self.votes
+    
+    def get(self, voter_id: int) -> Optional[int]:
+        """Candidate the voter currently supports, if any"""
+        return self.votes.get(voter_id)
+    
+    def cast(self, voter_id: int, candidate_id: int) -> Optional[int]:
+        """Record a vote, replacing any earlier vote; returns the previous candidate"""
+        previous = self.votes.get(voter_id)
+        if previous == candidate_id:
+            return previous
+        
+        if previous is not None:
+            self._decrement(previous)
+        self.votes[voter_id] = candidate_id
+        self._increment(candidate_id)
+        return previous
+    
+    def remove_voter(self, voter_id: int) -> Optional[int]:
+        """Withdraw a voter's vote; returns the candidate it was for"""
+        previous = self.votes.pop(voter_id, None)
+        if previous is not None:
+            self._decrement(previous)
+        return previous
+    
+    def reset(self):
+        """Clear all votes for a new round"""
+        self.votes.clear()
+        self.counts.clear()
+        self.buckets.clear()
+        self.max_count = 0
+    
+    def leaders(self) -> List[int]:
+        """Candidates tied for the most votes"""
+        if not self.max_count:
+            return []
+        return list(self.buckets[self.max_count])
+    
+    def distribution(self) -> Dict[int, int]:
+        """Snapshot of votes received per candidate"""
+        return dict(self.counts)
+    
+    def _increment(self, candidate_id: int):
+        count = self.counts.get(candidate_id, 0)
+        if count:
+            self._discard_from_bucket(count, candidate_id)
+        count += 1
+        self.counts[candidate_id] = count
+        self.buckets.setdefault(count, set()).add(candidate_id)
+        if count > self.max_count:
+            self.max_count = count
+    
+    def _decrement(self, candidate_id: int):
+        count = self.counts[candidate_id]
+        self._discard_from_bucket(count, candidate_id)
+        if count == self.max_count and count not in self.buckets:
+            self.max_count -= 1  # The candidate itself now sits at count - 1
+        
+        count -= 1
+        if count:
+            self.counts[candidate_id] = count
+            self.buckets.setdefault(count, set()).add(candidate_id)
+        else:
+            del self.counts[candidate_id]
+    
+    def _discard_from_bucket(self, count: int, candidate_id: int):
+        bucket = self.buckets[count]
+        bucket.discard(candidate_id)
+        if not bucket:
+            del self.buckets[count]
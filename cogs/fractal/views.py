@@ -1,18 +1,81 @@
 import discord
 import logging
 from typing import Callable, Dict, List
-from .group import FractalGroup
+from .launch import launch_fractal
+
+class VoteButton(discord.ui.DynamicItem[discord.ui.Button], template=r'fv:(?P<thread>\d+):(?P<level>\d+):(?P<candidate>\d+)'):
+    """Voting button routed by its custom ID (fv:<thread>:<level>:<candidate>)
+    
+    Registered once with bot.add_dynamic_items, so clicks on any round's
+    buttons - including messages sent before a restart - are dispatched
+    to the right group with a dictionary lookup and no per-round view
+    is kept in memory.
+    """
+    
+    def __init__(self, thread_id: int, level: int, candidate_id: int, label: str = None, style: discord.ButtonStyle = discord.ButtonStyle.primary):
+        super().__init__(discord.ui.Button(
+            style=style,
+            label=label,
+            custom_id=f"fv:{thread_id}:{level}:{candidate_id}"
+        ))
+        self.thread_id = thread_id
+        self.level = level
+        self.candidate_id = candidate_id
+    
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(int(match['thread']), int(match['level']), int(match['candidate']))
+    
+    async def callback(self, interaction: discord.Interaction):
+        # Always defer response immediately to avoid timeout
+        await interaction.response.defer(ephemeral=True)
+        logger = logging.getLogger('bot')
+        
+        try:
+            cog = interaction.client.get_cog('FractalCog')
+            group = cog.active_groups.get(self.thread_id) if cog else None
+            candidate = group.registry.get(self.candidate_id) if group else None
+            
+            # Process the vote in the group's mailbox (public announcement happens in process_vote)
+            counted = bool(candidate) and await group.submit(group.process_vote, interaction.user, candidate, self.level)
+            
+            if not counted:
+                await interaction.followup.send(
+                    f"Voting for Level {self.level} has already finished - use the latest voting buttons.",
+                    ephemeral=True
+                )
+                return
+            
+            # Confirm to the voter (private)
+            await interaction.followup.send(
+                f"You voted for {candidate.display_name}",
+                ephemeral=True
+            )
+            
+        except Exception as e:
+            logger.error(f"Error processing vote: {e}", exc_info=True)
+            await interaction.followup.send(
+                "❌ Error recording your vote. Please try again.",
+                ephemeral=True
+            )
+
 
 class ZAOFractalVotingView(discord.ui.View):
-    """UI view with voting buttons for fractal rounds"""
+    """UI view with voting buttons for fractal rounds
+    
+    Only used to lay out the buttons when the voting message is sent;
+    clicks are handled by VoteButton, so the view is stopped before sending
+    and never stored.
+    """
     
     def __init__(self, fractal_group):
-        super().__init__(timeout=None)  # No timeout for persistent buttons
+        super().__init__(timeout=None)
         self.fractal_group = fractal_group
         self.logger = logging.getLogger('bot')
         
         # Create voting buttons
         self.create_voting_buttons()
+        self.stop()
     
     def create_voting_buttons(self):
         """Create a button for each active candidate"""
@@ -32,43 +95,16 @@ class ZAOFractalVotingView(discord.ui.View):
             # Cycle through button styles
             style = styles[i % len(styles)]
             
-            # Create button with candidate name
-            button = discord.ui.Button(
-                style=style,
+            # Button with candidate name; thread, level and candidate travel in the custom ID
+            self.add_item(VoteButton(
+                self.fractal_group.thread.id,
+                self.fractal_group.current_level,
+                candidate.id,
                 label=candidate.display_name,
-                custom_id=f"vote_{candidate.id}"
-            )
-            
-            # Create and assign callback
-            button.callback = self.create_vote_callback(candidate)
-            self.add_item(button)
+                style=style
+            ))
             
         self.logger.info(f"Created {len(self.fractal_group.active_candidates)} voting buttons")
-    
-    def create_vote_callback(self, candidate):
-        """Create a callback function for voting buttons"""
-        async def vote_callback(interaction):
-            # Always defer response immediately to avoid timeout
-            await interaction.response.defer(ephemeral=True)
-            
-            try:
-                # Process the vote (public announcement happens in process_vote)
-                await self.fractal_group.process_vote(interaction.user, candidate)
-                
-                # Confirm to the voter (private)
-                await interaction.followup.send(
-                    f"You voted for {candidate.display_name}",
-                    ephemeral=True
-                )
-                
-            except Exception as e:
-                self.logger.error(f"Error processing vote: {e}", exc_info=True)
-                await interaction.followup.send(
-                    "❌ Error recording your vote. Please try again.",
-                    ephemeral=True
-                )
-                
-        return vote_callback
 
 
 class MemberConfirmationView(discord.ui.View):
@@ -80,88 +116,39 @@ class MemberConfirmationView(discord.ui.View):
         self.facilitator = facilitator
         self.awaiting_modification = False
     
-    @discord.ui.button(label="✅ Start Fractal", style=discord.ButtonStyle.success)
-    async def confirm_members(self, interaction: discord.Interaction, button: discord.ui.Button):
-        """Start the fractal with current members"""
+    async def claim_members(self, interaction: discord.Interaction) -> bool:
+        """Reserve the members and retire the buttons on the first valid click
+        
+        The reservation is taken before anything is awaited, so a double
+        click or a launch elsewhere can't get the same members in between.
+        """
         if interaction.user != self.facilitator:
             await interaction.response.send_message("Only the facilitator can start the fractal.", ephemeral=True)
-            return
-        
-        # For button interactions, we need to defer differently
-        try:
-            await interaction.response.defer()
-        except discord.InteractionResponded:
-            # Interaction already responded to, continue
-            pass
-        
-        # Generate group name
-        group_name = self.cog._get_next_group_name(interaction.guild.id)
-        
-        # Look for fractal-bot channel first, then fall back to current channel
-        channel = interaction.channel
-        fractal_bot_channel = discord.utils.get(interaction.guild.text_channels, name="fractal-bot")
-        
-        # Try to use fractal-bot channel if it exists and bot has permissions
-        if fractal_bot_channel:
-            try:
-                # Check if bot can create threads in fractal-bot channel
-                bot_permissions = fractal_bot_channel.permissions_for(interaction.guild.me)
-                if bot_permissions.create_public_threads:
-                    channel = fractal_bot_channel
-                    self.cog.logger.info(f"Using fractal-bot channel for thread creation")
-                else:
-                    self.cog.logger.warning(f"No thread creation permissions in fractal-bot channel, using fallback")
-            except Exception as e:
-                self.cog.logger.error(f"Error checking fractal-bot channel permissions: {e}")
-        
-        # Get the parent channel (in case we're in a thread)
-        if isinstance(channel, discord.Thread):
-            channel = channel.parent
-        elif isinstance(channel, discord.VoiceChannel):
-            # If somehow we're in a voice channel, find a suitable text channel
-            channel = interaction.guild.system_channel or interaction.guild.text_channels[0]
-        
-        # Create public thread
-        thread = await channel.create_thread(
-            name=group_name,
-            type=discord.ChannelType.public_thread,
-            reason="ZAO Fractal Group"
-        )
-        
-        # Add all members to thread
-        for member in self.members:
-            try:
-                await thread.add_user(member)
-            except discord.HTTPException:
-                pass  # Member might already be in thread or have permissions issues
-        
-        # Create and start fractal group
-        fractal_group = FractalGroup(
-            thread=thread,
-            members=self.members,
-            facilitator=self.facilitator,
-            cog=self.cog
-        )
+            return False
         
-        # Store active group
-        self.cog.active_groups[thread.id] = fractal_group
+        # Someone may have joined another fractal since setup began
+        busy = self.cog.active_groups.reserve(self.members)
+        if busy:
+            await interaction.response.send_message(self.cog.busy_members_message(busy), ephemeral=True)
+            return False
         
-        # Update original message first to avoid timeout
+        self.stop()
+        for item in self.children:
+            item.disabled = True
         try:
-            await interaction.edit_original_response(
-                content=f"✅ **Fractal started!** Check {thread.mention}",
-                view=None
-            )
-        except:
-            pass  # Interaction might have timed out, but continue anyway
+            await interaction.response.edit_message(view=self)
+        except (discord.InteractionResponded, discord.HTTPException):
+            # Interaction already responded to or timed out, continue
+            pass
+        return True
+    
+    @discord.ui.button(label="✅ Start Fractal", style=discord.ButtonStyle.success)
+    async def confirm_members(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Start the fractal with current members"""
+        if not await self.claim_members(interaction):
+            return
         
-        # Start the fractal (this might take a moment)
-        try:
-            await fractal_group.start_fractal()
-        except Exception as e:
-            # If fractal start fails, send error to thread
-            await thread.send(f"❌ Error starting fractal: {str(e)}")
-            raise
+        await launch_fractal(self.cog, interaction, self.members, self.facilitator)
     
     @discord.ui.button(label="❌ Modify Members", style=discord.ButtonStyle.secondary)
     async def modify_members(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -194,7 +181,7 @@ class VoiceFractalControlView(discord.ui.View):
     def can_control_speaking(self, user: discord.Member) -> bool:
         """Check if user can control speaking (facilitator or current speaker)"""
         return (user == self.fractal.facilitator or 
-                (self.fractal.speaking_queue and user == self.fractal.speaking_queue.current_speaker))
+                (self.fractal.speaking_queue and user.id == self.fractal.speaking_queue.current_id))
     
     @discord.ui.button(label="⏭️ Next Speaker", style=discord.ButtonStyle.primary)
     async def next_speaker(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -207,7 +194,7 @@ class VoiceFractalControlView(discord.ui.View):
             return
         
         await interaction.response.defer()
-        await self.fractal.advance_speaker()
+        await self.fractal.submit(self.fractal.advance_speaker)
     
     @discord.ui.button(label="⏸️ Skip & Return", style=discord.ButtonStyle.secondary)
     async def skip_speaker(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -220,7 +207,7 @@ class VoiceFractalControlView(discord.ui.View):
             return
         
         await interaction.response.defer()
-        await self.fractal.skip_current_speaker()
+        await self.fractal.submit(self.fractal.skip_current_speaker)
     
     @discord.ui.button(label="🗳️ Skip to Voting", style=discord.ButtonStyle.success)
     async def skip_to_voting(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -245,7 +232,7 @@ class VoiceFractalControlView(discord.ui.View):
             )
         else:
             await interaction.response.defer()
-            await self.fractal.transition_to_voting()
+            await self.fractal.submit(self.fractal.transition_to_voting)
     
     @discord.ui.button(label="⏱️ +30s", style=discord.ButtonStyle.success)
     async def extend_30s(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -257,8 +244,10 @@ class VoiceFractalControlView(discord.ui.View):
             )
             return
         
-        await self.fractal.extend_speaking_time(30)
-        await interaction.response.send_message("⏱️ Added 30 seconds", ephemeral=True)
+        # Acknowledge first; the extension may queue behind other commands
+        await interaction.response.defer(ephemeral=True)
+        await self.fractal.submit(self.fractal.extend_speaking_time, 30)
+        await interaction.followup.send("⏱️ Added 30 seconds", ephemeral=True)
     
     @discord.ui.button(label="⏱️ +1m", style=discord.ButtonStyle.success)
     async def extend_1m(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -270,8 +259,10 @@ class VoiceFractalControlView(discord.ui.View):
             )
             return
         
-        await self.fractal.extend_speaking_time(60)
-        await interaction.response.send_message("⏱️ Added 1 minute", ephemeral=True)
+        # Acknowledge first; the extension may queue behind other commands
+        await interaction.response.defer(ephemeral=True)
+        await self.fractal.submit(self.fractal.extend_speaking_time, 60)
+        await interaction.followup.send("⏱️ Added 1 minute", ephemeral=True)
 
 
 class ConfirmEndEarlyView(discord.ui.View):
@@ -286,7 +277,7 @@ class ConfirmEndEarlyView(discord.ui.View):
     async def confirm_end(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Confirm ending speaking phase early"""
         await interaction.response.defer()
-        await self.fractal.transition_to_voting()
+        await self.fractal.submit(self.fractal.transition_to_voting)
         
         # Edit original message to show confirmation
         try:
@@ -316,74 +307,15 @@ class VoiceMemberConfirmationView(MemberConfirmationView):
     
     async def confirm_members(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Start voice-enabled fractal"""
-        if interaction.user != self.facilitator:
-            await interaction.response.send_message("Only the facilitator can start the fractal.", ephemeral=True)
+        if not await self.claim_members(interaction):
             return
         
-        # For button interactions, we need to defer differently
-        try:
-            await interaction.response.defer()
-        except discord.InteractionResponded:
-            # Interaction already responded to, continue
-            pass
-        
-        # Use existing thread creation logic
-        group_name = self.cog._get_next_group_name(interaction.guild.id)
-        
-        # Look for fractal-bot channel first, then fall back to current channel
-        channel = interaction.channel
-        fractal_bot_channel = discord.utils.get(interaction.guild.text_channels, name="fractal-bot")
-        
-        # Try to use fractal-bot channel if it exists and bot has permissions
-        if fractal_bot_channel:
-            try:
-                # Check if bot can create threads in fractal-bot channel
-                bot_permissions = fractal_bot_channel.permissions_for(interaction.guild.me)
-                if bot_permissions.create_public_threads:
-                    channel = fractal_bot_channel
-                    self.cog.logger.info(f"Using fractal-bot channel for thread creation")
-                else:
-                    self.cog.logger.warning(f"No thread creation permissions in fractal-bot channel, using fallback")
-            except Exception as e:
-                self.cog.logger.error(f"Error checking fractal-bot channel permissions: {e}")
-        
-        # Ensure we have a text channel that can create threads
-        if isinstance(channel, discord.Thread):
-            channel = channel.parent
-        elif isinstance(channel, discord.VoiceChannel):
-            # If somehow we're in a voice channel, find a suitable text channel
-            channel = interaction.guild.system_channel or interaction.guild.text_channels[0]
-        
-        thread = await channel.create_thread(
-            name=group_name,
-            type=discord.ChannelType.public_thread,
-            reason="ZAO Fractal Group"
-        )
-        
-        # Add members (existing logic)
-        for member in self.members:
-            try:
-                await thread.add_user(member)
-            except discord.HTTPException:
-                pass
-        
-        # Create VOICE-ENABLED fractal group
-        fractal_group = FractalGroup(
-            thread=thread,
-            members=self.members,
-            facilitator=self.facilitator,
-            cog=self.cog,
-            voice_channel=self.voice_channel,  # NEW!
-            speaking_time=self.speaking_time   # NEW!
+        # Voice phase first, then voting
+        await launch_fractal(
+            self.cog,
+            interaction,
+            self.members,
+            self.facilitator,
+            voice_channel=self.voice_channel,
+            speaking_time=self.speaking_time
         )
-        
-        # Store and start (existing pattern)
-        self.cog.active_groups[thread.id] = fractal_group
-        
-        await interaction.edit_original_response(
-            content=f"✅ **Voice Fractal started!** Check {thread.mention}",
-            view=None
-        )
-        
-        # This will start voice phase first, then transition to voting
-        await fractal_group.start_fractal()
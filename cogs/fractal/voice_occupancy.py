@@ -0,0 +1,80 @@
+import discord
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class VoiceOccupancy:
+    """Who is in which voice channel, kept current from voice state events
+    
+    Seeded from each guild's voice channels when the gateway is ready and
+    then updated by `on_voice_state_update`, so finding a channel's members
+    or a member's channel is a dictionary lookup rather than a scan of the
+    channel's member list. Bots are never indexed.
+    """
+    
+    __slots__ = ('channels', 'member_channel')
+    
+    def __init__(self):
+        self.channels: Dict[int, Dict[int, discord.Member]] = {}  # channel_id -> user_id -> Member, in join order
+        self.member_channel: Dict[int, int] = {}  # user_id -> channel_id
+    
+    def seed_guild(self, guild: discord.Guild):
+        """Index everyone currently in one guild's voice channels"""
+        self.drop_guild(guild)
+        for channel in (*guild.voice_channels, *guild.stage_channels):
+            for member in channel.members:
+                self._join(member, channel.id)
+    
+    def drop_guild(self, guild: discord.Guild):
+        for channel in (*guild.voice_channels, *guild.stage_channels):
+            for user_id in self.channels.pop(channel.id, ()):
+                self.member_channel.pop(user_id, None)
+    
+    def update(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState) -> Tuple[Optional[int], Optional[int]]:
+        """Apply a voice state change; returns the channel IDs left and joined (None if unchanged)"""
+        if member.bot:
+            return None, None
+        
+        left = before.channel.id if before.channel else None
+        joined = after.channel.id if after.channel else None
+        if left == joined:
+            members = self.channels.get(joined) if joined is not None else None
+            if members is not None and member.id in members:
+                members[member.id] = member  # Mute, deafen etc.; keep the freshest Member
+            elif joined is not None:
+                self._join(member, joined)
+            return None, None
+        
+        if joined is None:
+            self._leave(member.id)
+        else:
+            self._join(member, joined)
+        return left, joined
+    
+    def _join(self, member: discord.Member, channel_id: int):
+        if member.bot:
+            return
+        self._leave(member.id)
+        self.channels.setdefault(channel_id, {})[member.id] = member
+        self.member_channel[member.id] = channel_id
+    
+    def _leave(self, user_id: int):
+        channel_id = self.member_channel.pop(user_id, None)
+        if channel_id is None:
+            return
+        members = self.channels.get(channel_id)
+        if members is not None:
+            members.pop(user_id, None)
+            if not members:
+                del self.channels[channel_id]
+    
+    def members_in(self, channel_id: int) -> List[discord.Member]:
+        """Non-bot members in a voice channel, in the order they joined"""
+        return list(self.channels.get(channel_id, {}).values())
+    
+    def channel_of(self, user_id: int) -> Optional[int]:
+        """ID of the voice channel a user is in, if any"""
+        return self.member_channel.get(user_id)
+    
+    def present(self, user_ids: Iterable[int], channel_id: int) -> List[int]:
+        """Those of `user_ids` currently in the given voice channel"""
+        return [user_id for user_id in user_ids if self.member_channel.get(user_id) == channel_id]
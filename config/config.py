@@ -20,3 +20,8 @@ BUTTON_STYLES = [
 
 # Thread Settings
 THREAD_PREFIX = "ZAO Fractal:"
+
+# Channel Settings
+# Per-guild channel overrides, skipping name-based lookup:
+# {guild_id: {'results': channel_id, 'threads': channel_id}}
+GUILD_CHANNEL_OVERRIDES = {}
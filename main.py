@@ -4,6 +4,7 @@ import asyncio
 import os
 from discord.ext import commands
 from dotenv import load_dotenv
+from utils.command_sync import CommandSync
 
 # Load configuration
 load_dotenv()
@@ -19,14 +20,32 @@ logging.basicConfig(
 )
 logger = logging.getLogger('bot')
 
-# Configure intents (all required for full functionality)
-intents = discord.Intents.default()
-intents.message_content = True
-intents.members = True
-intents.guilds = True
+# Configure intents. Lean mode drops the privileged intents nothing reads,
+# skips member chunking at startup and only caches members in voice
+# channels; anyone else is fetched on demand (utils/member_resolver.py)
+LEAN_GATEWAY = os.getenv('LEAN_GATEWAY', 'FALSE').upper() == 'TRUE'
+if LEAN_GATEWAY:
+    intents = discord.Intents.none()
+    intents.guilds = True
+    intents.voice_states = True
+    member_cache_flags = discord.MemberCacheFlags.none()
+    member_cache_flags.voice = True
+else:
+    # All required for full functionality
+    intents = discord.Intents.default()
+    intents.message_content = True
+    intents.members = True
+    intents.guilds = True
+    member_cache_flags = discord.MemberCacheFlags.from_intents(intents)
 
 # Initialize bot with command prefix
-bot = commands.Bot(command_prefix='!', intents=intents)
+bot = commands.Bot(
+    command_prefix='!',
+    intents=intents,
+    member_cache_flags=member_cache_flags,
+    chunk_guilds_at_startup=not LEAN_GATEWAY
+)
+command_sync = CommandSync(bot, os.getenv('COMMAND_SYNC_PATH', 'data/command_sync.json'))
 
 # Load cogs
 async def load_extensions():
@@ -43,6 +62,8 @@ async def load_extensions():
 async def on_ready():
     logger.info(f"=== Bot Starting Up ===")
     logger.info(f"Bot: {bot.user.name}#{bot.user.discriminator} (ID: {bot.user.id})")
+    if LEAN_GATEWAY:
+        logger.info("Lean gateway mode: caching voice-connected members only")
     
     # Generate invite link
     invite_link = discord.utils.oauth_url(
@@ -68,23 +89,31 @@ async def on_ready():
     for cmd in bot.tree.get_commands():
         logger.info(f"Command: /{cmd.name} - {cmd.description}")
     
-    # Clear any existing guild commands first
-    for guild in bot.guilds:
-        logger.info(f"Clearing existing commands for guild: {guild.name}")
-        bot.tree.clear_commands(guild=discord.Object(id=guild.id))
+    # Only guilds whose command tree changed since the last sync are synced
+    await command_sync.sync_all()
     
-    # Copy global commands to guild for faster sync
-    for guild in bot.guilds:
-        logger.info(f"Copying commands to guild: {guild.name}")
-        bot.tree.copy_global_to(guild=discord.Object(id=guild.id))
-        synced = await bot.tree.sync(guild=discord.Object(id=guild.id))
-        logger.info(f"Commands synced to guild {guild.id}: {len(synced)} commands")
+@bot.event
+async def on_guild_join(guild):
+    await command_sync.sync_guilds([guild])
+
+@bot.event
+async def on_guild_remove(guild):
+    command_sync.forget(guild.id)
 
 # Run bot
 async def main():
+    # Imported here so these read settings after load_dotenv()
+    from utils.outbound import outbound
+    from utils.web_integration import web_integration
+    
     async with bot:
-        await load_extensions()
-        await bot.start(TOKEN)
+        await web_integration.start()
+        try:
+            await load_extensions()
+            await bot.start(TOKEN)
+        finally:
+            await outbound.close()
+            await web_integration.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
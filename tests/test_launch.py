@@ -0,0 +1,107 @@
+"""
+Check that members are held from the click until their fractal registers
+
+Two launches racing for the same members must not both get past the busy
+check, and a launch whose thread can't be created must give them back.
+Launched from a voice or stage chat, the thread goes in a text channel
+that allows threads.
+"""
+
+import asyncio
+import os
+import sys
+
+import discord
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cogs.fractal.group_registry import GroupRegistry
+from cogs.fractal.launch import launch_fractal, pick_parent_channel
+
+
+class FakeMember:
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.display_name = f"Member {user_id}"
+
+
+class FakeGuild:
+    id = 1
+    system_channel = None
+
+
+class FakeChannel:
+    async def create_thread(self, **kwargs):
+        await asyncio.sleep(0)
+        raise RuntimeError("Missing Permissions")
+
+
+class FakeResolver:
+    def get_fractal_channel(self, guild):
+        return FakeChannel()
+
+
+class FakeInteraction:
+    guild = FakeGuild()
+    channel = None
+
+
+class FakeCog:
+    def __init__(self):
+        self.active_groups = GroupRegistry()
+        self.channel_resolver = FakeResolver()
+    
+    def _get_next_group_name(self, guild_id: int) -> str:
+        return "Fractal Group 1"
+
+
+def test_a_second_claim_sees_the_reservation():
+    registry = GroupRegistry()
+    members = [FakeMember(i) for i in range(4)]
+    assert registry.reserve(members) == []
+    # A double click, or a launch sharing one member, is turned away before any thread exists
+    assert registry.reserve(members[2:] + [FakeMember(9)]) == members[2:]
+    assert registry.busy_members([FakeMember(9)]) == []
+    
+    registry.release(members)
+    assert registry.busy_members(members) == []
+
+
+def test_failed_thread_creation_releases_members():
+    cog = FakeCog()
+    members = [FakeMember(i) for i in range(4)]
+    assert cog.active_groups.reserve(members) == []
+    
+    with pytest.raises(RuntimeError):
+        asyncio.run(launch_fractal(cog, FakeInteraction(), members, members[0]))
+    assert cog.active_groups.reserved == set()
+    assert cog.active_groups.reserve(members) == []
+
+
+class FakeTextChannel:
+    def __init__(self, name: str, threads_allowed: bool):
+        self.name = name
+        self.threads_allowed = threads_allowed
+    
+    def permissions_for(self, member):
+        return discord.Permissions(create_public_threads=self.threads_allowed)
+
+
+def test_stage_chat_falls_back_to_a_channel_that_allows_threads():
+    class NoFractalChannel:
+        def get_fractal_channel(self, guild):
+            return None
+    
+    class StageGuild:
+        me = None
+        system_channel = None
+        text_channels = [FakeTextChannel('rules', False), FakeTextChannel('general', True)]
+    
+    cog = FakeCog()
+    cog.channel_resolver = NoFractalChannel()
+    interaction = FakeInteraction()
+    interaction.guild = StageGuild()
+    interaction.channel = object.__new__(discord.StageChannel)
+    
+    assert pick_parent_channel(cog, interaction).name == 'general'
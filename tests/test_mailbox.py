@@ -0,0 +1,175 @@
+"""
+Stress the per-group command mailbox with concurrent votes
+
+Every member of a fake fractal votes at once, several times over and for
+random candidates, and each outbound send yields to the event loop so any
+check-then-act race inside a command would show up. The journal must then
+record exactly one winner per level, and the group must end exactly once.
+"""
+
+import asyncio
+import itertools
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cogs.fractal.countdown import CountdownPacer
+from cogs.fractal.group import FractalGroup
+from cogs.fractal.group_registry import GroupRegistry
+from cogs.fractal.voice_occupancy import VoiceOccupancy
+from utils.outbound import outbound
+from utils.timers import TimerService
+from utils.web_integration import web_integration
+
+ids = itertools.count(1)
+
+
+class FakeGuild:
+    id = 1
+
+
+class FakeMember:
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.display_name = f"Member {user_id}"
+        self.mention = f"<@{user_id}>"
+        self.bot = False
+
+
+class FakeMessage:
+    def __init__(self):
+        self.id = next(ids)
+
+
+class FakeThread:
+    def __init__(self):
+        self.id = next(ids)
+        self.name = f"Fractal Group {self.id}"
+        self.mention = f"<#{self.id}>"
+        self.guild = FakeGuild()
+
+
+class FakeResolver:
+    def get_results_channel(self, guild):
+        return None
+
+
+class FakeJournal:
+    def __init__(self):
+        self.events = []
+    
+    def append(self, thread_id: int, event_type: str, data: dict):
+        self.events.append((event_type, data))
+    
+    def of_type(self, event_type: str):
+        return [data for kind, data in self.events if kind == event_type]
+
+
+class FakeCog:
+    def __init__(self):
+        self.active_groups = GroupRegistry()
+        self.timers = TimerService()
+        self.countdown = CountdownPacer()
+        self.voice_occupancy = VoiceOccupancy()
+        self.channel_resolver = FakeResolver()
+        self.journal = FakeJournal()
+        self.history = None
+
+
+@pytest.fixture(autouse=True)
+def quiet_io(monkeypatch):
+    """Replace Discord and web app traffic with sends that just yield to the loop"""
+    async def send(channel, *args, **kwargs):
+        await asyncio.sleep(0)
+        return FakeMessage()
+    
+    async def edit(message, **kwargs):
+        await asyncio.sleep(0)
+    
+    monkeypatch.setattr(outbound, 'send', send)
+    monkeypatch.setattr(outbound, 'edit', edit)
+    monkeypatch.setattr(web_integration, '_queue_event', lambda *args: False)
+
+
+async def run_fractal(size: int, rounds_of_votes: int, seed: int):
+    rng = random.Random(seed)
+    cog = FakeCog()
+    members = [FakeMember(1000 + i) for i in range(size)]
+    group = FractalGroup(FakeThread(), members, members[0], cog)
+    cog.active_groups[group.thread.id] = group
+    await group.submit(group.start_fractal)
+    
+    while not group.ended:
+        level = group.current_level
+        candidates = group.active_candidates
+        votes = [
+            group.submit(group.process_vote, voter, rng.choice(candidates), level)
+            for _ in range(rounds_of_votes)
+            for voter in rng.sample(members, len(members))
+        ]
+        # Close with a unanimous vote so every round ends; votes behind the winning one are stale
+        votes += [group.submit(group.process_vote, voter, candidates[0], level) for voter in members]
+        await asyncio.gather(*votes)
+        assert group.ended or group.current_level == level - 1
+    
+    await cog.timers.close()
+    return group, cog.journal
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_concurrent_votes_advance_once_per_level(seed):
+    group, journal = asyncio.run(run_fractal(size=6, rounds_of_votes=3, seed=seed))
+    
+    levels = [data['level'] for data in journal.of_type('winner')]
+    assert levels == sorted(set(levels), reverse=True)
+    assert levels == list(range(6, 6 - len(levels), -1))
+    assert len(set(data['user'] for data in journal.of_type('winner'))) == len(levels)
+    assert len(journal.of_type('ended')) == 1
+    assert group.thread.id not in group.cog.active_groups
+
+
+def test_commands_after_end_are_skipped():
+    async def scenario():
+        cog = FakeCog()
+        members = [FakeMember(2000 + i) for i in range(3)]
+        group = FractalGroup(FakeThread(), members, members[0], cog)
+        cog.active_groups[group.thread.id] = group
+        await group.submit(group.start_fractal)
+        
+        # Two admins end the fractal at once, and a force and a vote arrive behind them
+        results = await asyncio.gather(
+            group.submit(group.end_fractal),
+            group.submit(group.end_fractal),
+            group.submit(group.force_round),
+            group.submit(group.process_vote, members[0], members[1], group.current_level)
+        )
+        await cog.timers.close()
+        return results, cog.journal
+    
+    results, journal = asyncio.run(scenario())
+    assert results == [None, None, None, None]
+    assert len(journal.of_type('ended')) == 1
+    assert journal.of_type('vote') == []
+
+
+def test_posted_command_failures_are_logged(caplog):
+    async def scenario():
+        cog = FakeCog()
+        members = [FakeMember(3000 + i) for i in range(3)]
+        group = FractalGroup(FakeThread(), members, members[0], cog)
+        
+        async def member_left_voice(member):
+            raise RuntimeError("voice state out of date")
+        
+        group.post(member_left_voice, members[1])
+        await group.mailbox_task
+        await cog.timers.close()
+    
+    with caplog.at_level('ERROR', logger='bot'):
+        asyncio.run(scenario())
+    assert "member_left_voice failed in fractal" in caplog.text
+    assert "voice state out of date" in caplog.text
@@ -0,0 +1,85 @@
+"""
+Check that the outbound scheduler keeps each channel's messages in order
+
+Priority decides which channel goes next, but within one channel messages
+and edits must land in the order they were queued.
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.outbound import CRITICAL, LOW, NORMAL, OutboundScheduler
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int, sent: list):
+        self.id = channel_id
+        self.sent = sent
+    
+    async def send(self, content, **kwargs):
+        await asyncio.sleep(0.01)
+        self.sent.append((self.id, content))
+        return FakeMessage(self, content)
+
+
+class FakeMessage:
+    def __init__(self, channel: FakeChannel, content: str):
+        self.id = id(self)
+        self.channel = channel
+        self.content = content
+    
+    async def edit(self, content=None, **kwargs):
+        await asyncio.sleep(0.01)
+        self.channel.sent.append((self.channel.id, f"edit: {content}"))
+
+
+def test_priority_never_reorders_a_channel():
+    async def scenario():
+        scheduler = OutboundScheduler()
+        sent = []
+        busy, quiet = FakeChannel(1, sent), FakeChannel(2, sent)
+        
+        first = await scheduler.send(busy, "board")
+        futures = [
+            scheduler.send(busy, "vote 1", priority=LOW),
+            scheduler.edit(first, content="tally", priority=LOW),
+            scheduler.send(busy, "vote 2", priority=LOW),
+            scheduler.send(busy, "winner", priority=CRITICAL),
+            scheduler.send(quiet, "welcome", priority=NORMAL),
+            scheduler.send(quiet, "results", priority=CRITICAL),
+        ]
+        await asyncio.gather(*futures)
+        await scheduler.close()
+        return sent
+    
+    sent = asyncio.run(scenario())
+    assert [content for channel_id, content in sent if channel_id == 1] == [
+        "board", "vote 1", "edit: tally", "vote 2", "winner"
+    ]
+    assert [content for channel_id, content in sent if channel_id == 2] == ["welcome", "results"]
+
+
+def test_coalesced_edit_takes_its_new_priority():
+    async def scenario():
+        scheduler = OutboundScheduler()
+        sent = []
+        board_channel, other = FakeChannel(1, sent), FakeChannel(2, sent)
+        
+        board = await scheduler.send(board_channel, "board")
+        futures = [
+            scheduler.send(other, "vote echo", priority=LOW),
+            scheduler.edit(board, content="tally", priority=LOW),
+            # Merged into the queued edit, which now goes out ahead of the echo
+            scheduler.edit(board, content="final tally", priority=CRITICAL),
+        ]
+        await asyncio.gather(*futures)
+        await scheduler.close()
+        return sent, scheduler.get_stats()
+    
+    sent, stats = asyncio.run(scenario())
+    assert sent == [(1, "board"), (1, "edit: final tally"), (2, "vote echo")]
+    assert stats['coalesced'] == 1
+    assert stats['depth'] == 0
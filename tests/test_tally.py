@@ -0,0 +1,57 @@
+"""
+Check VoteTally against the from-scratch recount it replaced
+
+Random sequences of new votes, changed votes, withdrawn votes and resets
+are applied to a VoteTally and to a plain voter -> candidate dict; after
+every step the incremental counts, max and leaders must match a full
+recount of the dict, as check_for_winner used to do on every vote.
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cogs.fractal.tally import VoteTally
+
+
+def recount(votes):
+    """The old check_for_winner count: max votes and the candidates tied on it"""
+    vote_counts = {}
+    for candidate_id in votes.values():
+        vote_counts[candidate_id] = vote_counts.get(candidate_id, 0) + 1
+    max_votes = max(vote_counts.values()) if vote_counts else 0
+    leaders = [candidate_id for candidate_id, count in vote_counts.items() if count == max_votes]
+    return vote_counts, max_votes, leaders
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_tally_matches_recount(seed):
+    rng = random.Random(seed)
+    voters = list(range(1, rng.randint(2, 12)))
+    candidates = list(range(100, 100 + rng.randint(1, 6)))
+    tally = VoteTally()
+    votes = {}
+
+    for _ in range(500):
+        action = rng.random()
+        voter = rng.choice(voters)
+        if action < 0.75:
+            candidate = rng.choice(candidates)
+            assert tally.cast(voter, candidate) == votes.get(voter)
+            votes[voter] = candidate
+        elif action < 0.98:
+            assert tally.remove_voter(voter) == votes.pop(voter, None)
+        else:
+            tally.reset()
+            votes.clear()
+
+        vote_counts, max_votes, leaders = recount(votes)
+        assert tally.votes == votes
+        assert len(tally) == len(votes)
+        assert tally.distribution() == vote_counts
+        assert tally.max_count == max_votes
+        assert sorted(tally.leaders()) == sorted(leaders)
@@ -0,0 +1,35 @@
+"""
+Check that TimerService reports its timers per kind
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.timers import TimerService
+
+
+def test_stats_count_each_kind_separately():
+    async def scenario():
+        service = TimerService()
+        
+        async def done():
+            pass
+        
+        speaking = service.schedule(10, done, kind='speaking')
+        paused = service.schedule(10, done, kind='speaking')
+        service.pause(paused)
+        for _ in range(3):
+            service.schedule(0.01, done, kind='countdown')
+        await asyncio.sleep(0.05)
+        stats = service.get_stats()
+        service.cancel(speaking)
+        await service.close()
+        return stats
+    
+    stats = asyncio.run(scenario())
+    assert stats['kinds']['speaking'] == {'active': 1, 'paused': 1, 'completed': 0}
+    assert stats['kinds']['countdown'] == {'active': 0, 'paused': 0, 'completed': 3}
+    assert stats['active'] == 1 and stats['paused'] == 1 and stats['completed'] == 3
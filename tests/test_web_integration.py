@@ -0,0 +1,97 @@
+"""
+Check webhook retry ordering, attempt limits and dead-lettering
+
+The HTTP POST is replaced by a script of status codes, so these run
+without a web app or an open outbox database.
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.web_integration import WebIntegration
+from utils.webhook_dispatcher import WebhookEvent
+
+
+def make_integration(statuses):
+    """A WebIntegration whose requests get the given statuses in turn (then 200)"""
+    integration = WebIntegration()
+    integration.posted = []
+    
+    async def post_events(events):
+        integration.posted.append([event.event_id for event in events])
+        return statuses.pop(0) if statuses else 200
+    
+    integration._post_events = post_events
+    return integration
+
+
+def event(event_id: str, fractal_id: str = 'f1') -> WebhookEvent:
+    return WebhookEvent('vote_cast', fractal_id, {}, event_id=event_id)
+
+
+def test_later_events_wait_behind_a_retry():
+    async def scenario():
+        integration = make_integration([503])
+        assert not await integration._deliver([event('a')])
+        # Held behind 'a' rather than sent ahead of it
+        assert not await integration._deliver([event('b')])
+        assert await integration._deliver([event('c', fractal_id='f2')])
+        assert integration.posted == [['a'], ['c']]
+        
+        await integration._retry_fractal('f1')
+        return integration
+    
+    integration = asyncio.run(scenario())
+    assert integration.posted == [['a'], ['c'], ['a', 'b']]
+    assert integration.blocked == {}
+    assert integration.dead_lettered == 0
+
+
+def test_rejected_events_are_dead_lettered():
+    async def scenario():
+        integration = make_integration([400])
+        assert not await integration._deliver([event('a')])
+        assert await integration._deliver([event('b')])
+        return integration
+    
+    integration = asyncio.run(scenario())
+    assert integration.posted == [['a'], ['b']]
+    assert integration.blocked == {}
+    assert integration.dead_lettered == 1
+
+
+def test_attempts_are_capped():
+    async def scenario():
+        integration = make_integration([500] * 10)
+        integration.max_attempts = 3
+        assert not await integration._deliver([event('a')])
+        await integration._retry_fractal('f1')
+        await integration._retry_fractal('f1')
+        return integration
+    
+    integration = asyncio.run(scenario())
+    assert integration.posted == [['a'], ['a'], ['a']]
+    assert integration.blocked == {}
+    assert integration.dead_lettered == 1
+
+
+def test_events_parked_by_an_open_circuit_keep_their_place():
+    async def scenario():
+        integration = make_integration([])
+        answers = [False]  # Open for the first request, then the cooldown has passed
+        integration.breaker.allow_request = lambda: answers.pop(0) if answers else True
+        
+        assert not await integration._deliver([event('a1')])
+        # The next batch for the fractal would get the probe; it must queue behind a1 instead
+        assert not await integration._deliver([event('a2')])
+        assert integration.posted == []
+        
+        await integration._retry_fractal('f1')
+        return integration
+    
+    integration = asyncio.run(scenario())
+    assert integration.posted == [['a1', 'a2']]
+    assert integration.blocked == {}
@@ -0,0 +1,36 @@
+"""
+Check that the webhook dispatcher's batch window doesn't add up across fractals
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.webhook_dispatcher import WebhookDispatcher, WebhookEvent
+
+
+def test_window_is_waited_once_per_burst_not_per_fractal():
+    async def scenario():
+        delivered = []
+        
+        async def deliver(events):
+            delivered.append([event.fractal_id for event in events])
+            return True
+        
+        dispatcher = WebhookDispatcher(deliver, workers=1, batch_window=0.25)
+        dispatcher.start()
+        started = time.monotonic()
+        for index in range(20):
+            dispatcher.submit(WebhookEvent('vote_cast', f"f{index}", {}, event_id=str(index)))
+        while dispatcher.depth or dispatcher.in_flight:
+            await asyncio.sleep(0.01)
+        elapsed = time.monotonic() - started
+        await dispatcher.stop()
+        return delivered, elapsed
+    
+    delivered, elapsed = asyncio.run(scenario())
+    assert delivered == [[f"f{index}"] for index in range(20)]
+    assert elapsed < 1.0
@@ -0,0 +1,53 @@
+"""
+Check that closing the outbox never cuts a batch write short
+
+close() used to cancel the flush loop while a batch was being written in
+a worker thread, losing the batch and racing a second write against
+closing the database.
+"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.webhook_outbox import WebhookOutbox
+
+
+def test_close_waits_for_the_write_in_progress(tmp_path):
+    path = str(tmp_path / 'outbox.db')
+    
+    async def scenario():
+        outbox = WebhookOutbox(path, flush_interval=0.01)
+        await outbox.open()
+        writing = threading.Event()
+        write_batch = outbox._write_batch
+        active = []
+        overlaps = []
+        
+        def slow_write(inserts, updates):
+            overlaps.append(len(active))
+            active.append(inserts)
+            writing.set()
+            time.sleep(0.2)
+            write_batch(inserts, updates)
+            active.remove(inserts)
+        
+        outbox._write_batch = slow_write
+        outbox.append('a', 'vote_cast', 'f1', {})
+        while not writing.is_set():
+            await asyncio.sleep(0.01)
+        # Arrives while the first batch is still being written
+        outbox.append('b', 'vote_cast', 'f1', {})
+        await outbox.close()
+        return overlaps
+    
+    assert asyncio.run(scenario()) == [0, 0]
+    connection = sqlite3.connect(path)
+    rows = connection.execute("SELECT event_id FROM outbox ORDER BY created_at").fetchall()
+    connection.close()
+    assert rows == [('a',), ('b',)]
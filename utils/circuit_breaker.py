@@ -0,0 +1,136 @@
+import logging
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Circuit breaker with failure-rate and latency trips and an adaptive timeout
+    
+    While closed, calls go through and their outcomes are tracked over a
+    sliding window. Too many failures or slow calls open the circuit so
+    callers are rejected immediately. After a cooldown a single probe is
+    let through (half-open); its outcome closes or re-opens the circuit.
+    """
+    
+    def __init__(self, name: str, window_size: int = 20, min_calls: int = 5, failure_rate_threshold: float = 0.5,
+                 slow_call_threshold: float = 5.0, slow_rate_threshold: float = 0.5, open_duration: float = 30.0,
+                 min_timeout: float = 1.0, max_timeout: float = 10.0, timeout_multiplier: float = 2.0):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self.slow_rate_threshold = slow_rate_threshold
+        self.open_duration = open_duration
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.timeout_multiplier = timeout_multiplier
+        
+        self.state = CLOSED
+        self.outcomes = deque(maxlen=window_size)  # (failed, slow) per call
+        self.latencies = deque(maxlen=100)  # Seconds, successful calls only
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.rejected = 0
+        self.times_opened = 0
+        self.logger = logging.getLogger('bot')
+    
+    def allow_request(self) -> bool:
+        """Whether a call may proceed; claims the probe slot when half-open"""
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.open_duration:
+                self.rejected += 1
+                return False
+            self._transition(HALF_OPEN)
+        
+        if self.state == HALF_OPEN:
+            if self.probe_in_flight:
+                self.rejected += 1
+                return False
+            self.probe_in_flight = True
+        
+        return True
+    
+    def ready_for_probe(self) -> bool:
+        """Whether the next call would be allowed, without claiming it"""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            return time.monotonic() - self.opened_at >= self.open_duration
+        return not self.probe_in_flight
+    
+    def record_success(self, latency: float):
+        """Record a successful call and its latency"""
+        self.latencies.append(latency)
+        
+        if self.state == HALF_OPEN:
+            self.probe_in_flight = False
+            self.outcomes.clear()
+            self._transition(CLOSED)
+            return
+        
+        self.outcomes.append((False, latency >= self.slow_call_threshold))
+        self._check_thresholds()
+    
+    def record_failure(self, latency: Optional[float] = None):
+        """Record a failed or timed-out call"""
+        if self.state == HALF_OPEN:
+            self.probe_in_flight = False
+            self._open()
+            return
+        
+        slow = latency is not None and latency >= self.slow_call_threshold
+        self.outcomes.append((True, slow))
+        self._check_thresholds()
+    
+    def get_timeout(self) -> float:
+        """Request timeout derived from the observed p95 latency"""
+        if len(self.latencies) < self.min_calls:
+            return self.max_timeout
+        p95 = sorted(self.latencies)[int(0.95 * (len(self.latencies) - 1))]
+        return max(self.min_timeout, min(self.max_timeout, p95 * self.timeout_multiplier))
+    
+    def get_p95_latency(self) -> Optional[float]:
+        """Observed p95 latency, if any calls have succeeded"""
+        if not self.latencies:
+            return None
+        return sorted(self.latencies)[int(0.95 * (len(self.latencies) - 1))]
+    
+    def _check_thresholds(self):
+        """Open the circuit if the window breaches a threshold"""
+        if self.state != CLOSED or len(self.outcomes) < self.min_calls:
+            return
+        
+        failures = sum(1 for failed, _ in self.outcomes if failed)
+        slow = sum(1 for _, is_slow in self.outcomes if is_slow)
+        if (failures / len(self.outcomes) >= self.failure_rate_threshold or
+                slow / len(self.outcomes) >= self.slow_rate_threshold):
+            self._open()
+    
+    def _open(self):
+        """Move to the open state and start the cooldown"""
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+        self._transition(OPEN)
+    
+    def _transition(self, state: str):
+        """Change state and log it"""
+        if state != self.state:
+            self.logger.warning(f"Circuit '{self.name}' {self.state} -> {state}")
+            self.state = state
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Admin-facing snapshot of the breaker"""
+        failures = sum(1 for failed, _ in self.outcomes if failed)
+        return {
+            'state': self.state,
+            'failure_rate': failures / len(self.outcomes) if self.outcomes else 0.0,
+            'p95_latency': self.get_p95_latency(),
+            'timeout': self.get_timeout(),
+            'rejected': self.rejected,
+            'times_opened': self.times_opened
+        }
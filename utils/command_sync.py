@@ -0,0 +1,107 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, Iterable
+
+import discord
+
+
+class CommandSync:
+    """Copies the global slash commands to each guild, syncing only what changed
+    
+    The command tree is hashed from the same payload Discord receives, and
+    the last hash synced to each guild is kept on disk. On startup only
+    guilds whose hash differs are synced, several at a time; the local
+    tree is never cleared for guilds that are already up to date, so
+    their commands stay available throughout. `on_ready` fires again on
+    every gateway reconnect, so the full pass only runs once per process.
+    """
+    
+    def __init__(self, bot, path: str):
+        self.bot = bot
+        self.path = path
+        self.concurrency = int(os.getenv('COMMAND_SYNC_CONCURRENCY', '5'))
+        self.logger = logging.getLogger('bot')
+        self.synced_hashes: Dict[str, str] = self._load()
+        self.done = False
+    
+    def _load(self) -> Dict[str, str]:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable command sync state: {e}")
+            return {}
+    
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self.synced_hashes, f, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.error(f"Failed to save command sync state: {e}")
+    
+    def tree_hash(self) -> str:
+        """Stable hash of the global commands as they would be sent to Discord"""
+        tree = self.bot.tree
+        payload = sorted((command.to_dict(tree) for command in tree.get_commands()), key=lambda c: (c['name'], c['type']))
+        encoded = json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+    
+    async def sync_all(self):
+        """Sync every guild whose commands changed since the last run; once per process"""
+        if self.done:
+            self.logger.info("Reconnected; commands already synced this session")
+            return
+        self.done = True
+        
+        started = time.perf_counter()
+        tree_hash = self.tree_hash()
+        stale = [guild for guild in self.bot.guilds if self.synced_hashes.get(str(guild.id)) != tree_hash]
+        skipped = len(self.bot.guilds) - len(stale)
+        
+        synced = await self.sync_guilds(stale, tree_hash)
+        self.logger.info(
+            f"Command sync: {synced}/{len(stale)} guilds synced, {skipped} unchanged "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+    
+    async def sync_guilds(self, guilds: Iterable[discord.Guild], tree_hash: str = None) -> int:
+        """Copy global commands to `guilds` and sync them concurrently; returns how many succeeded"""
+        guilds = list(guilds)
+        if not guilds:
+            return 0
+        tree_hash = tree_hash or self.tree_hash()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def sync_guild(guild: discord.Guild) -> bool:
+            target = discord.Object(id=guild.id)
+            self.bot.tree.clear_commands(guild=target)
+            self.bot.tree.copy_global_to(guild=target)
+            async with semaphore:
+                try:
+                    synced = await self.bot.tree.sync(guild=target)
+                except discord.HTTPException as e:
+                    self.logger.error(f"Failed to sync commands to guild {guild.id}: {e}")
+                    return False
+            self.synced_hashes[str(guild.id)] = tree_hash
+            self.logger.info(f"Commands synced to guild {guild.name} ({guild.id}): {len(synced)} commands")
+            return True
+        
+        results = await asyncio.gather(*(sync_guild(guild) for guild in guilds))
+        self._save()
+        return sum(results)
+    
+    def forget(self, guild_id: int):
+        """Drop a guild's recorded hash so it is synced again if the bot rejoins"""
+        if self.synced_hashes.pop(str(guild_id), None) is not None:
+            self._save()
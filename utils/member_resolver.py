@@ -0,0 +1,63 @@
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import discord
+
+
+class MemberResolver:
+    """Looks members up in discord.py's cache, then a small TTL cache, then the API
+    
+    In lean gateway mode discord.py only caches members who are in a voice
+    channel, so members looked up by ID (restoring fractals, admin tools)
+    usually miss the guild cache. Fetched members are kept for `ttl`
+    seconds, and at most `max_size` of them, so repeated lookups of the
+    same people don't each cost an API call. Failed fetches are cached
+    too, so an unknown ID isn't retried on every lookup.
+    """
+    
+    def __init__(self):
+        self.ttl = float(os.getenv('MEMBER_CACHE_TTL', '300'))
+        self.max_size = int(os.getenv('MEMBER_CACHE_SIZE', '1000'))
+        self.entries: 'OrderedDict[Tuple[int, int], Tuple[float, Optional[discord.Member]]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.logger = logging.getLogger('bot')
+    
+    async def resolve(self, guild: discord.Guild, user_id: int) -> Optional[discord.Member]:
+        """The guild member with `user_id`, or None if they can't be found"""
+        member = guild.get_member(user_id)
+        if member is not None:
+            return member
+        
+        key = (guild.id, user_id)
+        now = time.monotonic()
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] > now:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        
+        self.misses += 1
+        try:
+            member = await guild.fetch_member(user_id)
+        except discord.NotFound:
+            member = None
+        except discord.HTTPException as e:
+            self.logger.warning(f"Failed to fetch member {user_id} in guild {guild.id}: {e}")
+            return None  # Transient; don't cache
+        
+        self.entries[key] = (now + self.ttl, member)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return member
+    
+    def get_stats(self) -> dict:
+        return {
+            'cached': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses
+        }
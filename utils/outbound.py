@@ -0,0 +1,327 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import discord
+
+# Priority classes, most urgent first
+CRITICAL = 0  # Winner announcements, voting messages, final results
+NORMAL = 1    # Welcome and admin messages, thread membership
+LOW = 2       # Vote echoes, timer warnings, status and tally board edits
+
+PRIORITY_NAMES = {CRITICAL: 'critical', NORMAL: 'normal', LOW: 'low'}
+
+
+class TokenBucket:
+    """Allows `rate` calls per `per` seconds, refilling continuously"""
+    
+    def __init__(self, rate: float, per: float):
+        self.capacity = rate
+        self.tokens = rate
+        self.fill_rate = rate / per
+        self.updated = time.monotonic()
+    
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+        self.updated = now
+    
+    def delay(self, now: float) -> float:
+        """Seconds until a token is available (0 if one is available now)"""
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.fill_rate
+    
+    def take(self):
+        self.tokens -= 1
+    
+    def penalize(self, retry_after: float):
+        """Empty the bucket so nothing is sent until Discord's retry_after has passed"""
+        self.tokens = min(self.tokens, 0) - retry_after * self.fill_rate
+    
+    def is_idle(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+
+class OutboundJob:
+    """One queued Discord API call and everyone waiting on its result"""
+    
+    def __init__(self, priority: int, bucket_key: Tuple[str, int], func: Callable, args: tuple, kwargs: Dict[str, Any], coalesce_key=None):
+        self.priority = priority
+        self.bucket_key = bucket_key
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.coalesce_key = coalesce_key
+        self.ordered = bucket_key[0] != 'member'  # Messages and edits keep their order within a channel
+        self.lane = ('channel', bucket_key[1]) if self.ordered else bucket_key
+        self.futures = []
+        self.enqueued_at = time.monotonic()
+
+
+class OutboundScheduler:
+    """Single queue for thread messages, edits and thread membership across all groups
+    
+    Calls are held until both the global bucket and the per-channel bucket
+    for that kind of request have a token, mirroring Discord's own rate
+    limits so we rarely hit a 429. When calls for several channels are
+    ready, the most urgent priority class goes first, so winner
+    announcements never wait behind vote echoes from busier groups. Within
+    a channel, messages and edits go out one at a time in the order they
+    were queued, whatever their priority, so a winner announcement never
+    lands before the vote that decided it. Pending edits to the same
+    message are merged into one request, keeping the first edit's place.
+    Thread membership changes don't depend on each other and run alongside
+    them, paced only by their buckets.
+    
+    Jobs wait in lanes: one per channel for messages and edits, one per
+    thread for membership. Only lanes whose oldest job could go now are
+    kept in the per-priority ready deques, and lanes held up by their
+    bucket sit in a heap until it refills, so picking the next job never
+    rescans everything that is queued.
+    """
+    
+    def __init__(self):
+        self.global_rate = float(os.getenv('OUTBOUND_GLOBAL_RATE', '50'))
+        self.channel_rate = float(os.getenv('OUTBOUND_CHANNEL_RATE', '5'))
+        self.channel_period = float(os.getenv('OUTBOUND_CHANNEL_PERIOD', '5'))
+        
+        self.global_bucket = TokenBucket(self.global_rate, 1.0)
+        self.buckets: Dict[Tuple[str, int], TokenBucket] = {}
+        self.lanes: Dict[tuple, deque] = {}  # lane -> its queued jobs, oldest first
+        self.ready = {priority: deque() for priority in PRIORITY_NAMES}  # lanes whose oldest job can go, by its priority
+        self.ready_lanes: Dict[tuple, int] = {}  # lane -> priority of the ready deque it is in
+        self.waiting = []  # heap of (when its bucket refills, tie-breaker, lane)
+        self.waiting_order = itertools.count()
+        self.pending = 0  # queued jobs not started yet
+        self.pending_edits: Dict[int, OutboundJob] = {}  # message_id -> queued edit
+        self.in_flight = set()
+        self.busy_lanes = set()  # channels with a message or edit in flight
+        self.task = None
+        self.wakeup = None
+        self.logger = logging.getLogger('bot')
+        
+        self.stats = {
+            'sent': 0,
+            'failed': 0,
+            'coalesced': 0,
+            'rate_limited': 0
+        }
+        self.wait_stats = {priority: {'count': 0, 'total': 0.0, 'max': 0.0} for priority in PRIORITY_NAMES}
+    
+    def send(self, channel, *args, priority: int = NORMAL, **kwargs) -> asyncio.Future:
+        """Queue channel.send(); the future resolves with the sent message"""
+        return self._submit(OutboundJob(priority, ('send', channel.id), channel.send, args, kwargs))
+    
+    def edit(self, message: discord.Message, priority: int = LOW, **kwargs) -> asyncio.Future:
+        """Queue message.edit(), merging with an edit to the same message that has not gone out yet"""
+        job = self.pending_edits.get(message.id)
+        if job is not None:
+            job.kwargs.update(kwargs)  # Latest content wins
+            if priority < job.priority:
+                old_priority, job.priority = job.priority, priority
+                if self.ready_lanes.get(job.lane) == old_priority and self.lanes[job.lane][0] is job:
+                    self.ready[old_priority].remove(job.lane)
+                    self._make_ready(job.lane)
+            self.stats['coalesced'] += 1
+            future = asyncio.get_running_loop().create_future()
+            future.add_done_callback(self._consume_exception)
+            job.futures.append(future)
+            return future
+        
+        job = OutboundJob(priority, ('edit', message.channel.id), message.edit, (), kwargs, coalesce_key=message.id)
+        self.pending_edits[message.id] = job
+        return self._submit(job)
+    
+    def add_user(self, thread: discord.Thread, member, priority: int = NORMAL) -> asyncio.Future:
+        """Queue thread.add_user()"""
+        return self._submit(OutboundJob(priority, ('member', thread.id), thread.add_user, (member,), {}))
+    
+    def _submit(self, job: OutboundJob) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(self._consume_exception)
+        job.futures.append(future)
+        self.pending += 1
+        lane = self.lanes.get(job.lane)
+        if lane is None:
+            self.lanes[job.lane] = deque([job])
+            if job.lane not in self.busy_lanes:
+                self._make_ready(job.lane)
+        else:
+            lane.append(job)  # Goes out after the jobs ahead of it
+        
+        if self.task is None or self.task.done():
+            self.wakeup = asyncio.Event()
+            self.task = asyncio.create_task(self._run())
+        self.wakeup.set()
+        return future
+    
+    @staticmethod
+    def _consume_exception(future: asyncio.Future):
+        """Failures are logged by the scheduler, so fire-and-forget callers need not await"""
+        if not future.cancelled():
+            future.exception()
+    
+    def _get_bucket(self, key: Tuple[str, int]) -> TokenBucket:
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            if len(self.buckets) > 1000:
+                self._prune_buckets()
+            bucket = self.buckets[key] = TokenBucket(self.channel_rate, self.channel_period)
+        return bucket
+    
+    def _prune_buckets(self):
+        """Forget buckets for channels that have been quiet long enough to refill"""
+        now = time.monotonic()
+        for key in [key for key, bucket in self.buckets.items() if bucket.is_idle(now)]:
+            del self.buckets[key]
+    
+    def _make_ready(self, lane: tuple):
+        """Put a lane in the ready deque for its oldest job's priority"""
+        priority = self.lanes[lane][0].priority
+        self.ready[priority].append(lane)
+        self.ready_lanes[lane] = priority
+    
+    def _next_ready(self, now: float) -> Tuple[Optional[OutboundJob], float]:
+        """Most urgent job whose channel bucket has a token, or how long until one will
+        
+        Messages and edits are only eligible once they are the oldest queued
+        for their channel and nothing earlier is in flight, so priority
+        never reorders a channel's messages.
+        """
+        while self.waiting and self.waiting[0][0] <= now:
+            _, _, lane = heapq.heappop(self.waiting)
+            self._make_ready(lane)
+        
+        for priority in sorted(self.ready):
+            ready = self.ready[priority]
+            while ready:
+                lane = ready.popleft()
+                del self.ready_lanes[lane]
+                job = self.lanes[lane][0]
+                delay = self._get_bucket(job.bucket_key).delay(now)
+                if delay == 0:
+                    return job, 0.0
+                # Out of tokens: set the lane aside until its bucket refills
+                heapq.heappush(self.waiting, (now + delay, next(self.waiting_order), lane))
+        return None, (self.waiting[0][0] - now if self.waiting else None)
+    
+    async def _run(self):
+        """Dispatch queued calls as the buckets allow"""
+        while self.pending:
+            self.wakeup.clear()
+            now = time.monotonic()
+            
+            delay = self.global_bucket.delay(now)
+            if delay == 0:
+                job, delay = self._next_ready(now)
+                if job is not None:
+                    self.global_bucket.take()
+                    self._get_bucket(job.bucket_key).take()
+                    self._start(job, now)
+                    continue
+            
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+    
+    def _start(self, job: OutboundJob, now: float):
+        """Run a job in the background and record how long it queued"""
+        if job.coalesce_key is not None:
+            self.pending_edits.pop(job.coalesce_key, None)
+        
+        waited = now - job.enqueued_at
+        wait_stats = self.wait_stats[job.priority]
+        wait_stats['count'] += 1
+        wait_stats['total'] += waited
+        wait_stats['max'] = max(wait_stats['max'], waited)
+        
+        self.pending -= 1
+        lane = self.lanes[job.lane]
+        lane.popleft()
+        if not lane:
+            del self.lanes[job.lane]
+        if job.ordered:
+            self.busy_lanes.add(job.lane)  # The channel's next job becomes ready once this one finishes
+        elif job.lane in self.lanes:
+            self._make_ready(job.lane)
+        task = asyncio.create_task(self._execute(job))
+        self.in_flight.add(task)
+        task.add_done_callback(self.in_flight.discard)
+    
+    async def _execute(self, job: OutboundJob):
+        try:
+            result = await job.func(*job.args, **job.kwargs)
+        except Exception as e:
+            self.stats['failed'] += 1
+            if isinstance(e, discord.HTTPException) and e.status == 429:
+                self.stats['rate_limited'] += 1
+                retry_after = getattr(e, 'retry_after', None) or self.channel_period
+                self._get_bucket(job.bucket_key).penalize(retry_after)
+            self.logger.warning(f"Outbound {job.bucket_key[0]} to channel {job.bucket_key[1]} failed: {e}")
+            for future in job.futures:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            self.stats['sent'] += 1
+            for future in job.futures:
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            if job.ordered:
+                self.busy_lanes.discard(job.lane)
+                if job.lane in self.lanes:
+                    self._make_ready(job.lane)
+            if self.wakeup:
+                self.wakeup.set()
+    
+    async def close(self):
+        """Stop dispatching; anything still queued is cancelled"""
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        
+        for lane in self.lanes.values():
+            for job in lane:
+                for future in job.futures:
+                    future.cancel()
+        self.lanes.clear()
+        for ready in self.ready.values():
+            ready.clear()
+        self.ready_lanes.clear()
+        self.waiting.clear()
+        self.pending = 0
+        self.pending_edits.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters plus queue depth and wait times per priority class"""
+        waits = {}
+        for priority, wait_stats in self.wait_stats.items():
+            count = wait_stats['count']
+            waits[PRIORITY_NAMES[priority]] = {
+                'count': count,
+                'avg_wait': wait_stats['total'] / count if count else 0.0,
+                'max_wait': wait_stats['max']
+            }
+        
+        return {
+            **self.stats,
+            'depth': self.pending,
+            'in_flight': len(self.in_flight),
+            'waits': waits
+        }
+
+
+# Global instance
+outbound = OutboundScheduler()
@@ -0,0 +1,215 @@
+import asyncio
+import heapq
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+# Timer states
+RUNNING = 'running'
+PAUSED = 'paused'
+DONE = 'done'  # Completed or cancelled
+
+
+class Timer:
+    """One deadline tracked by a TimerService, with optional warning points"""
+    
+    __slots__ = ('deadline', 'remaining_when_paused', 'warnings', 'pending_warnings', 'on_warning', 'on_complete', 'version', 'state', 'kind')
+    
+    def __init__(self, deadline: float, warnings: List[float], on_warning, on_complete, kind: str = 'timer'):
+        self.deadline = deadline
+        self.remaining_when_paused = 0.0
+        self.warnings = warnings  # Seconds before the deadline, largest first
+        self.pending_warnings = list(warnings)
+        self.on_warning = on_warning
+        self.on_complete = on_complete
+        self.version = 0  # Bumped on every reschedule; older heap entries are ignored
+        self.state = RUNNING
+        self.kind = kind  # What the timer is for (e.g. 'speaking', 'countdown'), so stats can tell them apart
+    
+    def next_fire(self) -> float:
+        """Loop time of this timer's next warning or completion"""
+        if self.pending_warnings:
+            return self.deadline - self.pending_warnings[0]
+        return self.deadline
+
+
+class TimerService:
+    """Single scheduler for every speaking deadline across all groups
+    
+    Timers live in one min-heap keyed on the loop time of their next event
+    (a warning point or the deadline). Extending, pausing or cancelling a
+    timer bumps its version and, where it still needs to fire, pushes a new
+    heap entry; stale entries are discarded when they reach the top. One
+    task sleeps until the earliest event, so thousands of concurrent timers
+    cost heap entries rather than sleeping tasks.
+    """
+    
+    def __init__(self):
+        self.heap = []  # (fire_at, sequence, version, timer)
+        self.sequence = 0
+        self.timers = set()  # Running and paused timers
+        self.callbacks = set()  # Callback tasks still running
+        self.task = None
+        self.wakeup = None
+        self.logger = logging.getLogger('bot')
+        
+        self.stats = {
+            'scheduled': 0,
+            'completed': 0,
+            'cancelled': 0,
+            'warnings': 0,
+            'max_lateness': 0.0
+        }
+        self.completed_by_kind: Dict[str, int] = {}
+    
+    def schedule(
+        self,
+        duration: float,
+        on_complete: Callable[[], Awaitable[Any]],
+        warnings: Iterable[float] = (),
+        on_warning: Optional[Callable[[float], Awaitable[Any]]] = None,
+        kind: str = 'timer'
+    ) -> Timer:
+        """Start a timer; on_warning(seconds_left) runs at each warning point before on_complete()"""
+        warnings = sorted((w for w in warnings if 0 < w < duration), reverse=True)
+        timer = Timer(self._now() + duration, warnings, on_warning, on_complete, kind)
+        self.timers.add(timer)
+        self.stats['scheduled'] += 1
+        self._push(timer)
+        return timer
+    
+    def extend(self, timer: Timer, seconds: float):
+        """Move a timer's deadline, re-arming warning points that are ahead again"""
+        if timer.state == PAUSED:
+            timer.remaining_when_paused += seconds
+            timer.pending_warnings = [w for w in timer.warnings if w < timer.remaining_when_paused]
+        elif timer.state == RUNNING:
+            timer.deadline += seconds
+            remaining = self.remaining(timer)
+            timer.pending_warnings = [w for w in timer.warnings if w < remaining]
+            self._push(timer)
+    
+    def pause(self, timer: Timer):
+        """Freeze a running timer's remaining time"""
+        if timer.state != RUNNING:
+            return
+        timer.remaining_when_paused = self.remaining(timer)
+        timer.state = PAUSED
+        timer.version += 1
+    
+    def resume(self, timer: Timer):
+        """Restart a paused timer from where it was frozen"""
+        if timer.state != PAUSED:
+            return
+        timer.deadline = self._now() + timer.remaining_when_paused
+        timer.state = RUNNING
+        self._push(timer)
+    
+    def cancel(self, timer: Timer):
+        """Stop a timer without running its callbacks"""
+        if timer.state == DONE:
+            return
+        self._finish(timer)
+        self.stats['cancelled'] += 1
+    
+    def remaining(self, timer: Timer) -> float:
+        """Seconds left on a timer, accurate at any moment"""
+        if timer.state == PAUSED:
+            return timer.remaining_when_paused
+        if timer.state == DONE:
+            return 0.0
+        return max(0.0, timer.deadline - self._now())
+    
+    def _now(self) -> float:
+        return asyncio.get_running_loop().time()
+    
+    def _push(self, timer: Timer):
+        timer.version += 1
+        self.sequence += 1
+        heapq.heappush(self.heap, (timer.next_fire(), self.sequence, timer.version, timer))
+        
+        if self.task is None or self.task.done():
+            self.wakeup = asyncio.Event()
+            self.task = asyncio.create_task(self._run())
+        self.wakeup.set()
+    
+    def _finish(self, timer: Timer):
+        timer.state = DONE
+        timer.version += 1
+        self.timers.discard(timer)
+    
+    async def _run(self):
+        """Sleep until the earliest event, fire everything due, repeat"""
+        while self.heap:
+            self.wakeup.clear()
+            fire_at, _, version, timer = self.heap[0]
+            if version != timer.version:
+                heapq.heappop(self.heap)  # Superseded by a later reschedule
+                continue
+            
+            delay = fire_at - self._now()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            heapq.heappop(self.heap)
+            self.stats['max_lateness'] = max(self.stats['max_lateness'], -delay)
+            self._fire(timer)
+    
+    def _fire(self, timer: Timer):
+        """Run the timer's next due callback and reschedule it if anything is left"""
+        if timer.pending_warnings:
+            seconds_left = timer.pending_warnings.pop(0)
+            self.stats['warnings'] += 1
+            self._push(timer)
+            if timer.on_warning:
+                self._spawn(timer.on_warning(seconds_left))
+        else:
+            self._finish(timer)
+            self.stats['completed'] += 1
+            self.completed_by_kind[timer.kind] = self.completed_by_kind.get(timer.kind, 0) + 1
+            self._spawn(timer.on_complete())
+    
+    def _spawn(self, coro: Awaitable[Any]):
+        """Run a callback in its own task so a slow one never delays other timers"""
+        task = asyncio.create_task(coro)
+        self.callbacks.add(task)
+        task.add_done_callback(self._callback_done)
+    
+    def _callback_done(self, task: asyncio.Task):
+        self.callbacks.discard(task)
+        if not task.cancelled() and task.exception():
+            self.logger.error(f"Timer callback failed: {task.exception()}")
+    
+    async def close(self):
+        """Stop the scheduler and drop every timer"""
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        for timer in list(self.timers):
+            self._finish(timer)
+        self.heap.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters plus how many timers and heap entries are live, overall and per kind"""
+        kinds = {
+            kind: {'active': 0, 'paused': 0, 'completed': completed}
+            for kind, completed in self.completed_by_kind.items()
+        }
+        for timer in self.timers:
+            counts = kinds.setdefault(timer.kind, {'active': 0, 'paused': 0, 'completed': 0})
+            counts['active' if timer.state == RUNNING else 'paused'] += 1
+        
+        return {
+            **self.stats,
+            'active': sum(1 for timer in self.timers if timer.state == RUNNING),
+            'paused': sum(1 for timer in self.timers if timer.state == PAUSED),
+            'heap_size': len(self.heap),
+            'kinds': kinds
+        }
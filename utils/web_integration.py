@@ -1,8 +1,24 @@
 import aiohttp
 import asyncio
+import heapq
+import itertools
 import logging
 import os
-from typing import Dict, Any, Optional
+import time
+import uuid
+from collections import deque
+from typing import Deque, Dict, Any, List, Optional, Tuple
+from .circuit_breaker import CircuitBreaker
+from .serialization import encode_body, get_serializer
+from .webhook_dispatcher import WebhookDispatcher, WebhookEvent
+from .webhook_outbox import WebhookOutbox
+
+RETRYABLE_STATUSES = {408, 425, 429}  # Client errors worth retrying; other 4xx responses are dead-lettered
+
+
+def is_retryable(status: int) -> bool:
+    """Whether a failed delivery (status 0 for no response) may succeed if sent again"""
+    return status == 0 or status >= 500 or status in RETRYABLE_STATUSES
 
 class WebIntegration:
     """Integration with the Vercel web application"""
@@ -10,45 +26,296 @@ class WebIntegration:
     def __init__(self):
         self.webhook_url = os.getenv('WEB_WEBHOOK_URL', 'https://your-app.vercel.app/api/webhook')
         self.webhook_secret = os.getenv('WEBHOOK_SECRET', 'your_webhook_secret')
+        self.connection_limit = int(os.getenv('WEB_CONNECTION_LIMIT', '20'))
+        self.connection_limit_per_host = int(os.getenv('WEB_CONNECTION_LIMIT_PER_HOST', '8'))
+        self.dns_cache_ttl = int(os.getenv('WEB_DNS_CACHE_TTL', '300'))
+        self.keepalive_timeout = float(os.getenv('WEB_KEEPALIVE_TIMEOUT', '30'))
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.dispatcher = WebhookDispatcher(
+            self._deliver,
+            workers=int(os.getenv('WEBHOOK_WORKERS', '4')),
+            max_queue_size=int(os.getenv('WEBHOOK_QUEUE_SIZE', '1000')),
+            on_drop=self._on_drop,
+            batch_window=float(os.getenv('WEBHOOK_BATCH_WINDOW', '0.25'))
+        )
+        self.outbox = WebhookOutbox(os.getenv('WEBHOOK_OUTBOX_PATH', 'data/webhook_outbox.db'))
+        self.max_attempts = int(os.getenv('WEBHOOK_MAX_ATTEMPTS', '10'))
+        self.retry_queue: List[Tuple[float, str]] = []  # Heap of (due time, fractal id)
+        # fractal id -> events that failed or arrived while the circuit was open, then later ones held behind them
+        self.blocked: Dict[str, Deque[WebhookEvent]] = {}
+        self.retry_task: Optional[asyncio.Task] = None
+        self.dead_lettered = 0
+        self.breaker = CircuitBreaker(
+            'web',
+            failure_rate_threshold=float(os.getenv('WEB_BREAKER_FAILURE_RATE', '0.5')),
+            slow_call_threshold=float(os.getenv('WEB_BREAKER_SLOW_CALL', '5')),
+            open_duration=float(os.getenv('WEB_BREAKER_OPEN_SECONDS', '30')),
+            max_timeout=float(os.getenv('WEB_MAX_TIMEOUT', '10'))
+        )
+        
+        # Wire format; gzip and MessagePack are only used once the web app advertises them
+        self.json_serializer = get_serializer('json')
+        self.preferred_serializer = get_serializer(os.getenv('WEBHOOK_FORMAT', 'json'))
+        self.serializer = self.json_serializer
+        self.compression = os.getenv('WEBHOOK_COMPRESSION', 'TRUE').upper() == 'TRUE'
+        self.min_compress_size = int(os.getenv('WEBHOOK_COMPRESS_MIN_BYTES', '1024'))
+        self.accepts_gzip = False
+        self.started = False
         self.logger = logging.getLogger('bot')
     
-    async def send_webhook(self, event_type: str, fractal_id: str, data: Dict[str, Any]) -> bool:
+    async def start(self):
+        """Open the HTTP session and outbox, replay undelivered events and start delivery"""
+        if self.started:
+            return
+        self.started = True
+        
+        await self._open_session()
+        await self.outbox.open()
+        
+        # Replay anything left undelivered by a previous run
+        pending = await self.outbox.load_pending()
+        for row in pending:
+            self.dispatcher.submit(WebhookEvent(
+                row['event_type'],
+                row['fractal_id'],
+                row['data'],
+                event_id=row['event_id'],
+                attempts=row['attempts']
+            ))
+        if pending:
+            self.logger.info(f"Replaying {len(pending)} undelivered webhook events from outbox")
+        
+        self.dispatcher.start()
+        self.retry_task = asyncio.create_task(self._retry_loop(), name="webhook-retry")
+    
+    async def _open_session(self):
+        """Open the shared, connection-pooled HTTP session"""
+        if self.session and not self.session.closed:
+            return
+        
+        connector = aiohttp.TCPConnector(
+            limit=self.connection_limit,
+            limit_per_host=self.connection_limit_per_host,
+            ttl_dns_cache=self.dns_cache_ttl,
+            keepalive_timeout=self.keepalive_timeout
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=10),
+            headers={'Authorization': f'Bearer {self.webhook_secret}'}
+        )
+        self.logger.info(f"Web integration session opened ({self.connection_limit_per_host} connections per host)")
+    
+    async def close(self):
+        """Flush queued webhooks, persist outbox state and close the shared HTTP session"""
+        if self.retry_task:
+            self.retry_task.cancel()
+            await asyncio.gather(self.retry_task, return_exceptions=True)
+            self.retry_task = None
+        await self.dispatcher.stop()
+        await self.outbox.close()
+        if self.session and not self.session.closed:
+            await self.session.close()
+            self.logger.info("Web integration session closed")
+        self.session = None
+        self.started = False
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, opening it lazily if needed"""
+        if not self.session or self.session.closed:
+            await self._open_session()
+        return self.session
+    
+    def _queue_event(self, event_type: str, fractal_id: str, data: Dict[str, Any]) -> bool:
+        """Record an event in the outbox, then hand it to the dispatcher"""
+        event = WebhookEvent(event_type, fractal_id, data, event_id=uuid.uuid4().hex)
+        self.outbox.append(event.event_id, event_type, fractal_id, data)
+        return self.dispatcher.submit(event)
+    
+    async def _deliver(self, events: List[WebhookEvent]) -> bool:
+        """Deliver a batch of events for one fractal and settle them in the outbox"""
+        waiting = self.blocked.get(events[0].fractal_id)
+        if waiting is not None:
+            # An earlier event for this fractal is waiting to retry; these go out after it
+            waiting.extend(events)
+            return False
+        
+        if not self.breaker.allow_request():
+            # Web app is unhealthy: park the events, in order, until the retry loop gets a probe through
+            self.blocked[events[0].fractal_id] = deque(events)
+            heapq.heappush(self.retry_queue, (time.monotonic() + 1, events[0].fractal_id))
+            return False
+        
+        status = await self._post_events(events)
+        if status == 200:
+            for event in events:
+                self.outbox.mark_delivered(event.event_id)
+            return True
+        
+        retry, delay = self._settle_failure(events, status)
+        if retry:
+            self.blocked[events[0].fractal_id] = deque(retry)
+            heapq.heappush(self.retry_queue, (time.monotonic() + delay, events[0].fractal_id))
+        return False
+    
+    async def _post_events(self, events: List[WebhookEvent]) -> int:
+        """POST one event, or several as a batch; returns the HTTP status (0 if there was no response)"""
+        if len(events) == 1:
+            event = events[0]
+            return await self._post(event.event_type, event.fractal_id, event.data, event_id=event.event_id)
+        
+        data = {
+            'events': [
+                {'eventId': event.event_id, 'event': event.event_type, 'data': event.data}
+                for event in events
+            ]
+        }
+        return await self._post('batch', events[0].fractal_id, data)
+    
+    def _settle_failure(self, events: List[WebhookEvent], status: int) -> Tuple[List[WebhookEvent], float]:
+        """Count a failed attempt; dead-letters what can't be retried and returns the rest with their backoff"""
+        retry = []
+        delay = 0.0
+        for event in events:
+            event.attempts += 1
+            if is_retryable(status) and event.attempts < self.max_attempts:
+                retry.append(event)
+                delay = max(delay, self.outbox.mark_failed(event.event_id, event.attempts))
+            else:
+                self.outbox.mark_dead(event.event_id, event.attempts)
+                self.dead_lettered += 1
+        
+        fractal_id = events[0].fractal_id
+        if len(retry) < len(events):
+            reason = f"status {status}" if not is_retryable(status) else f"{self.max_attempts} attempts"
+            self.logger.error(f"Dead-lettered {len(events) - len(retry)} webhook event(s) for fractal {fractal_id} after {reason}")
+        if retry:
+            self.logger.warning(f"Retrying {len(retry)} webhook event(s) for fractal {fractal_id} (attempt {retry[0].attempts})")
+        return retry, delay
+    
+    async def _retry_fractal(self, fractal_id: str):
+        """Resend a fractal's held events in order, keeping it blocked until they are all through"""
+        waiting = self.blocked.get(fractal_id)
+        if waiting is None:
+            return
+        while waiting:
+            if not self.breaker.allow_request():
+                heapq.heappush(self.retry_queue, (time.monotonic() + 1, fractal_id))
+                return
+            
+            batch = list(itertools.islice(waiting, self.dispatcher.max_batch_size))
+            status = await self._post_events(batch)
+            for _ in batch:
+                waiting.popleft()
+            
+            if status == 200:
+                for event in batch:
+                    self.outbox.mark_delivered(event.event_id)
+                continue
+            
+            retry, delay = self._settle_failure(batch, status)
+            if retry:
+                waiting.extendleft(reversed(retry))
+                heapq.heappush(self.retry_queue, (time.monotonic() + delay, fractal_id))
+                return
+        
+        # Nothing was awaited since the last check, so no later event can have slipped in
+        del self.blocked[fractal_id]
+    
+    def _on_drop(self, event: WebhookEvent):
+        """Settle an event the dispatcher discarded on overflow or coalesced away"""
+        self.outbox.mark_dropped(event.event_id)
+    
+    async def _retry_loop(self):
+        """Resend blocked fractals once their backoff has elapsed (or the circuit allows a probe)"""
+        while True:
+            await asyncio.sleep(1)
+            now = time.monotonic()
+            due = []
+            while self.retry_queue and self.retry_queue[0][0] <= now:
+                _, fractal_id = heapq.heappop(self.retry_queue)
+                due.append(fractal_id)
+            if due:
+                await asyncio.gather(*(self._retry_fractal(fractal_id) for fractal_id in due), return_exceptions=True)
+    
+    async def send_webhook(self, event_type: str, fractal_id: str, data: Dict[str, Any], event_id: Optional[str] = None) -> bool:
         """Send webhook to web application"""
+        return await self._post(event_type, fractal_id, data, event_id=event_id) == 200
+    
+    async def _post(self, event_type: str, fractal_id: str, data: Dict[str, Any], event_id: Optional[str] = None) -> int:
+        """POST a webhook; returns the HTTP status, or 0 on a timeout or connection error"""
+        request_started = time.monotonic()
         try:
             payload = {
                 'fractalId': fractal_id,
                 'event': event_type,
                 'data': data
             }
+            if event_id:
+                payload['eventId'] = event_id  # Idempotency key for the web app
             
-            headers = {
-                'Authorization': f'Bearer {self.webhook_secret}',
-                'Content-Type': 'application/json'
-            }
+            body, headers = encode_body(
+                payload,
+                self.serializer,
+                compress=self.compression and self.accepts_gzip,
+                min_compress_size=self.min_compress_size
+            )
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.webhook_url, 
-                    json=payload, 
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    if response.status == 200:
-                        self.logger.info(f"Webhook sent successfully: {event_type} for fractal {fractal_id}")
-                        return True
-                    else:
-                        self.logger.error(f"Webhook failed: {response.status} - {await response.text()}")
-                        return False
+            session = await self._get_session()
+            async with session.post(
+                self.webhook_url,
+                data=body,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=self.breaker.get_timeout())
+            ) as response:
+                latency = time.monotonic() - request_started
+                self._negotiate(response.headers)
+                if response.status == 200:
+                    self.breaker.record_success(latency)
+                    self.logger.info(f"Webhook sent successfully: {event_type} for fractal {fractal_id}")
+                elif is_retryable(response.status):
+                    self.breaker.record_failure(latency)
+                    self.logger.error(f"Webhook failed: {response.status} - {await response.text()}")
+                else:
+                    # The web app is up but refused the request; that says nothing about its health
+                    self.breaker.record_success(latency)
+                    self.logger.error(f"Webhook rejected: {response.status} - {await response.text()}")
+                return response.status
                         
         except asyncio.TimeoutError:
+            self.breaker.record_failure(time.monotonic() - request_started)
             self.logger.error(f"Webhook timeout for {event_type}")
-            return False
+            return 0
         except Exception as e:
+            self.breaker.record_failure()
             self.logger.error(f"Webhook error: {e}")
-            return False
+            return 0
+    
+    def _negotiate(self, headers):
+        """Pick up the encodings the web app says it accepts"""
+        encodings = headers.get('X-Webhook-Accept-Encoding', '')
+        self.accepts_gzip = 'gzip' in encodings
+        
+        formats = headers.get('X-Webhook-Accept', '')
+        if self.preferred_serializer.content_type in formats:
+            self.serializer = self.preferred_serializer
+        else:
+            self.serializer = self.json_serializer
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Admin-facing snapshot of delivery health"""
+        return {
+            'circuit': self.breaker.get_status(),
+            'dispatcher': self.dispatcher.get_stats(),
+            'held': sum(len(waiting) for waiting in self.blocked.values()),
+            'blocked_fractals': len(self.blocked),
+            'dead_lettered': self.dead_lettered,
+            'format': self.serializer.name,
+            'gzip': self.compression and self.accepts_gzip
+        }
     
-    async def notify_fractal_started(self, fractal_group) -> bool:
-        """Notify web app that a fractal has started"""
+    def notify_fractal_started(self, fractal_group) -> bool:
+        """Queue a notification that a fractal has started"""
         data = {
             'threadId': str(fractal_group.thread.id),
             'name': fractal_group.thread.name,
@@ -57,30 +324,30 @@ class WebIntegration:
             'participantDiscordIds': [str(member.id) for member in fractal_group.members],
             'currentLevel': fractal_group.current_level
         }
-        return await self.send_webhook('fractal_started', str(fractal_group.thread.id), data)
+        return self._queue_event('fractal_started', str(fractal_group.thread.id), data)
     
-    async def notify_vote_cast(self, fractal_group, voter, candidate) -> bool:
-        """Notify web app that a vote was cast"""
+    def notify_vote_cast(self, fractal_group, voter, candidate) -> bool:
+        """Queue a notification that a vote was cast"""
         data = {
             'voterId': str(voter.id),
             'candidateId': str(candidate.id),
             'level': fractal_group.current_level,
             'totalVotes': len(fractal_group.votes)
         }
-        return await self.send_webhook('vote_cast', str(fractal_group.thread.id), data)
+        return self._queue_event('vote_cast', str(fractal_group.thread.id), data)
     
-    async def notify_round_complete(self, fractal_group, winner) -> bool:
-        """Notify web app that a round is complete"""
+    def notify_round_complete(self, fractal_group, winner) -> bool:
+        """Queue a notification that a round is complete"""
         data = {
             'level': fractal_group.current_level,
             'winnerId': str(winner.id),
             'totalVotes': len(fractal_group.votes),
             'voteDistribution': self._get_vote_distribution(fractal_group)
         }
-        return await self.send_webhook('round_complete', str(fractal_group.thread.id), data)
+        return self._queue_event('round_complete', str(fractal_group.thread.id), data)
     
-    async def notify_fractal_complete(self, fractal_group) -> bool:
-        """Notify web app that a fractal is complete"""
+    def notify_fractal_complete(self, fractal_group) -> bool:
+        """Queue a notification that a fractal is complete"""
         # Build results array with final rankings
         results = []
         for level, winner in sorted(fractal_group.winners.items(), reverse=True):
@@ -95,33 +362,27 @@ class WebIntegration:
             'results': results,
             'totalRounds': len(fractal_group.winners)
         }
-        return await self.send_webhook('fractal_complete', str(fractal_group.thread.id), data)
+        return self._queue_event('fractal_complete', str(fractal_group.thread.id), data)
     
-    async def notify_fractal_paused(self, fractal_group) -> bool:
-        """Notify web app that a fractal was paused"""
+    def notify_fractal_paused(self, fractal_group) -> bool:
+        """Queue a notification that a fractal was paused"""
         data = {
             'currentLevel': fractal_group.current_level,
             'pausedAt': fractal_group.current_level
         }
-        return await self.send_webhook('fractal_paused', str(fractal_group.thread.id), data)
+        return self._queue_event('fractal_paused', str(fractal_group.thread.id), data)
     
-    async def notify_fractal_resumed(self, fractal_group) -> bool:
-        """Notify web app that a fractal was resumed"""
+    def notify_fractal_resumed(self, fractal_group) -> bool:
+        """Queue a notification that a fractal was resumed"""
         data = {
             'currentLevel': fractal_group.current_level,
             'resumedAt': fractal_group.current_level
         }
-        return await self.send_webhook('fractal_resumed', str(fractal_group.thread.id), data)
+        return self._queue_event('fractal_resumed', str(fractal_group.thread.id), data)
     
     def _get_vote_distribution(self, fractal_group) -> Dict[str, int]:
         """Get vote distribution for current round"""
-        vote_counts = {}
-        for candidate_id in fractal_group.votes.values():
-            candidate = next((c for c in fractal_group.active_candidates if c.id == candidate_id), None)
-            if candidate:
-                key = str(candidate.id)
-                vote_counts[key] = vote_counts.get(key, 0) + 1
-        return vote_counts
+        return {str(candidate_id): count for candidate_id, count in fractal_group.tally.distribution().items()}
 
 # Global instance
 web_integration = WebIntegration()
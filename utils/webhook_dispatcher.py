@@ -0,0 +1,227 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+# Events that may be discarded when the queue overflows; everything else
+# (round/fractal lifecycle events) is always kept.
+DROPPABLE_EVENTS = {'vote_cast'}
+
+
+class WebhookEvent:
+    """A queued webhook waiting for delivery"""
+    
+    def __init__(self, event_type: str, fractal_id: str, data: Dict[str, Any], event_id: Optional[str] = None, attempts: int = 0):
+        self.event_type = event_type
+        self.fractal_id = fractal_id
+        self.data = data
+        self.event_id = event_id
+        self.attempts = attempts
+        self.enqueued_at = time.monotonic()
+
+
+def get_coalesce_key(event: WebhookEvent) -> Optional[Tuple[Any, ...]]:
+    """Key under which later events supersede earlier ones, if any"""
+    if event.event_type == 'vote_cast':
+        return ('vote_cast', event.data.get('voterId'), event.data.get('level'))
+    return None
+
+
+class WebhookDispatcher:
+    """Delivers webhooks in the background through a bounded, sharded queue
+    
+    Events are routed to a shard by fractal ID and each shard is drained by a
+    single worker, so events for one fractal are delivered in order while
+    different fractals are delivered concurrently. A worker collects a
+    fractal's events for a short window and hands them over as one batch,
+    with superseded vote_cast events collapsed into the latest one.
+    """
+    
+    def __init__(self, deliver: Callable[[List[WebhookEvent]], Awaitable[bool]], workers: int = 4, max_queue_size: int = 1000,
+                 on_drop: Optional[Callable[[WebhookEvent], None]] = None, batch_window: float = 0.25, max_batch_size: int = 100):
+        self.deliver = deliver
+        self.on_drop = on_drop
+        self.worker_count = max(1, workers)
+        self.max_queue_size = max_queue_size
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.shards: List[Deque[WebhookEvent]] = [deque() for _ in range(self.worker_count)]
+        self.wakeups: List[asyncio.Event] = []  # Created in start() on the running loop
+        self.workers: List[asyncio.Task] = []
+        self.depth = 0
+        self.in_flight = 0
+        self.stats = {
+            'enqueued': 0,
+            'delivered': 0,
+            'failed': 0,
+            'dropped': 0,
+            'coalesced': 0,
+            'requests': 0,
+            'last_lag': 0.0,
+            'max_lag': 0.0
+        }
+        self.logger = logging.getLogger('bot')
+    
+    def start(self):
+        """Spawn the worker tasks"""
+        if self.workers:
+            return
+        self.wakeups = [asyncio.Event() for _ in range(self.worker_count)]
+        for shard, wakeup in zip(self.shards, self.wakeups):
+            if shard:
+                wakeup.set()
+        self.workers = [
+            asyncio.create_task(self._worker(index), name=f"webhook-worker-{index}")
+            for index in range(self.worker_count)
+        ]
+        self.logger.info(f"Webhook dispatcher started with {self.worker_count} workers")
+    
+    async def stop(self, drain_timeout: float = 5.0):
+        """Give queued events a chance to go out, then stop the workers"""
+        if (self.depth or self.in_flight) and self.workers:
+            deadline = time.monotonic() + drain_timeout
+            while (self.depth or self.in_flight) and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+            if self.depth:
+                self.logger.warning(f"Webhook dispatcher stopping with {self.depth} undelivered events")
+        
+        for task in self.workers:
+            task.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        self.wakeups = []
+    
+    def submit(self, event: WebhookEvent) -> bool:
+        """Queue an event for delivery without waiting on the network
+        
+        Returns False if the event was dropped because the queue is full.
+        """
+        event.enqueued_at = time.monotonic()
+        
+        if self.depth >= self.max_queue_size and not self._drop_oldest_droppable():
+            if event.event_type in DROPPABLE_EVENTS:
+                self._record_drop(event)
+                self.logger.warning(f"Webhook queue full, dropped {event.event_type} for fractal {event.fractal_id}")
+                return False
+            # Lifecycle events are never dropped, even past the bound
+        
+        index = hash(event.fractal_id) % self.worker_count
+        self.shards[index].append(event)
+        if self.wakeups:
+            self.wakeups[index].set()
+        self.depth += 1
+        self.stats['enqueued'] += 1
+        return True
+    
+    def _drop_oldest_droppable(self) -> bool:
+        """Discard the oldest droppable event across all shards to make room"""
+        oldest_shard = None
+        oldest_position = None
+        oldest_time = None
+        
+        for shard in self.shards:
+            for position, event in enumerate(shard):
+                if event.event_type in DROPPABLE_EVENTS:
+                    if oldest_time is None or event.enqueued_at < oldest_time:
+                        oldest_shard, oldest_position, oldest_time = shard, position, event.enqueued_at
+                    break
+        
+        if oldest_shard is None:
+            return False
+        
+        dropped = oldest_shard[oldest_position]
+        del oldest_shard[oldest_position]
+        self.depth -= 1
+        self._record_drop(dropped)
+        self.logger.warning(f"Webhook queue full, dropped oldest {dropped.event_type} for fractal {dropped.fractal_id}")
+        return True
+    
+    def _record_drop(self, event: WebhookEvent):
+        """Count a dropped event and let the owner settle it"""
+        self.stats['dropped'] += 1
+        if self.on_drop:
+            self.on_drop(event)
+    
+    def _take_batch(self, shard: Deque[WebhookEvent], fractal_id: str) -> List[WebhookEvent]:
+        """Remove up to max_batch_size queued events for one fractal, in order"""
+        batch = []
+        remaining = deque()
+        while shard:
+            event = shard.popleft()
+            if event.fractal_id == fractal_id and len(batch) < self.max_batch_size:
+                batch.append(event)
+            else:
+                remaining.append(event)
+        shard.extend(remaining)
+        self.depth -= len(batch)
+        return batch
+    
+    def _coalesce(self, batch: List[WebhookEvent]) -> List[WebhookEvent]:
+        """Drop events superseded by a later event with the same key"""
+        latest = {}
+        for position, event in enumerate(batch):
+            key = get_coalesce_key(event)
+            if key is not None:
+                latest[key] = position
+        
+        kept = []
+        for position, event in enumerate(batch):
+            key = get_coalesce_key(event)
+            if key is not None and latest[key] != position:
+                self.stats['coalesced'] += 1
+                if self.on_drop:
+                    self.on_drop(event)
+                continue
+            kept.append(event)
+        return kept
+    
+    async def _worker(self, index: int):
+        """Deliver batches of events from one shard, one fractal at a time"""
+        shard = self.shards[index]
+        wakeup = self.wakeups[index]
+        
+        while True:
+            if not shard:
+                wakeup.clear()
+                await wakeup.wait()
+                continue
+            
+            # Let a burst for this fractal accumulate until its oldest event is a window old;
+            # fractals that queued up behind another have usually waited that long already
+            fractal_id = shard[0].fractal_id
+            wait = shard[0].enqueued_at + self.batch_window - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            
+            batch = self._take_batch(shard, fractal_id)
+            if not batch:
+                continue  # Everything was dropped while we waited
+            
+            lag = time.monotonic() - batch[0].enqueued_at
+            self.stats['last_lag'] = lag
+            self.stats['max_lag'] = max(self.stats['max_lag'], lag)
+            
+            batch = self._coalesce(batch)
+            self.stats['requests'] += 1
+            self.in_flight += len(batch)
+            
+            try:
+                delivered = await self.deliver(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Webhook worker error: {e}", exc_info=True)
+                delivered = False
+            finally:
+                self.in_flight -= len(batch)
+            
+            self.stats['delivered' if delivered else 'failed'] += len(batch)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of queue depth, lag and delivery counters"""
+        stats = dict(self.stats)
+        stats['depth'] = self.depth
+        stats['in_flight'] = self.in_flight
+        stats['workers'] = len(self.workers)
+        return stats
@@ -0,0 +1,218 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+PENDING = 'pending'
+DELIVERED = 'delivered'
+DROPPED = 'dropped'
+DEAD = 'dead'  # Rejected by the web app or out of attempts; kept for inspection
+
+
+class WebhookOutbox:
+    """Durable local outbox for webhook events, backed by SQLite in WAL mode
+    
+    Writes are buffered in memory and committed in batches by a background
+    flush loop, so recording an event costs a list append on the caller's
+    side and one fsync per batch on disk. Delivered and dropped rows are
+    compacted away periodically, dead letters are kept, and anything still
+    pending is replayed on startup.
+    """
+    
+    def __init__(self, path: str, flush_interval: float = 0.05, compact_interval: float = 300.0,
+                 base_backoff: float = 2.0, max_backoff: float = 300.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.compact_interval = compact_interval
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.connection: Optional[sqlite3.Connection] = None
+        self.pending_inserts: List[Tuple[Any, ...]] = []
+        self.pending_updates: List[Tuple[Any, ...]] = []
+        self.flush_task: Optional[asyncio.Task] = None
+        self.closing: Optional[asyncio.Event] = None
+        self.io_lock: Optional[asyncio.Lock] = None
+        self.last_compaction = time.monotonic()
+        self.logger = logging.getLogger('bot')
+    
+    async def open(self):
+        """Open the database and start the flush loop"""
+        if self.connection:
+            return
+        
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=FULL")  # One fsync per committed batch
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS outbox (
+                event_id TEXT PRIMARY KEY,
+                fractal_id TEXT NOT NULL,
+                event_type TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL DEFAULT 0,
+                status TEXT NOT NULL DEFAULT 'pending'
+            )
+            """
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS outbox_status ON outbox (status, created_at)")
+        self.connection.commit()
+        
+        self.io_lock = asyncio.Lock()
+        self.closing = asyncio.Event()
+        self.flush_task = asyncio.create_task(self._flush_loop(), name="webhook-outbox-flush")
+        self.logger.info(f"Webhook outbox opened at {self.path}")
+    
+    async def close(self):
+        """Flush buffered writes and close the database"""
+        if self.flush_task:
+            # Let the loop finish any write in progress rather than cancelling it mid-batch
+            self.closing.set()
+            await asyncio.gather(self.flush_task, return_exceptions=True)
+            self.flush_task = None
+        
+        if self.connection:
+            await self.flush()
+            self.connection.close()
+            self.connection = None
+    
+    def append(self, event_id: str, event_type: str, fractal_id: str, data: Dict[str, Any]):
+        """Record a new event; it is committed on the next flush"""
+        now = time.time()
+        self.pending_inserts.append(
+            (event_id, fractal_id, event_type, json.dumps(data), now, 0, now, PENDING)
+        )
+    
+    def mark_delivered(self, event_id: str):
+        """Record that an event reached the web app"""
+        self.pending_updates.append((DELIVERED, None, None, event_id))
+    
+    def mark_dropped(self, event_id: str):
+        """Record that an event was intentionally discarded"""
+        self.pending_updates.append((DROPPED, None, None, event_id))
+    
+    def mark_dead(self, event_id: str, attempts: int):
+        """Record that an event will not be retried"""
+        self.pending_updates.append((DEAD, attempts, None, event_id))
+    
+    def mark_failed(self, event_id: str, attempts: int) -> float:
+        """Record a failed attempt and return the delay before the next one"""
+        delay = self.get_backoff(attempts)
+        self.pending_updates.append((PENDING, attempts, time.time() + delay, event_id))
+        return delay
+    
+    def get_backoff(self, attempts: int) -> float:
+        """Exponential backoff with jitter for the given attempt count"""
+        ceiling = min(self.max_backoff, self.base_backoff * (2 ** max(0, attempts - 1)))
+        return random.uniform(ceiling / 2, ceiling)
+    
+    async def load_pending(self) -> List[Dict[str, Any]]:
+        """Return every undelivered event in creation order"""
+        if not self.connection:
+            return []
+        
+        async with self.io_lock:
+            rows = await asyncio.to_thread(
+                lambda: self.connection.execute(
+                    "SELECT event_id, fractal_id, event_type, payload, attempts FROM outbox "
+                    "WHERE status = ? ORDER BY created_at",
+                    (PENDING,)
+                ).fetchall()
+            )
+        
+        return [
+            {
+                'event_id': event_id,
+                'fractal_id': fractal_id,
+                'event_type': event_type,
+                'data': json.loads(payload),
+                'attempts': attempts
+            }
+            for event_id, fractal_id, event_type, payload, attempts in rows
+        ]
+    
+    async def flush(self):
+        """Commit buffered inserts and status updates in one transaction"""
+        if not self.connection or not (self.pending_inserts or self.pending_updates):
+            return
+        
+        inserts, self.pending_inserts = self.pending_inserts, []
+        updates, self.pending_updates = self.pending_updates, []
+        
+        try:
+            async with self.io_lock:
+                await asyncio.to_thread(self._write_batch, inserts, updates)
+        except BaseException:
+            # Keep the batch so the next flush retries it, even if we were cancelled mid-write
+            self.pending_inserts[:0] = inserts
+            self.pending_updates[:0] = updates
+            raise
+    
+    def _write_batch(self, inserts, updates):
+        """Write one batch; runs in a worker thread"""
+        with self.connection:
+            if inserts:
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO outbox "
+                    "(event_id, fractal_id, event_type, payload, created_at, attempts, next_attempt_at, status) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    inserts
+                )
+            if updates:
+                self.connection.executemany(
+                    "UPDATE outbox SET status = ?, attempts = COALESCE(?, attempts), "
+                    "next_attempt_at = COALESCE(?, next_attempt_at) WHERE event_id = ?",
+                    updates
+                )
+    
+    async def compact(self):
+        """Delete delivered and dropped events and truncate the write-ahead log"""
+        if not self.connection:
+            return
+        
+        def _compact():
+            with self.connection:
+                deleted = self.connection.execute(
+                    "DELETE FROM outbox WHERE status IN (?, ?)", (DELIVERED, DROPPED)
+                ).rowcount
+            self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            return deleted
+        
+        async with self.io_lock:
+            deleted = await asyncio.to_thread(_compact)
+        
+        self.last_compaction = time.monotonic()
+        if deleted:
+            self.logger.info(f"Compacted {deleted} settled webhook events from outbox")
+    
+    async def _flush_loop(self):
+        """Periodically commit buffered writes and compact settled rows"""
+        while not self.closing.is_set():
+            try:
+                await asyncio.wait_for(self.closing.wait(), timeout=self.flush_interval)
+                return  # close() does the final flush
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush()
+                if time.monotonic() - self.last_compaction >= self.compact_interval:
+                    await self.compact()
+            except Exception as e:
+                self.logger.error(f"Webhook outbox flush error: {e}", exc_info=True)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Buffered write counts for monitoring"""
+        return {
+            'buffered_inserts': len(self.pending_inserts),
+            'buffered_updates': len(self.pending_updates)
+        }
@@ -84,6 +84,17 @@ export default async function handler(req: NextApiRequest, res: NextApiResponse)
     `;
     console.log('✅ Votes table created');
 
+    // Create processed_events table (webhook deduplication by eventId)
+    await sql`
+      CREATE TABLE IF NOT EXISTS processed_events (
+        event_id VARCHAR(64) PRIMARY KEY,
+        fractal_thread_id VARCHAR(255) NOT NULL,
+        event_type VARCHAR(50) NOT NULL,
+        processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+      )
+    `;
+    console.log('✅ Processed events table created');
+
     // Test the connection
     const userCount = await sql`SELECT COUNT(*) as count FROM users`;
     console.log(`📊 Current users in database: ${userCount[0].count}`);
@@ -1,10 +1,63 @@
 import { NextApiRequest, NextApiResponse } from 'next';
-import { db } from '../../utils/database';
-import { fractals, votingRounds, votes, users } from '../../utils/schema';
-import { eq, and } from 'drizzle-orm';
+import { poolDb } from '../../utils/database';
+import { fractals, votingRounds, votes, users, processedEvents } from '../../utils/schema';
+import { eq, and, inArray } from 'drizzle-orm';
+import { gunzipSync } from 'zlib';
+
+// The body is parsed here so gzip-compressed payloads from the bot can be decoded
+export const config = {
+  api: {
+    bodyParser: false,
+  },
+};
+
+function readBody(req: NextApiRequest): Promise<any> {
+  return new Promise((resolve, reject) => {
+    const chunks: Buffer[] = [];
+    req.on('data', (chunk: Buffer | string) => {
+      chunks.push(typeof chunk === 'string' ? Buffer.from(chunk) : chunk);
+    });
+    req.on('end', () => {
+      try {
+        let raw = Buffer.concat(chunks);
+        if (req.headers['content-encoding'] === 'gzip') {
+          raw = gunzipSync(raw);
+        }
+        resolve(JSON.parse(raw.toString('utf-8')));
+      } catch (error) {
+        reject(error);
+      }
+    });
+    req.on('error', reject);
+  });
+}
+
+// A transaction on the pooled connection; every write for one webhook goes through it
+type Tx = Parameters<Parameters<typeof poolDb.transaction>[0]>[0];
+
+// Record event IDs in the same transaction that applies the events, so a redelivered
+// event is skipped and a failed apply rolls its claim back with it.
+// Returns the IDs this request claimed; events without an ID are always applied.
+async function claimEvents(tx: Tx, threadId: string, items: { eventId?: string; event: string }[]): Promise<Set<string>> {
+  const rows = items
+    .filter((item) => item.eventId)
+    .map((item) => ({ eventId: item.eventId!, fractalThreadId: threadId, eventType: item.event }));
+  if (rows.length === 0) return new Set();
+
+  const claimed = await tx
+    .insert(processedEvents)
+    .values(rows)
+    .onConflictDoNothing()
+    .returning({ eventId: processedEvents.eventId });
+  return new Set(claimed.map((row) => row.eventId));
+}
 
 // Webhook endpoint for Discord bot to send updates
 export default async function handler(req: NextApiRequest, res: NextApiResponse) {
+  // Tell the bot which encodings this endpoint understands
+  res.setHeader('X-Webhook-Accept', 'application/json');
+  res.setHeader('X-Webhook-Accept-Encoding', 'gzip');
+
   if (req.method !== 'POST') {
     return res.status(405).json({ error: 'Method not allowed' });
   }
@@ -16,47 +69,64 @@ export default async function handler(req: NextApiRequest, res: NextApiResponse)
   }
 
   try {
-    const { fractalId, event, data } = req.body;
+    const { fractalId, event, data, eventId } = await readBody(req);
 
-    switch (event) {
-      case 'fractal_started':
-        await handleFractalStarted(fractalId, data);
-        break;
-      
-      case 'vote_cast':
-        await handleVoteCast(fractalId, data);
-        break;
-      
-      case 'round_complete':
-        await handleRoundComplete(fractalId, data);
-        break;
-      
-      case 'fractal_complete':
-        await handleFractalComplete(fractalId, data);
-        break;
-      
-      case 'fractal_paused':
-        await handleFractalPaused(fractalId, data);
-        break;
-      
-      case 'fractal_resumed':
-        await handleFractalResumed(fractalId, data);
-        break;
-      
-      default:
-        console.log(`Unknown event type: ${event}`);
-    }
+    const duplicate = await poolDb.transaction(async (tx) => {
+      if (event === 'batch') {
+        await handleBatch(tx, fractalId, data);
+        return false;
+      }
+
+      const claimed = await claimEvents(tx, fractalId, [{ eventId, event }]);
+      if (eventId && !claimed.has(eventId)) {
+        console.log(`Skipping already processed event ${eventId}`);
+        return true;
+      }
+      await applyEvent(tx, fractalId, event, data);
+      return false;
+    });
 
-    res.status(200).json({ success: true });
+    res.status(200).json(duplicate ? { success: true, duplicate: true } : { success: true });
   } catch (error) {
     console.error('Webhook error:', error);
     res.status(500).json({ error: 'Internal server error' });
   }
 }
 
-async function handleFractalStarted(threadId: string, data: any) {
+async function applyEvent(tx: Tx, fractalId: string, event: string, data: any) {
+  switch (event) {
+    case 'fractal_started':
+      await handleFractalStarted(tx, fractalId, data);
+      break;
+    
+    case 'vote_cast':
+      await handleVoteCast(tx, fractalId, data);
+      break;
+    
+    case 'round_complete':
+      await handleRoundComplete(tx, fractalId, data);
+      break;
+    
+    case 'fractal_complete':
+      await handleFractalComplete(tx, fractalId, data);
+      break;
+    
+    case 'fractal_paused':
+      await handleFractalPaused(tx, fractalId, data);
+      break;
+    
+    case 'fractal_resumed':
+      await handleFractalResumed(tx, fractalId, data);
+      break;
+    
+    default:
+      console.log(`Unknown event type: ${event}`);
+  }
+}
+
+async function handleFractalStarted(tx: Tx, threadId: string, data: any) {
   // Update fractal status
-  await db
+  await tx
     .update(fractals)
     .set({ 
       status: 'active',
@@ -65,11 +135,11 @@ async function handleFractalStarted(threadId: string, data: any) {
     .where(eq(fractals.threadId, threadId));
 }
 
-async function handleVoteCast(threadId: string, data: any) {
+async function handleVoteCast(tx: Tx, threadId: string, data: any) {
   const { voterId, candidateId, level } = data;
   
   // Find the fractal and current round
-  const fractal = await db
+  const fractal = await tx
     .select()
     .from(fractals)
     .where(eq(fractals.threadId, threadId))
@@ -78,7 +148,7 @@ async function handleVoteCast(threadId: string, data: any) {
   if (fractal.length === 0) return;
 
   // Find or create voting round
-  let round = await db
+  let round = await tx
     .select()
     .from(votingRounds)
     .where(and(
@@ -88,7 +158,7 @@ async function handleVoteCast(threadId: string, data: any) {
     .limit(1);
 
   if (round.length === 0) {
-    const newRound = await db
+    const newRound = await tx
       .insert(votingRounds)
       .values({
         fractalId: fractal[0].id,
@@ -99,12 +169,12 @@ async function handleVoteCast(threadId: string, data: any) {
   }
 
   // Find users
-  const voter = await db.select().from(users).where(eq(users.discordId, voterId)).limit(1);
-  const candidate = await db.select().from(users).where(eq(users.discordId, candidateId)).limit(1);
+  const voter = await tx.select().from(users).where(eq(users.discordId, voterId)).limit(1);
+  const candidate = await tx.select().from(users).where(eq(users.discordId, candidateId)).limit(1);
 
   if (voter.length > 0 && candidate.length > 0) {
     // Insert or update vote
-    await db.insert(votes).values({
+    await tx.insert(votes).values({
       roundId: round[0].id,
       voterId: voter[0].id,
       candidateId: candidate[0].id,
@@ -112,10 +182,10 @@ async function handleVoteCast(threadId: string, data: any) {
   }
 }
 
-async function handleRoundComplete(threadId: string, data: any) {
+async function handleRoundComplete(tx: Tx, threadId: string, data: any) {
   const { level, winnerId, totalVotes } = data;
   
-  const fractal = await db
+  const fractal = await tx
     .select()
     .from(fractals)
     .where(eq(fractals.threadId, threadId))
@@ -123,11 +193,11 @@ async function handleRoundComplete(threadId: string, data: any) {
 
   if (fractal.length === 0) return;
 
-  const winner = await db.select().from(users).where(eq(users.discordId, winnerId)).limit(1);
+  const winner = await tx.select().from(users).where(eq(users.discordId, winnerId)).limit(1);
 
   if (winner.length > 0) {
     // Update voting round with winner
-    await db
+    await tx
       .update(votingRounds)
       .set({
         winnerId: winner[0].id,
@@ -140,17 +210,17 @@ async function handleRoundComplete(threadId: string, data: any) {
       ));
 
     // Update fractal current level
-    await db
+    await tx
       .update(fractals)
       .set({ currentLevel: level - 1 })
       .where(eq(fractals.id, fractal[0].id));
   }
 }
 
-async function handleFractalComplete(threadId: string, data: any) {
+async function handleFractalComplete(tx: Tx, threadId: string, data: any) {
   const { results } = data; // Array of { discordId, rank }
   
-  const fractal = await db
+  const fractal = await tx
     .select()
     .from(fractals)
     .where(eq(fractals.threadId, threadId))
@@ -159,7 +229,7 @@ async function handleFractalComplete(threadId: string, data: any) {
   if (fractal.length === 0) return;
 
   // Update fractal status
-  await db
+  await tx
     .update(fractals)
     .set({ 
       status: 'completed',
@@ -169,11 +239,11 @@ async function handleFractalComplete(threadId: string, data: any) {
 
   // Update user statistics
   for (const result of results) {
-    const user = await db.select().from(users).where(eq(users.discordId, result.discordId)).limit(1);
+    const user = await tx.select().from(users).where(eq(users.discordId, result.discordId)).limit(1);
     
     if (user.length > 0) {
       const isWinner = result.rank === 1;
-      await db
+      await tx
         .update(users)
         .set({
           totalFractals: (user[0].totalFractals ?? 0) + 1,
@@ -184,16 +254,172 @@ async function handleFractalComplete(threadId: string, data: any) {
   }
 }
 
-async function handleFractalPaused(threadId: string, data: any) {
-  await db
+async function handleFractalPaused(tx: Tx, threadId: string, data: any) {
+  await tx
     .update(fractals)
     .set({ isPaused: true })
     .where(eq(fractals.threadId, threadId));
 }
 
-async function handleFractalResumed(threadId: string, data: any) {
-  await db
+async function handleFractalResumed(tx: Tx, threadId: string, data: any) {
+  await tx
     .update(fractals)
     .set({ isPaused: false })
     .where(eq(fractals.threadId, threadId));
 }
+
+// Batched events for a single fractal, in the order they happened.
+async function handleBatch(tx: Tx, threadId: string, data: any) {
+  const received: { eventId?: string; event: string; data: any }[] = data.events || [];
+  if (received.length === 0) return;
+
+  // Skip events already applied by an earlier delivery, and repeats within this batch
+  const claimed = await claimEvents(tx, threadId, received);
+  const applying = new Set<string>();
+  const events = received.filter(({ eventId }) => {
+    if (!eventId) return true;
+    if (!claimed.has(eventId) || applying.has(eventId)) return false;
+    applying.add(eventId);
+    return true;
+  });
+  if (events.length < received.length) {
+    console.log(`Skipping ${received.length - events.length} already processed events for fractal ${threadId}`);
+  }
+
+  await applyBatch(tx, threadId, events);
+}
+
+// Users and voting rounds are resolved once for the whole batch.
+async function applyBatch(tx: Tx, threadId: string, events: { event: string; data: any }[]) {
+  if (events.length === 0) return;
+
+  const fractal = await tx
+    .select()
+    .from(fractals)
+    .where(eq(fractals.threadId, threadId))
+    .limit(1);
+
+  if (fractal.length === 0) return;
+  const fractalId = fractal[0].id;
+
+  // Resolve every referenced user in one query
+  const discordIds = new Set<string>();
+  const levels = new Set<number>();
+  for (const { event, data: eventData } of events) {
+    if (event === 'vote_cast') {
+      discordIds.add(eventData.voterId);
+      discordIds.add(eventData.candidateId);
+      levels.add(eventData.level);
+    } else if (event === 'round_complete') {
+      discordIds.add(eventData.winnerId);
+      levels.add(eventData.level);
+    }
+  }
+
+  const userIds = new Map<string, number>();
+  if (discordIds.size > 0) {
+    const rows = await tx
+      .select({ id: users.id, discordId: users.discordId })
+      .from(users)
+      .where(inArray(users.discordId, Array.from(discordIds)));
+    for (const row of rows) {
+      userIds.set(row.discordId, row.id);
+    }
+  }
+
+  // Resolve every referenced voting round in one query
+  const roundIds = new Map<number, number>();
+  if (levels.size > 0) {
+    const rows = await tx
+      .select({ id: votingRounds.id, level: votingRounds.level })
+      .from(votingRounds)
+      .where(and(
+        eq(votingRounds.fractalId, fractalId),
+        inArray(votingRounds.level, Array.from(levels))
+      ));
+    for (const row of rows) {
+      roundIds.set(row.level, row.id);
+    }
+  }
+
+  const getRoundId = async (level: number) => {
+    let roundId = roundIds.get(level);
+    if (roundId === undefined) {
+      const newRound = await tx
+        .insert(votingRounds)
+        .values({ fractalId, level })
+        .returning();
+      roundId = newRound[0].id;
+      roundIds.set(level, roundId);
+    }
+    return roundId;
+  };
+
+  // Consecutive votes are written with a single insert
+  let pendingVotes: { roundId: number; voterId: number; candidateId: number }[] = [];
+  const flushVotes = async () => {
+    if (pendingVotes.length > 0) {
+      await tx.insert(votes).values(pendingVotes);
+      pendingVotes = [];
+    }
+  };
+
+  for (const { event, data: eventData } of events) {
+    if (event === 'vote_cast') {
+      const voterId = userIds.get(eventData.voterId);
+      const candidateId = userIds.get(eventData.candidateId);
+      if (voterId !== undefined && candidateId !== undefined) {
+        pendingVotes.push({ roundId: await getRoundId(eventData.level), voterId, candidateId });
+      }
+      continue;
+    }
+
+    await flushVotes();
+
+    switch (event) {
+      case 'round_complete': {
+        const winnerId = userIds.get(eventData.winnerId);
+        if (winnerId === undefined) break;
+
+        await tx
+          .update(votingRounds)
+          .set({
+            winnerId,
+            totalVotes: eventData.totalVotes,
+            completedAt: new Date(),
+          })
+          .where(and(
+            eq(votingRounds.fractalId, fractalId),
+            eq(votingRounds.level, eventData.level)
+          ));
+
+        await tx
+          .update(fractals)
+          .set({ currentLevel: eventData.level - 1 })
+          .where(eq(fractals.id, fractalId));
+        break;
+      }
+
+      case 'fractal_started':
+        await handleFractalStarted(tx, threadId, eventData);
+        break;
+
+      case 'fractal_complete':
+        await handleFractalComplete(tx, threadId, eventData);
+        break;
+
+      case 'fractal_paused':
+        await handleFractalPaused(tx, threadId, eventData);
+        break;
+
+      case 'fractal_resumed':
+        await handleFractalResumed(tx, threadId, eventData);
+        break;
+
+      default:
+        console.log(`Unknown batched event type: ${event}`);
+    }
+  }
+
+  await flushVotes();
+}
@@ -83,6 +83,17 @@ async function migrate() {
     `;
     console.log('✅ Votes table created');
 
+    // Create processed_events table (webhook deduplication by eventId)
+    await sql`
+      CREATE TABLE IF NOT EXISTS processed_events (
+        event_id VARCHAR(64) PRIMARY KEY,
+        fractal_thread_id VARCHAR(255) NOT NULL,
+        event_type VARCHAR(50) NOT NULL,
+        processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+      )
+    `;
+    console.log('✅ Processed events table created');
+
     console.log('🎉 Database migration completed successfully!');
     
     // Test the connection
@@ -1,5 +1,7 @@
-import { neon } from '@neondatabase/serverless';
+import { neon, neonConfig, Pool } from '@neondatabase/serverless';
 import { drizzle } from 'drizzle-orm/neon-http';
+import { drizzle as drizzlePool } from 'drizzle-orm/neon-serverless';
+import ws from 'ws';
 import * as schema from './schema';
 
 console.log('🔍 Database Configuration:', {
@@ -15,6 +17,11 @@ if (!process.env.DATABASE_URL) {
 const sql = neon(process.env.DATABASE_URL!);
 export const db = drizzle(sql as any, { schema });
 
+// WebSocket pool for writes that must commit together; the HTTP driver has no transactions
+neonConfig.webSocketConstructor = ws;
+const pool = new Pool({ connectionString: process.env.DATABASE_URL });
+export const poolDb = drizzlePool(pool, { schema });
+
 console.log('✅ Database connection initialized');
 
 // Database connection utility
@@ -64,6 +64,14 @@ export const votes = pgTable('votes', {
   votedAt: timestamp('voted_at').defaultNow(),
 });
 
+// Webhook events already applied, keyed by the bot's eventId, so redelivered events are skipped
+export const processedEvents = pgTable('processed_events', {
+  eventId: varchar('event_id', { length: 64 }).primaryKey(),
+  fractalThreadId: varchar('fractal_thread_id', { length: 255 }).notNull(),
+  eventType: varchar('event_type', { length: 50 }).notNull(),
+  processedAt: timestamp('processed_at').defaultNow(),
+});
+
 // User achievements/badges
 export const achievements = pgTable('achievements', {
   id: serial('id').primaryKey(),